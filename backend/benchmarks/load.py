@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carga local: sobe o gunicorn com gunicorn.conf.py em cada modo
+de worker e mede vazão e latência (p50/p99) com conexões keep-alive
+concorrentes sobre uma mistura de endpoints de leitura.
+
+    python benchmarks/load.py                                  # sync, gthread e gevent (se instalado)
+    python benchmarks/load.py --modes gthread --concurrency 64 --duration 20
+    python benchmarks/load.py --db-latency-ms 5 --json resultado.json
+
+A latência artificial no banco (--db-latency-ms) simula o PostgreSQL remoto
+sobre um SQLite local; é nela que workers sync ficam bloqueados.
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+PROVIDERS = 300
+CLIENTS = 50
+REQUESTS = 500
+CATEGORIES = 8
+
+
+def seed(database_url):
+    """Aplica as migrações, popula uma massa pequena e retorna os caminhos e o token"""
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('FLASK_ENV', 'production')
+    subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'src.main', 'db', 'upgrade'],
+        cwd=BACKEND_DIR, check=True, capture_output=True
+    )
+
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import insert
+    from src.factory import create_app
+    from src.models.user import db, User
+    from src.models.service import ServiceCategory, ProviderService
+    from src.models.request import ServiceRequest, URGENCY_RANKS
+    from src.utils.geo import geo_cell
+
+    app = create_app(web=False)
+    random.seed(7)
+    now = datetime.utcnow()
+
+    with app.app_context():
+        db.session.execute(insert(ServiceCategory), [
+            {'id': i, 'name': f'Categoria {i}', 'is_active': True} for i in range(1, CATEGORIES + 1)
+        ])
+
+        users = []
+        for i in range(1, PROVIDERS + CLIENTS + 1):
+            provider = i <= PROVIDERS
+            lat, lng = -23.55 + random.uniform(-0.3, 0.3), -46.63 + random.uniform(-0.3, 0.3)
+            users.append({
+                'id': i, 'name': f'Usuário {i}', 'email': f'carga{i}@exemplo.com', 'password_hash': '-',
+                'user_type': 'provider' if provider else 'client', 'latitude': lat, 'longitude': lng,
+                'geo_cell': geo_cell(lat, lng), 'is_active': True, 'is_verified': True,
+                'city': 'São Paulo', 'bio': 'Atendimento residencial' if provider else None,
+                'created_at': now - timedelta(minutes=i)
+            })
+        db.session.execute(insert(User), users)
+        db.session.execute(insert(ProviderService), [
+            {'provider_id': i, 'category_id': random.randint(1, CATEGORIES), 'is_active': True}
+            for i in range(1, PROVIDERS + 1)
+        ])
+
+        client_id = PROVIDERS + 1
+        requests = []
+        for i in range(1, REQUESTS + 1):
+            urgency = random.choice(list(URGENCY_RANKS))
+            requests.append({
+                'id': i, 'client_id': client_id + i % CLIENTS, 'category_id': random.randint(1, CATEGORIES),
+                'title': f'Pedido {i}', 'description': '-', 'address': '-', 'city': 'São Paulo',
+                'state': 'SP', 'zip_code': '01000-000', 'urgency': urgency,
+                'urgency_rank': URGENCY_RANKS[urgency], 'status': 'open',
+                'created_at': now - timedelta(seconds=i)
+            })
+        db.session.execute(insert(ServiceRequest), requests)
+        db.session.commit()
+
+        token = create_access_token(identity=str(client_id))
+
+    paths = [
+        '/api/services/categories',
+        '/api/services/search?category_id=1',
+        '/api/services/search?lat=-23.55&lng=-46.63&radius_km=10',
+        '/api/orders',
+        f'/api/orders/{CLIENTS}',
+    ]
+    return paths, token
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, args, database_url):
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': database_url,
+        'FLASK_ENV': 'production',
+        'GUNICORN_BIND': f'127.0.0.1:{port}',
+        'GUNICORN_WORKER_CLASS': mode,
+        'GUNICORN_LOG_LEVEL': 'warning',
+        'LOAD_DB_LATENCY_MS': str(args.db_latency_ms),
+    })
+    env.pop('SOCKETIO_ASYNC_MODE', None)
+    if args.workers:
+        env['WEB_CONCURRENCY'] = str(args.workers)
+    if args.threads:
+        env['GUNICORN_THREADS'] = str(args.threads)
+
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'benchmarks.load_app:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn ({mode}) terminou durante a inicialização')
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/services/categories', timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f'gunicorn ({mode}) não respondeu')
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('conexão fechada pelo servidor')
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+
+    return status, headers.get('connection') == 'close'
+
+
+async def _connection(port, paths, token, deadline, stats):
+    request_lines = [
+        (f'GET {path} HTTP/1.1\r\nHost: localhost\r\nAuthorization: Bearer {token}\r\n'
+         'Connection: keep-alive\r\n\r\n').encode()
+        for path in paths
+    ]
+    reader = writer = None
+    index = random.randrange(len(paths))
+
+    while time.perf_counter() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+        index = (index + 1) % len(paths)
+        started = time.perf_counter()
+        try:
+            writer.write(request_lines[index])
+            await writer.drain()
+            status, close = await _read_response(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            stats['errors'] += 1
+            writer.close()
+            writer = None
+            continue
+
+        stats['latencies'].append(time.perf_counter() - started)
+        if status >= 400:
+            stats['errors'] += 1
+        if close:
+            writer.close()
+            writer = None
+
+    if writer is not None:
+        writer.close()
+
+
+async def drive(port, paths, token, concurrency, duration):
+    stats = {'latencies': [], 'errors': 0}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        _connection(port, paths, token, deadline, stats) for _ in range(concurrency)
+    ])
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_mode(mode, args, database_url, paths, token):
+    process, port = start_server(mode, args, database_url)
+    try:
+        asyncio.run(drive(port, paths, token, args.concurrency, args.warmup))
+        stats = asyncio.run(drive(port, paths, token, args.concurrency, args.duration))
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies = stats['latencies']
+    if not latencies:
+        return {'requests': 0, 'errors': stats['errors']}
+    return {
+        'requests': len(latencies),
+        'errors': stats['errors'],
+        'rps': round(len(latencies) / stats['elapsed'], 1),
+        'rps_per_core': round(len(latencies) / stats['elapsed'] / os.cpu_count(), 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2),
+    }
+
+
+def main():
+    available = ['sync', 'gthread'] + (['gevent'] if importlib.util.find_spec('gevent') else [])
+
+    parser = argparse.ArgumentParser(description='Compara vazão e p99 entre os modos de worker do gunicorn')
+    parser.add_argument('--modes', nargs='+', default=available, choices=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--concurrency', type=int, default=32, help='conexões simultâneas')
+    parser.add_argument('--duration', type=float, default=10, help='segundos medidos por modo')
+    parser.add_argument('--warmup', type=float, default=2, help='segundos de aquecimento por modo')
+    parser.add_argument('--workers', type=int, help='WEB_CONCURRENCY (padrão: o de gunicorn.conf.py)')
+    parser.add_argument('--threads', type=int, help='GUNICORN_THREADS para o modo gthread')
+    parser.add_argument('--db-latency-ms', type=float, default=2, help='latência simulada por comando SQL')
+    parser.add_argument('--json', help='grava o resultado neste arquivo')
+    args = parser.parse_args()
+
+    database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load.db')
+    paths, token = seed(database_url)
+
+    print(f'🚦 Carga: {args.concurrency} conexões, {args.duration:.0f}s por modo, '
+          f'{args.db_latency_ms} ms por comando SQL, {os.cpu_count()} CPU(s)')
+    print('=' * 72)
+    print(f"{'modo':<10}{'req/s':>10}{'req/s/core':>12}{'p50 ms':>10}{'p99 ms':>10}{'máx ms':>10}{'erros':>8}")
+
+    results = {}
+    for mode in args.modes:
+        result = results[mode] = run_mode(mode, args, database_url, paths, token)
+        if not result['requests']:
+            print(f"{mode:<10}{'sem respostas':>40}{result['errors']:>8}")
+            continue
+        print(f"{mode:<10}{result['rps']:>10}{result['rps_per_core']:>12}{result['p50_ms']:>10}"
+              f"{result['p99_ms']:>10}{result['max_ms']:>10}{result['errors']:>8}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
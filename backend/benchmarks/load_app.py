@@ -0,0 +1,21 @@
+"""
+Aplicação usada por benchmarks/load.py: a mesma de src.main, com latência
+artificial opcional em cada comando SQL para simular o banco remoto
+(LOAD_DB_LATENCY_MS, ex.: 5 para o PostgreSQL do Supabase a partir do Railway).
+"""
+import os
+import time
+from sqlalchemy import event
+from src.main import app
+from src.models.user import db
+
+DB_LATENCY = float(os.environ.get('LOAD_DB_LATENCY_MS', 0)) / 1000
+
+if DB_LATENCY:
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _simulate_network_latency(conn, cursor, statement, parameters, context, executemany):
+        # time.sleep cede a vez no gevent (monkey patching) e libera o GIL nas threads
+        time.sleep(DB_LATENCY)
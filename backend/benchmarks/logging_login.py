@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Custo do logging no login (POST /api/auth/login), cada modo em um processo novo:
+
+- anterior: RotatingFileHandler síncronos na thread da requisição, com o
+  volume de antes (tentativa, usuário encontrado e verificação de senha em INFO)
+- fila (arquivo): registros na fila e gravação pela thread do listener (LOG_DESTINATION=file)
+- fila (stdout, JSON): o padrão em produção, com stdout descartado
+- fila + amostragem 10%: LOG_SAMPLE_RATE=0.1
+
+O hash da senha usa uma única iteração do PBKDF2 para o custo do logging não
+ficar escondido atrás do hash.
+
+    python benchmarks/logging_login.py
+    python benchmarks/logging_login.py --threads 8 --requests 4000 --json resultado.json
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+EMAIL = 'cliente@exemplo.com'
+PASSWORD = 'senha-do-benchmark'
+
+MODES = {
+    'anterior': {'legacy': True},
+    'fila (arquivo)': {'LOG_DESTINATION': 'file'},
+    'fila (stdout, JSON)': {'LOG_DESTINATION': 'stdout'},
+    'fila + amostragem 10%': {'LOG_DESTINATION': 'stdout', 'LOG_SAMPLE_RATE': 0.1},
+}
+
+LEGACY_FORMAT = '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
+
+
+def legacy_logging(app, logs_dir):
+    """Handlers de arquivo síncronos como em setup_logging antes da fila"""
+    from src.utils import logging_config
+
+    logging.getLogger().removeHandler(logging_config._pipeline.handler)
+
+    for filename, level in (('servico_em_casa.log', logging.INFO), ('errors.log', logging.ERROR)):
+        handler = RotatingFileHandler(os.path.join(logs_dir, filename), maxBytes=10240000, backupCount=10)
+        handler.setFormatter(logging.Formatter(LEGACY_FORMAT))
+        handler.setLevel(level)
+        app.logger.addHandler(handler)
+    # As mensagens do login rebaixadas para DEBUG eram INFO
+    app.logger.setLevel(logging.DEBUG)
+    app.logger.addFilter(lambda record: not record.getMessage().startswith('Requisição recebida'))
+
+    access_handler = RotatingFileHandler(os.path.join(logs_dir, 'access.log'), maxBytes=10240000, backupCount=5)
+    access_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+    access_logger = logging.getLogger('access')
+    access_logger.addHandler(access_handler)
+    access_logger.propagate = False
+
+
+def run_mode(options, threads, requests):
+    """Executado no processo filho: sobe a aplicação e mede os logins"""
+    from werkzeug.security import generate_password_hash
+    from src.config import ProductionConfig
+    from src.factory import create_app
+    from src.models.user import db, User
+
+    directory = tempfile.mkdtemp()
+
+    class BenchmarkConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'login.db')}"
+        SCHEMA_CHECK = 'upgrade'
+        LOG_DIR = directory
+        LOG_DESTINATION = options.get('LOG_DESTINATION', 'file')
+        LOG_SAMPLE_RATE = options.get('LOG_SAMPLE_RATE', 1.0)
+        # Mesmo método do hash gravado: sem rehash no primeiro login
+        PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1'
+
+    app = create_app(BenchmarkConfig)
+    if options.get('legacy'):
+        legacy_logging(app, directory)
+
+    with app.app_context():
+        db.session.add(User(
+            name='Cliente', email=EMAIL, user_type='client',
+            password_hash=generate_password_hash(PASSWORD, method='pbkdf2:sha256:1')
+        ))
+        db.session.commit()
+
+    def login(http):
+        started = time.perf_counter()
+        response = http.post('/api/auth/login', json={'email': EMAIL, 'password': PASSWORD})
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - started
+
+    warmup = app.test_client()
+    for _ in range(20):
+        login(warmup)
+
+    latencies = []
+    lock = threading.Lock()
+    per_thread = requests // threads
+
+    def worker():
+        http = app.test_client()
+        samples = [login(http) for _ in range(per_thread)]
+        with lock:
+            latencies.extend(samples)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara o custo do logging no login')
+    parser.add_argument('--threads', type=int, default=4, help='clientes concorrentes')
+    parser.add_argument('--requests', type=int, default=2000, help='logins por modo')
+    parser.add_argument('--json', help='grava o resultado neste arquivo')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_mode(MODES[args.child], args.threads, args.requests)))
+        return
+
+    env = {**os.environ, 'FLASK_ENV': 'production'}
+    env.pop('DATABASE_URL', None)
+
+    results = {}
+    for mode in MODES:
+        # stdout do filho: logs (descartados) e o resultado; a thread do listener pode
+        # gravar registros depois dele
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', mode,
+             '--threads', str(args.threads), '--requests', str(args.requests)],
+            cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True
+        )
+        results[mode] = next(
+            json.loads(line) for line in reversed(result.stdout.splitlines()) if line.startswith('{"rps"')
+        )
+
+    print(f'🔐 Login com {args.threads} threads, {args.requests} requisições por modo')
+    print('=' * 72)
+    baseline = results['anterior']['rps']
+    for mode, result in results.items():
+        print(f"{mode:<24} {result['rps']:>8.0f} req/s   p50 {result['p50_ms']:>6.2f} ms   "
+              f"p99 {result['p99_ms']:>6.2f} ms   {result['rps'] / baseline:>4.2f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
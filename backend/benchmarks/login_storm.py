@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Rajada de logins (POST /api/auth/login) com o health check (/api/health)
+consultado em paralelo, cada modo em um processo novo:
+
+- sem limite: pool com uma thread de hash por cliente, como o hash na
+  própria thread da requisição antes do pool
+- pool limitado: PASSWORD_HASH_WORKERS e PASSWORD_HASH_QUEUE_SIZE padrão; o
+  excesso recebe 503 com Retry-After
+
+Metade dos logins usa e-mails não cadastrados (caminho do hash fictício).
+O hash é o scrypt padrão do werkzeug.
+
+    python benchmarks/login_storm.py
+    python benchmarks/login_storm.py --clients 64 --seconds 20 --json resultado.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+EMAIL = 'cliente@exemplo.com'
+PASSWORD = 'senha-do-benchmark'
+
+HEALTH_INTERVAL = 0.05
+
+
+def modes(clients):
+    from src.config import Config
+
+    return {
+        'sem limite': {'PASSWORD_HASH_WORKERS': clients, 'PASSWORD_HASH_QUEUE_SIZE': clients,
+                       'PASSWORD_HASH_TIMEOUT': 3600},
+        'pool limitado': {
+            'PASSWORD_HASH_WORKERS': Config.PASSWORD_HASH_WORKERS,
+            'PASSWORD_HASH_QUEUE_SIZE': Config.PASSWORD_HASH_QUEUE_SIZE,
+            'PASSWORD_HASH_TIMEOUT': Config.PASSWORD_HASH_TIMEOUT
+        },
+    }
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def run_mode(options, clients, seconds):
+    """Executado no processo filho: sobe a aplicação e dispara a rajada"""
+    from src.config import ProductionConfig
+    from src.factory import create_app
+    from src.models.user import db, User
+
+    directory = tempfile.mkdtemp()
+
+    class BenchmarkConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'storm.db')}"
+        SCHEMA_CHECK = 'upgrade'
+        LOG_LEVEL = 'ERROR'
+        DB_POOL_SIZE = clients + 4
+        PASSWORD_HASH_WORKERS = options['PASSWORD_HASH_WORKERS']
+        PASSWORD_HASH_QUEUE_SIZE = options['PASSWORD_HASH_QUEUE_SIZE']
+        PASSWORD_HASH_TIMEOUT = options['PASSWORD_HASH_TIMEOUT']
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        user = User(name='Cliente', email=EMAIL, user_type='client')
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    logins, statuses, health = [], {}, []
+
+    def client(index):
+        http = app.test_client()
+        email = EMAIL if index % 2 == 0 else f'desconhecido{index}@exemplo.com'
+        samples, seen = [], {}
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = http.post('/api/auth/login', json={'email': email, 'password': PASSWORD})
+            samples.append(time.perf_counter() - started)
+            seen[response.status_code] = seen.get(response.status_code, 0) + 1
+            if response.status_code == 503:
+                time.sleep(float(response.headers.get('Retry-After', 1)))
+        with lock:
+            logins.extend(samples)
+            for status, count in seen.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    def health_check():
+        http = app.test_client()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            http.get('/api/health')
+            health.append(time.perf_counter() - started)
+            time.sleep(HEALTH_INTERVAL)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    threads.append(threading.Thread(target=health_check))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'login_p50_ms': statistics.median(logins) * 1000,
+        'login_p99_ms': _percentile(logins, 0.99) * 1000,
+        'health_p50_ms': statistics.median(health) * 1000,
+        'health_p99_ms': _percentile(health, 0.99) * 1000,
+        'health_max_ms': max(health) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rajada de logins com e sem o pool limitado de hash')
+    parser.add_argument('--clients', type=int, default=32, help='clientes concorrentes')
+    parser.add_argument('--seconds', type=float, default=10, help='duração de cada modo')
+    parser.add_argument('--json', help='grava o resultado neste arquivo')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_mode(modes(args.clients)[args.child], args.clients, args.seconds)))
+        return
+
+    env = {**os.environ, 'FLASK_ENV': 'production'}
+    env.pop('DATABASE_URL', None)
+
+    results = {}
+    for mode in modes(args.clients):
+        # stdout do filho: logs (descartados) e o resultado; a thread do listener pode
+        # gravar registros depois dele
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', mode,
+             '--clients', str(args.clients), '--seconds', str(args.seconds)],
+            cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True
+        )
+        results[mode] = next(
+            json.loads(line) for line in reversed(result.stdout.splitlines()) if line.startswith('{"statuses"')
+        )
+
+    print(f'🔐 Rajada de logins: {args.clients} clientes por {args.seconds:.0f}s, health check a cada '
+          f'{HEALTH_INTERVAL * 1000:.0f} ms')
+    print('=' * 96)
+    for mode, result in results.items():
+        statuses = ' '.join(f'{status}:{count}' for status, count in result['statuses'].items())
+        print(f"{mode:<14} login p50 {result['login_p50_ms']:>8.0f} ms  p99 {result['login_p99_ms']:>8.0f} ms   "
+              f"health p50 {result['health_p50_ms']:>6.1f}  p99 {result['health_p99_ms']:>7.1f}  "
+              f"máx {result['health_max_ms']:>7.1f} ms   {statuses}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark da serialização das respostas de listagem: monta os
+dicionários dos modelos e codifica em JSON, comparando
+
+- anterior: to_dict() escrito à mão (atributo a atributo) + json da biblioteca padrão
+- to_dict compilado + json da biblioteca padrão (sem orjson instalado)
+- to_dict compilado + orjson (FastJSONProvider, o caminho atual)
+
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --users 50 --requests 500 --runs 200 --json resultado.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from flask.json.provider import DefaultJSONProvider
+from src.factory import create_app
+from src.models.user import db, User
+from src.models.service import ServiceCategory
+from src.models.request import ServiceRequest
+from src.utils import serialization
+from src.utils.serialization import FastJSONProvider
+
+
+def legacy_user_to_dict(self):
+    """User.to_dict() como era antes de @serializable"""
+    return {
+        'id': self.id,
+        'name': self.name,
+        'email': self.email,
+        'phone': self.phone,
+        'user_type': self.user_type,
+        'address': self.address,
+        'city': self.city,
+        'state': self.state,
+        'zip_code': self.zip_code,
+        'latitude': self.latitude,
+        'longitude': self.longitude,
+        'profile_picture': self.profile_picture,
+        'is_verified': self.is_verified,
+        'is_active': self.is_active,
+        'bio': self.bio,
+        'experience_years': self.experience_years,
+        'service_radius': self.service_radius,
+        'is_available': self.is_available,
+        'average_rating': self.average_rating,
+        'total_services': self.total_services,
+        'total_evaluations': self.rating_count,
+        'average_punctuality': self._average(self.punctuality_sum, self.punctuality_count),
+        'average_quality': self._average(self.quality_sum, self.quality_count),
+        'average_communication': self._average(self.communication_sum, self.communication_count),
+        'created_at': self.created_at.isoformat() if self.created_at else None,
+        'updated_at': self.updated_at.isoformat() if self.updated_at else None
+    }
+
+
+def legacy_request_to_dict(self):
+    """ServiceRequest.to_dict() como era antes de @serializable"""
+    return {
+        'id': self.id,
+        'client_id': self.client_id,
+        'category_id': self.category_id,
+        'title': self.title,
+        'description': self.description,
+        'address': self.address,
+        'city': self.city,
+        'state': self.state,
+        'zip_code': self.zip_code,
+        'latitude': self.latitude,
+        'longitude': self.longitude,
+        'urgency': self.urgency,
+        'budget_min': self.budget_min,
+        'budget_max': self.budget_max,
+        'preferred_date': self.preferred_date.isoformat() if self.preferred_date else None,
+        'status': self.status,
+        'images': self.images,
+        'created_at': self.created_at.isoformat() if self.created_at else None,
+        'updated_at': self.updated_at.isoformat() if self.updated_at else None
+    }
+
+
+def seed(users, requests):
+    now = datetime.utcnow()
+    category = ServiceCategory(name='Elétrica')
+    db.session.add(category)
+    db.session.flush()
+
+    db.session.add_all([
+        User(
+            name=f'Prestador Fictício {i}', email=f'prestador{i}@exemplo.com', password_hash='-',
+            user_type='provider', phone='(11) 99999-0000', address='Rua das Flores, 123',
+            city='São Paulo', state='SP', zip_code='01000-000', latitude=-23.55, longitude=-46.63,
+            bio='Eletricista residencial com atendimento em toda a zona sul.', experience_years=8,
+            service_radius=15, average_rating=4.75, total_services=40, rating_sum=190, rating_count=40,
+            punctuality_sum=180, punctuality_count=40, created_at=now - timedelta(days=i)
+        )
+        for i in range(users)
+    ])
+    db.session.flush()
+    client_id = db.session.query(User.id).limit(1).scalar()
+
+    db.session.add_all([
+        ServiceRequest(
+            client_id=client_id, category_id=category.id, title=f'Pedido {i}',
+            description='Trocar a fiação do chuveiro e instalar disjuntor novo.', address='Rua A, 1',
+            city='São Paulo', state='SP', zip_code='01000-000', urgency='high', budget_min=150.0,
+            budget_max=300.0, preferred_date=now + timedelta(days=3), images='[]',
+            created_at=now - timedelta(minutes=i)
+        )
+        for i in range(requests)
+    ])
+    db.session.commit()
+
+
+def measure(function, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara o custo de serializar listagens')
+    parser.add_argument('--users', type=int, default=50, help='prestadores por resposta (página da busca)')
+    parser.add_argument('--requests', type=int, default=500, help='pedidos por resposta (listagem grande)')
+    parser.add_argument('--runs', type=int, default=100, help='repetições por cenário (mediana)')
+    parser.add_argument('--json', help='grava o resultado neste arquivo')
+    args = parser.parse_args()
+
+    app = create_app('testing', web=False)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    with app.app_context():
+        seed(args.users, args.requests)
+        db.session.expunge_all()
+        # Instâncias persistentes com todas as colunas carregadas, como após a consulta da rota
+        datasets = {
+            f'busca ({args.users} prestadores)': ('users', User.query.all(), legacy_user_to_dict),
+            f'listagem ({args.requests} pedidos)': ('requests', ServiceRequest.query.all(), legacy_request_to_dict),
+        }
+
+        results = {}
+        for label, (key, objects, legacy_to_dict) in datasets.items():
+            to_dict = type(objects[0]).to_dict
+            assert [to_dict(obj) for obj in objects] == [legacy_to_dict(obj) for obj in objects]
+
+            def encode(provider, build):
+                return provider.response({key: [build(obj) for obj in objects]}).get_data()
+
+            scenarios = {
+                'anterior (to_dict manual + json)': lambda: encode(stdlib, legacy_to_dict),
+                'to_dict compilado + json': lambda: encode(stdlib, to_dict),
+                'to_dict compilado + orjson': lambda: encode(fast, to_dict),
+                'só dicionários (manual)': lambda: [legacy_to_dict(obj) for obj in objects],
+                'só dicionários (compilado)': lambda: [to_dict(obj) for obj in objects],
+            }
+            if serialization.orjson is None:
+                del scenarios['to_dict compilado + orjson']
+
+            for scenario in scenarios.values():
+                scenario()
+            results[label] = {name: measure(scenario, args.runs) for name, scenario in scenarios.items()}
+
+    print(f'📦 Serialização (mediana de {args.runs} execuções, orjson '
+          f"{'instalado' if serialization.orjson else 'ausente'})")
+    print('=' * 72)
+    output = {}
+    for label, timings in results.items():
+        baseline = timings['anterior (to_dict manual + json)']
+        print(f'{label}:')
+        output[label] = {}
+        for name, seconds in timings.items():
+            reference = timings['só dicionários (manual)'] if name.startswith('só') else baseline
+            print(f'    {name:<36} {seconds * 1000:>8.3f} ms   {reference / seconds:>5.1f}x')
+            output[label][name] = {'ms': round(seconds * 1000, 3), 'speedup': round(reference / seconds, 2)}
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': output}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
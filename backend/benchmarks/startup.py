@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Mede o tempo de inicialização da aplicação em processos novos:
+
+- import: importar src.factory (bibliotecas, modelos)
+- create_app: montar a aplicação (extensões, rotas, verificação do esquema)
+- first_request: primeira requisição pelo test client (conexão, compilação do SQL)
+- server: com --server, tempo até o gunicorn responder à primeira requisição
+
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --server --runs 5
+    DATABASE_URL=postgresql://... python benchmarks/startup.py
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_REQUEST_PATH = '/api/services/categories'
+
+# Executado em um processo novo para cada medição
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from src.factory import create_app
+imported = time.perf_counter()
+app = create_app(web={web})
+created = time.perf_counter()
+first_request = None
+if {web}:
+    response = app.test_client().get({path!r})
+    assert response.status_code == 200, response.status_code
+    first_request = time.perf_counter() - created
+print(json.dumps({{
+    'import': imported - start,
+    'create_app': created - imported,
+    'first_request': first_request,
+    'modules': len(sys.modules)
+}}))
+'''
+
+
+def _environment(database_url):
+    env = dict(os.environ)
+    env['DATABASE_URL'] = database_url
+    env.setdefault('FLASK_ENV', 'production')
+    return env
+
+
+def prepare_database(database_url):
+    """Aplica as migrações antes das medições, para não contá-las"""
+    subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'src.main', 'db', 'upgrade'],
+        cwd=BACKEND_DIR, env=_environment(database_url), check=True, capture_output=True
+    )
+
+
+def run_probe(database_url, web):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(web=web, path=FIRST_REQUEST_PATH)],
+        cwd=BACKEND_DIR, env=_environment(database_url), check=True, capture_output=True, text=True
+    )
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample['process'] = time.perf_counter() - started
+    return sample
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_server(database_url, timeout=60):
+    """Sobe o gunicorn (como no Procfile) e mede até a primeira resposta 200"""
+    port = _free_port()
+    url = f'http://127.0.0.1:{port}{FIRST_REQUEST_PATH}'
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'src.main:app', '--bind', f'127.0.0.1:{port}', '--workers', '1'],
+        cwd=BACKEND_DIR, env=_environment(database_url), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return {'server': time.perf_counter() - started}
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f'gunicorn não respondeu em {timeout}s')
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summarize(samples, key):
+    values = [sample[key] for sample in samples if sample.get(key) is not None]
+    if not values:
+        return None
+    return {
+        'median_ms': round(statistics.median(values) * 1000, 1),
+        'min_ms': round(min(values) * 1000, 1),
+        'max_ms': round(max(values) * 1000, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mede o tempo de inicialização da aplicação')
+    parser.add_argument('--runs', type=int, default=5, help='processos medidos por cenário')
+    parser.add_argument('--server', action='store_true', help='mede também o gunicorn até a primeira resposta')
+    parser.add_argument('--json', help='grava o resultado neste arquivo')
+    args = parser.parse_args()
+
+    database_url = os.environ.get('DATABASE_URL') or (
+        'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'startup.db')
+    )
+    prepare_database(database_url)
+
+    results = {}
+    scenarios = [('aplicação web', True), ('scripts (web=False)', False)]
+    for label, web in scenarios:
+        samples = [run_probe(database_url, web) for _ in range(args.runs)]
+        results[label] = {
+            key: summarize(samples, key)
+            for key in ('import', 'create_app', 'first_request', 'process')
+        }
+        results[label]['modules'] = samples[-1]['modules']
+
+    if args.server:
+        samples = [run_server(database_url) for _ in range(args.runs)]
+        results['gunicorn'] = {'server': summarize(samples, 'server')}
+
+    print(f'⏱️  Inicialização ({args.runs} processos por cenário, mediana [mín-máx] em ms)')
+    print('=' * 60)
+    for label, metrics in results.items():
+        print(f'{label}:')
+        for key, value in metrics.items():
+            if key == 'modules':
+                print(f'    módulos carregados: {value}')
+            elif value:
+                print(f"    {key:<14} {value['median_ms']:>8} [{value['min_ms']}-{value['max_ms']}]")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Benchmark de todos os endpoints dos blueprints sobre uma massa sintética
+(src/utils/synthetic_data.py), sem depender da nuvem: SQLite temporário por padrão
+ou um PostgreSQL local vazio (--database-url, esquema criado pelas migrações).
+
+Cada endpoint roda em três passadas:
+
+- test_client: latência (p50/p95/p99) e comandos SQL por requisição
+- alocações: memória alocada no pico e retida por requisição (tracemalloc)
+- server: latência pelo servidor WSGI do werkzeug em uma thread do mesmo
+  processo, com conexão HTTP keep-alive (--no-server desativa)
+
+    python benchmarks/suite.py
+    python benchmarks/suite.py --providers 5000 --clients 5000 --requests 20000 --json base.json
+    python benchmarks/suite.py --baseline base.json --fail-on-regression
+    python benchmarks/suite.py --only search orders --iterations 200
+
+Endpoints de escrita usam um conjunto próprio de pedidos, propostas e
+prestadores por iteração. As rotas POST/PUT/DELETE de /api/users ficam de
+fora: usam o campo username, que não existe no modelo User.
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func, insert
+from sqlalchemy.engine import Engine
+from werkzeug.serving import make_server
+from src.config import ProductionConfig
+from src.factory import create_app
+from src.models.user import db, User
+from src.models.request import ServiceRequest
+from src.models.proposal import Proposal
+from src.models.message import Message
+from src.utils.synthetic_data import PASSWORD, reset_sequences, seed_marketplace
+
+WARMUP = 3
+
+# Diferença relativa de p50 considerada regressão ao comparar com --baseline
+REGRESSION_THRESHOLD = 0.2
+
+_queries = {'count': 0}
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    _queries['count'] += 1
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Fixtures:
+    """
+    Dados consumidos pelos endpoints de escrita: cada iteração usa um item
+    novo da lista (pedido a excluir, proposta a aceitar...)
+    """
+
+    def __init__(self, marketplace, size):
+        self.size = size
+        self.client_id = marketplace.client_ids[0]
+        self.other_client_id = marketplace.client_ids[1]
+        self.provider_id = marketplace.provider_ids[0]
+        self.bidder_id = marketplace.provider_ids[1]
+        self.completed_request = marketplace.requests_by_status['completed'][0]
+        self.completed_client = None
+        self.tokens = {}
+
+        next_request = (db.session.query(func.max(ServiceRequest.id)).scalar() or 0) + 1
+        next_proposal = (db.session.query(func.max(Proposal.id)).scalar() or 0) + 1
+        next_user = (db.session.query(func.max(User.id)).scalar() or 0) + 1
+
+        requests, proposals, messages = [], [], []
+
+        def add_request(client_id, status='open'):
+            request_id = next_request + len(requests)
+            requests.append({
+                'id': request_id, 'client_id': client_id, 'category_id': 1, 'title': f'Fixture {request_id}',
+                'description': '-', 'address': 'Rua A, 1', 'city': 'São Paulo', 'state': 'SP',
+                'zip_code': '01000-000', 'status': status, 'urgency': 'normal', 'urgency_rank': 1
+            })
+            return request_id
+
+        def add_proposal(request_id, provider_id, status='pending'):
+            proposal_id = next_proposal + len(proposals)
+            proposals.append({
+                'id': proposal_id, 'service_request_id': request_id, 'provider_id': provider_id,
+                'price': 200.0, 'status': status
+            })
+            return proposal_id
+
+        # Conversa do cliente com o prestador, usada pelas rotas de leitura/mensagens
+        self.conversation = add_request(self.client_id)
+        add_proposal(self.conversation, self.provider_id)
+        for index in range(20):
+            sender, receiver = (self.client_id, self.provider_id) if index % 2 else (self.provider_id, self.client_id)
+            messages.append({
+                'service_request_id': self.conversation, 'sender_id': sender, 'receiver_id': receiver,
+                'content': f'Mensagem {index}', 'message_type': 'text', 'is_read': False
+            })
+
+        self.deletable = [add_request(self.client_id) for _ in range(size)]
+        self.acceptable = []
+        for _ in range(size):
+            request_id = add_request(self.client_id)
+            self.acceptable.append(add_proposal(request_id, self.provider_id))
+            add_proposal(request_id, self.bidder_id)
+        self.rejectable = [add_proposal(add_request(self.client_id), self.bidder_id) for _ in range(size)]
+        self.biddable = [add_request(self.other_client_id) for _ in range(size)]
+        self.evaluable = []
+        for _ in range(size):
+            request_id = add_request(self.client_id, status='completed')
+            add_proposal(request_id, self.provider_id, status='accepted')
+            self.evaluable.append(request_id)
+
+        self.new_providers = list(range(next_user, next_user + size))
+        db.session.execute(insert(User), [
+            {'id': user_id, 'name': f'Prestador novo {user_id}', 'email': f'novo{user_id}@exemplo.com',
+             'password_hash': '-', 'user_type': 'provider', 'is_active': True}
+            for user_id in self.new_providers
+        ])
+        db.session.execute(insert(ServiceRequest), requests)
+        db.session.execute(insert(Proposal), proposals)
+        db.session.execute(insert(Message), messages)
+        reset_sequences(User, ServiceRequest, Proposal)
+        db.session.commit()
+
+        self.completed_client = db.session.get(ServiceRequest, self.completed_request).client_id
+        self.client_email = db.session.get(User, self.client_id).email
+        for user_id in [self.client_id, self.provider_id, self.completed_client, *self.new_providers]:
+            self.tokens[user_id] = create_access_token(identity=str(user_id))
+
+    def token(self, user_id):
+        return self.tokens[user_id]
+
+
+def scenarios(marketplace, fx):
+    """
+    (nome, método, caminho, usuário do token, corpo); caminho, usuário e corpo
+    podem ser funções do número da iteração
+    """
+    client, provider = fx.client_id, fx.provider_id
+    run = int(time.time())
+    return [
+        ('health', 'GET', '/api/health', None, None),
+        ('auth.register', 'POST', '/api/auth/register', None, lambda i: {
+            'name': 'Cliente Novo', 'email': f'registro{run}-{i}@exemplo.com', 'password': PASSWORD,
+            'user_type': 'client'
+        }),
+        ('auth.login', 'POST', '/api/auth/login', None, {'email': fx.client_email, 'password': PASSWORD}),
+        ('auth.profile', 'GET', '/api/auth/profile', client, None),
+        ('auth.profile_update', 'PUT', '/api/auth/profile', client, lambda i: {'phone': f'(11) 9{i:04d}-0000'}),
+        ('user.list', 'GET', '/api/users', None, None),
+        ('user.detail', 'GET', f'/api/users/{provider}', None, None),
+        ('service.categories', 'GET', '/api/services/categories', None, None),
+        ('service.category_create', 'POST', '/api/services/categories', client,
+         lambda i: {'name': f'Categoria {run}-{i}'}),
+        ('service.provider_services', 'GET', '/api/services/provider-services', provider, None),
+        ('service.provider_service_create', 'POST', '/api/services/provider-services',
+         lambda i: fx.new_providers[i], {'category_id': 1, 'base_price': 100.0}),
+        ('service.search_category', 'GET', '/api/services/search?category_id=1', None, None),
+        ('service.search_geo', 'GET', '/api/services/search?lat=-23.55&lng=-46.63&radius_km=10', None, None),
+        ('service.search_keyword', 'GET', '/api/services/search?keyword=eletricista', None, None),
+        ('order.list_client', 'GET', '/api/orders', client, None),
+        ('order.list_provider', 'GET', '/api/orders', provider, None),
+        ('order.detail', 'GET', f'/api/orders/{fx.conversation}', client, None),
+        ('order.create', 'POST', '/api/orders', client, {
+            'category_id': 1, 'title': 'Trocar chuveiro', 'description': 'Chuveiro queimado',
+            'address': 'Rua A, 1', 'city': 'São Paulo', 'state': 'SP', 'zip_code': '01000-000'
+        }),
+        ('order.update', 'PUT', f'/api/orders/{fx.conversation}', client, lambda i: {'title': f'Conversa {i}'}),
+        ('order.delete', 'DELETE', lambda i: f'/api/orders/{fx.deletable[i]}', client, None),
+        ('proposal.create', 'POST', '/api/proposals/', provider,
+         lambda i: {'service_request_id': fx.biddable[i], 'price': 150.0}),
+        ('proposal.for_request', 'GET', f'/api/proposals/request/{fx.conversation}', client, None),
+        ('proposal.mine', 'GET', '/api/proposals/my-proposals', provider, None),
+        ('proposal.accept', 'POST', lambda i: f'/api/proposals/{fx.acceptable[i]}/accept', client, None),
+        ('proposal.reject', 'POST', lambda i: f'/api/proposals/{fx.rejectable[i]}/reject', client, None),
+        ('evaluation.create', 'POST', '/api/evaluations/', client, lambda i: {
+            'service_request_id': fx.evaluable[i], 'evaluated_id': provider, 'rating': 5, 'quality': 4
+        }),
+        ('evaluation.for_user', 'GET', f'/api/evaluations/user/{provider}', None, None),
+        ('evaluation.for_request', 'GET', f'/api/evaluations/request/{fx.completed_request}',
+         fx.completed_client, None),
+        ('evaluation.mine', 'GET', '/api/evaluations/my-evaluations', client, None),
+        ('message.list', 'GET', f'/api/orders/{fx.conversation}/messages', client, None),
+        ('message.send', 'POST', f'/api/orders/{fx.conversation}/messages', client,
+         lambda i: {'content': f'Olá {i}', 'receiver_id': provider}),
+        ('message.read', 'POST', f'/api/orders/{fx.conversation}/messages/read', provider, {}),
+    ]
+
+
+class Scenario:
+    def __init__(self, name, method, path, user, body, fixtures):
+        self.name = name
+        self.method = method
+        self._path, self._user, self._body = path, user, body
+        self.fixtures = fixtures
+        self.iteration = 0
+
+    def _resolve(self, value, index):
+        return value(index) if callable(value) else value
+
+    def next_request(self):
+        """Método, caminho, cabeçalhos e corpo da próxima iteração"""
+        index = self.iteration
+        self.iteration += 1
+        user = self._resolve(self._user, index)
+        headers = {'Authorization': f'Bearer {self.fixtures.token(user)}'} if user else {}
+        return self.method, self._resolve(self._path, index), headers, self._resolve(self._body, index)
+
+
+def _check(scenario, status):
+    if status >= 400:
+        raise RuntimeError(f'{scenario.name}: HTTP {status}')
+
+
+def run_test_client(app, scenario, iterations):
+    http = app.test_client()
+    latencies, queries = [], []
+    for number in range(WARMUP + iterations):
+        method, path, headers, body = scenario.next_request()
+        before = _queries['count']
+        started = time.perf_counter()
+        response = http.open(path, method=method, headers=headers, json=body)
+        elapsed = time.perf_counter() - started
+        _check(scenario, response.status_code)
+        if number >= WARMUP:
+            latencies.append(elapsed)
+            queries.append(_queries['count'] - before)
+    return latencies, queries
+
+
+def run_allocations(app, scenario, iterations):
+    http = app.test_client()
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            method, path, headers, body = scenario.next_request()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            response = http.open(path, method=method, headers=headers, json=body)
+            current, peak = tracemalloc.get_traced_memory()
+            _check(scenario, response.status_code)
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return peaks, retained
+
+
+class Server:
+    """Servidor WSGI do werkzeug em uma thread, para medir com HTTP de verdade"""
+
+    def __init__(self, app):
+        # Uma linha de log por requisição distorceria a medida
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.connection = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=30)
+
+    def request(self, method, path, headers, body):
+        headers = dict(headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        self.connection.request(method, path, body=payload, headers=headers)
+        response = self.connection.getresponse()
+        response.read()
+        return response.status
+
+    def close(self):
+        self.connection.close()
+        self.server.shutdown()
+
+
+def run_server(server, scenario, iterations):
+    latencies = []
+    for number in range(WARMUP + iterations):
+        method, path, headers, body = scenario.next_request()
+        started = time.perf_counter()
+        status = server.request(method, path, headers, body)
+        elapsed = time.perf_counter() - started
+        _check(scenario, status)
+        if number >= WARMUP:
+            latencies.append(elapsed)
+    return latencies
+
+
+def _latency_summary(latencies):
+    return {
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Diferenças de p50 (test_client) e de comandos SQL em relação à linha de base"""
+    regressions = []
+    print(f"\n📊 Comparação com a linha de base ({baseline['created_at']})")
+    print('=' * 72)
+    for name, result in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            print(f'{name:<34} (novo)')
+            continue
+        change = result['test_client']['p50_ms'] / previous['test_client']['p50_ms'] - 1
+        query_change = result['queries'] - previous['queries']
+        regressed = change > threshold or query_change > 0
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<34} p50 {change:>+7.1%}   SQL {query_change:>+3}{'   ⚠️' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos endpoints sobre uma massa sintética')
+    parser.add_argument('--database-url', help='PostgreSQL local vazio (padrão: SQLite temporário)')
+    parser.add_argument('--providers', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--proposals-per-request', type=int, default=3)
+    parser.add_argument('--messages-per-request', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=50, help='requisições medidas por endpoint e passada')
+    parser.add_argument('--alloc-iterations', type=int, default=10, help='requisições com tracemalloc por endpoint')
+    parser.add_argument('--no-server', dest='server', action='store_false', help='pula a passada pelo servidor WSGI')
+    parser.add_argument('--only', nargs='+', help='só endpoints cujo nome contém um destes trechos')
+    parser.add_argument('--json', help='grava o resultado (linha de base) neste arquivo')
+    parser.add_argument('--baseline', help='compara com um resultado gravado por --json')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help=f'sai com erro se o p50 piorar mais de {REGRESSION_THRESHOLD:.0%}% ou o número de comandos SQL aumentar')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'suite.db')
+
+    class BenchmarkConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SCHEMA_CHECK = 'upgrade'
+        LOG_LEVEL = 'WARNING'
+        DATABASE_REPLICA_URLS = []
+
+    app = create_app(BenchmarkConfig)
+
+    # Cada passada consome itens novos dos endpoints de escrita
+    size = 2 * (WARMUP + args.iterations) + args.alloc_iterations
+    with app.app_context():
+        if db.session.query(User.id).first() is not None:
+            sys.exit('❌ O banco informado já tem dados; use um banco vazio com o esquema criado')
+        started = time.perf_counter()
+        marketplace = seed_marketplace(
+            providers=args.providers, clients=args.clients, requests=args.requests,
+            proposals_per_request=args.proposals_per_request, messages_per_request=args.messages_per_request,
+            seed=args.seed
+        )
+        fixtures = Fixtures(marketplace, size)
+        seed_seconds = time.perf_counter() - started
+
+    selected = [
+        Scenario(*spec, fixtures) for spec in scenarios(marketplace, fixtures)
+        if not args.only or any(part in spec[0] for part in args.only)
+    ]
+
+    backend = database_url.split(':')[0].split('+')[0]
+    rows = ', '.join(f'{count} {name}' for name, count in marketplace.rows.items())
+    print(f'🧪 Endpoints ({backend}: {rows}; massa em {seed_seconds:.1f}s)')
+    print('=' * 100)
+    print(f"{'endpoint':<34}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'SQL':>5}"
+          f"{'pico KiB':>10}{'retido KiB':>11}{'HTTP p50':>10}{'HTTP p99':>10}")
+
+    server = Server(app) if args.server else None
+    results = {}
+    try:
+        for scenario in selected:
+            latencies, queries = run_test_client(app, scenario, args.iterations)
+            peaks, retained = run_allocations(app, scenario, args.alloc_iterations)
+            result = results[scenario.name] = {
+                'test_client': _latency_summary(latencies),
+                'queries': max(queries),
+                'alloc_peak_kib': round(statistics.median(peaks) / 1024, 1),
+                'alloc_retained_kib': round(statistics.median(retained) / 1024, 1),
+            }
+            if server is not None:
+                result['server'] = _latency_summary(run_server(server, scenario, args.iterations))
+
+            line = (f"{scenario.name:<34}{result['test_client']['p50_ms']:>9.2f}{result['test_client']['p95_ms']:>9.2f}"
+                    f"{result['test_client']['p99_ms']:>9.2f}{result['queries']:>5}"
+                    f"{result['alloc_peak_kib']:>10.1f}{result['alloc_retained_kib']:>11.1f}")
+            if server is not None:
+                line += f"{result['server']['p50_ms']:>10.2f}{result['server']['p99_ms']:>10.2f}"
+            print(line)
+    finally:
+        if server is not None:
+            server.close()
+
+    output = {
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'args': {key: value for key, value in vars(args).items() if key not in ('database_url', 'json', 'baseline')},
+        'database': backend,
+        'rows': marketplace.rows,
+        'results': results,
+    }
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, REGRESSION_THRESHOLD)
+        if regressions and args.fail_on_regression:
+            print(f"\n❌ Regressões: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
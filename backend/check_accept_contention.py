@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Verifica o aceite de propostas sob concorrência: em cada rodada, várias
+threads aceitam ao mesmo tempo propostas diferentes (e algumas a mesma) de
+um pedido com dezenas de propostas. Exatamente um aceite deve vencer; os
+demais recebem 400, o pedido fica em andamento, todas as outras propostas
+ficam rejeitadas e cada prestador recebe o evento Socket.IO correspondente.
+
+    python check_accept_contention.py                     # SQLite temporário
+    CHECK_DATABASE_URL=postgresql://... python check_accept_contention.py --rounds 50
+
+ATENÇÃO: as tabelas do banco informado são apagadas e recriadas.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+from flask_jwt_extended import create_access_token
+from src.config import TestingConfig
+from src.factory import create_app
+from src.models.user import db, User
+from src.models.service import ServiceCategory
+from src.models.request import ServiceRequest
+from src.models.proposal import Proposal
+from src.utils.realtime import socketio
+
+_default_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'accept_contention.db')
+
+
+def make_config(threads):
+    class ContentionConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = os.environ.get('CHECK_DATABASE_URL', _default_url)
+        SCHEMA_CHECK = 'off'
+        LOG_LEVEL = 'ERROR'
+        # Uma conexão por thread disputando o aceite
+        DB_POOL_SIZE = threads + 2
+    return ContentionConfig
+
+
+def seed(rounds, proposals):
+    """Um cliente, os prestadores e, por rodada, um pedido aberto com suas propostas"""
+    db.drop_all()
+    db.create_all()
+
+    category = ServiceCategory(name='Elétrica')
+    client = User(name='Cliente', email='cliente@exemplo.com', password_hash='-', user_type='client')
+    providers = [
+        User(name=f'Prestador {index}', email=f'prestador{index}@exemplo.com', password_hash='-', user_type='provider')
+        for index in range(proposals)
+    ]
+    db.session.add_all([category, client, *providers])
+    db.session.flush()
+
+    requests = []
+    for index in range(rounds):
+        service_request = ServiceRequest(
+            client_id=client.id, category_id=category.id, title=f'Pedido {index}',
+            description='Instalação', address='Rua A, 1', city='São Paulo', state='SP', zip_code='01000-000'
+        )
+        db.session.add(service_request)
+        db.session.flush()
+        db.session.add_all([
+            Proposal(service_request_id=service_request.id, provider_id=provider.id, price=100 + offset)
+            for offset, provider in enumerate(providers)
+        ])
+        requests.append(service_request.id)
+    db.session.commit()
+
+    proposal_ids = {
+        request_id: [proposal_id for proposal_id, in db.session.query(Proposal.id).filter_by(
+            service_request_id=request_id).order_by(Proposal.id)]
+        for request_id in requests
+    }
+    return client.id, [provider.id for provider in providers], proposal_ids
+
+
+def accept_concurrently(app, token, proposal_ids):
+    """Dispara os aceites juntos (barreira) e retorna [(proposal_id, status HTTP)]"""
+    barrier = threading.Barrier(len(proposal_ids))
+    results = [None] * len(proposal_ids)
+
+    def accept(index, proposal_id):
+        http = app.test_client()
+        barrier.wait()
+        response = http.post(f'/api/proposals/{proposal_id}/accept', headers={'Authorization': f'Bearer {token}'})
+        results[index] = (proposal_id, response.status_code)
+
+    threads = [threading.Thread(target=accept, args=item) for item in enumerate(proposal_ids)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def verify_round(request_id, results, expected_proposals):
+    """Problemas encontrados no resultado HTTP e no estado gravado da rodada"""
+    problems = []
+    winners = [proposal_id for proposal_id, status in results if status == 200]
+    unexpected = sorted({status for _, status in results} - {200, 400})
+    if len(winners) != 1:
+        problems.append(f'{len(winners)} aceites bem-sucedidos')
+    if unexpected:
+        problems.append(f'status inesperados: {unexpected}')
+
+    db.session.expire_all()
+    statuses = dict(db.session.query(Proposal.id, Proposal.status).filter_by(service_request_id=request_id))
+    accepted = [proposal_id for proposal_id, status in statuses.items() if status == 'accepted']
+    if accepted != winners[:1] or len(accepted) != 1:
+        problems.append(f'propostas aceitas no banco: {accepted}, vencedor HTTP: {winners}')
+    others = [status for proposal_id, status in statuses.items() if proposal_id not in accepted]
+    if len(statuses) != expected_proposals or any(status != 'rejected' for status in others):
+        problems.append(f"{sum(status != 'rejected' for status in others)} outra(s) proposta(s) não rejeitada(s)")
+    if db.session.get(ServiceRequest, request_id).status != 'in_progress':
+        problems.append('pedido não ficou em andamento')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verifica o aceite de propostas sob concorrência')
+    parser.add_argument('--rounds', type=int, default=20, help='pedidos disputados (um por rodada)')
+    parser.add_argument('--proposals', type=int, default=40, help='propostas por pedido')
+    parser.add_argument('--threads', type=int, default=8, help='aceites simultâneos por pedido')
+    args = parser.parse_args()
+
+    app = create_app(make_config(args.threads))
+    with app.app_context():
+        print(f'🗄️  Banco: {db.engine.url.render_as_string(hide_password=True)}')
+        client_id, provider_ids, proposal_ids = seed(args.rounds, args.proposals)
+        token = create_access_token(identity=str(client_id))
+        provider_tokens = {
+            provider_id: create_access_token(identity=str(provider_id)) for provider_id in provider_ids
+        }
+
+    print(f'⚔️  {args.rounds} pedidos com {args.proposals} propostas, {args.threads} aceites simultâneos por pedido')
+    print('=' * 60)
+
+    # Prestadores conectados ao Socket.IO durante a primeira rodada
+    sockets = {
+        provider_id: socketio.test_client(app, auth={'token': provider_token})
+        for provider_id, provider_token in provider_tokens.items()
+    }
+
+    failures = 0
+    elapsed = []
+    for round_index, (request_id, candidates) in enumerate(proposal_ids.items()):
+        # Metade das threads disputa propostas diferentes; a outra metade repete as mesmas
+        chosen = [candidates[index % len(candidates)] for index in range((args.threads + 1) // 2)]
+        chosen += chosen[:args.threads - len(chosen)]
+
+        started = time.perf_counter()
+        results = accept_concurrently(app, token, chosen)
+        elapsed.append(time.perf_counter() - started)
+
+        with app.app_context():
+            problems = verify_round(request_id, results, args.proposals)
+
+        if round_index == 0:
+            received = {}
+            for provider_id, socket in sockets.items():
+                received[provider_id] = [
+                    packet['name'] for packet in socket.get_received() if packet['name'].startswith('proposal:')
+                ]
+                socket.disconnect()
+            accepted_events = sum(events == ['proposal:accepted'] for events in received.values())
+            rejected_events = sum(events == ['proposal:rejected'] for events in received.values())
+            if accepted_events != 1 or rejected_events != args.proposals - 1:
+                problems.append(f'eventos: {accepted_events} aceite(s), {rejected_events} rejeição(ões) '
+                                f'para {args.proposals} prestadores')
+
+        failures += bool(problems)
+        for problem in problems:
+            print(f'❌ Pedido {request_id}: {problem}')
+
+    ordered = sorted(elapsed)
+    print(f'⏱️  Rodada: mediana {ordered[len(ordered) // 2] * 1000:.1f} ms, máx {ordered[-1] * 1000:.1f} ms')
+
+    if failures:
+        print(f'\n❌ {failures} pedido(s) com aceite inconsistente')
+        sys.exit(1)
+    print(f'\n✅ Um único aceite por pedido em {args.rounds} rodadas')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Verifica o número máximo de comandos SQL emitidos por endpoint de leitura,
+com o usuário do token já no cache de identidade (src/utils/identity.py).
+Usa um banco SQLite temporário, então pode rodar sem acesso à nuvem:
+
+    python check_query_counts.py
+"""
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+_db_file = os.path.join(tempfile.mkdtemp(), 'query_counts.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}'
+
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from src.models.user import db, User
+from src.models.service import ServiceCategory
+from src.models.request import ServiceRequest
+from src.models.proposal import Proposal
+from src.models.evaluation import Evaluation
+from src.main import app
+
+PROVIDERS = 40
+
+# (descrição, url, usuário do token, limite de comandos SQL)
+CHECKS = [
+    ('Perfil', '/api/auth/profile', 'client', 0),
+    ('Detalhe do pedido', '/api/orders/{request_id}', 'client', 1),
+    ('Propostas do pedido', '/api/proposals/request/{request_id}', 'client', 2),
+    ('Minhas propostas', '/api/proposals/my-proposals', 'provider', 1),
+    ('Avaliações do usuário', '/api/evaluations/user/{client_id}', None, 2),
+    ('Avaliações do pedido', '/api/evaluations/request/{request_id}', 'client', 2),
+    ('Minhas avaliações', '/api/evaluations/my-evaluations', 'client', 2),
+]
+
+
+def seed():
+    category = ServiceCategory(name='Elétrica')
+    client = User(name='Cliente', email='cliente@exemplo.com', password_hash='-', user_type='client')
+    db.session.add_all([category, client])
+    db.session.flush()
+
+    service_request = ServiceRequest(
+        client_id=client.id, category_id=category.id, title='Trocar chuveiro',
+        description='Chuveiro queimado', address='Rua A, 1', city='São Paulo',
+        state='SP', zip_code='01000-000', status='completed'
+    )
+    db.session.add(service_request)
+    db.session.flush()
+
+    providers = [
+        User(name=f'Prestador {i}', email=f'prestador{i}@exemplo.com', password_hash='-', user_type='provider')
+        for i in range(PROVIDERS)
+    ]
+    db.session.add_all(providers)
+    db.session.flush()
+
+    for provider in providers:
+        db.session.add(Proposal(
+            service_request_id=service_request.id, provider_id=provider.id,
+            price=100.0, status='rejected'
+        ))
+        db.session.add(Evaluation(
+            service_request_id=service_request.id, evaluator_id=provider.id,
+            evaluated_id=client.id, rating=5
+        ))
+        db.session.add(Evaluation(
+            service_request_id=service_request.id, evaluator_id=client.id,
+            evaluated_id=provider.id, rating=4
+        ))
+
+    db.session.commit()
+    return client.id, providers[0].id, service_request.id
+
+
+def main():
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        client_id, provider_id, request_id = seed()
+        tokens = {
+            'client': create_access_token(identity=str(client_id)),
+            'provider': create_access_token(identity=str(provider_id)),
+        }
+        engine = db.engine
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count_statement)
+
+    client = app.test_client()
+    failures = 0
+
+    # Primeira requisição de cada token carrega o usuário no cache
+    for token in tokens.values():
+        client.get('/api/auth/profile', headers={'Authorization': f'Bearer {token}'})
+
+    print(f'🔍 Comandos SQL por endpoint ({PROVIDERS} propostas/avaliações por pedido)')
+    print('=' * 60)
+
+    for description, url, token_user, limit in CHECKS:
+        url = url.format(client_id=client_id, request_id=request_id)
+        headers = {'Authorization': f'Bearer {tokens[token_user]}'} if token_user else {}
+
+        statements.clear()
+        response = client.get(url, headers=headers)
+        count = len(statements)
+
+        ok = response.status_code == 200 and count <= limit
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {description}: {count} comandos (limite {limit}) - HTTP {response.status_code}")
+
+    event.remove(engine, 'before_cursor_execute', count_statement)
+
+    if failures:
+        print(f'\n❌ {failures} endpoint(s) acima do limite')
+        sys.exit(1)
+    print('\n✅ Todos os endpoints dentro do limite')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Verifica, via EXPLAIN, que as consultas mais frequentes usam índices.
+Popula um banco com uma massa sintética grande, roda ANALYZE e falha se
+alguma consulta cair em varredura sequencial (SCAN sem índice no SQLite,
+Seq Scan no PostgreSQL).
+
+    python check_query_plans.py                         # SQLite temporário
+    CHECK_DATABASE_URL=postgresql://... python check_query_plans.py --scale 2
+
+ATENÇÃO: as tabelas do banco informado são apagadas e recriadas.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(__file__))
+
+_default_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'query_plans.db')
+os.environ['DATABASE_URL'] = os.environ.get('CHECK_DATABASE_URL', _default_url)
+
+from sqlalchemy import event, insert, or_, text, tuple_
+from src.models.user import db, User
+from src.models.service import ServiceCategory, ProviderService
+from src.models.request import ServiceRequest, URGENCY_RANKS
+from src.models.proposal import Proposal
+from src.models.evaluation import Evaluation
+from src.models.message import Message
+from src.utils.geo import (
+    bounding_box, cell_ranges, distance_sq_expression, geo_cell
+)
+from src.main import app
+
+# Volume base (multiplicado por --scale)
+USERS = 20000
+REQUESTS = 40000
+PROPOSALS_PER_REQUEST = 3
+MESSAGES = 40000
+CATEGORIES = 10
+CHUNK = 5000
+
+# Tabelas pequenas por natureza, em que varredura completa é aceitável
+SMALL_TABLES = {'service_category', 'reference_version'}
+
+CENTER = (-23.55, -46.63)
+
+
+def _chunks(rows):
+    for start in range(0, len(rows), CHUNK):
+        yield rows[start:start + CHUNK]
+
+
+def seed(scale):
+    random.seed(42)
+    now = datetime.utcnow()
+    users = int(USERS * scale)
+    requests = int(REQUESTS * scale)
+
+    db.session.execute(insert(ServiceCategory), [
+        {'id': i, 'name': f'Categoria {i}', 'is_active': True} for i in range(1, CATEGORIES + 1)
+    ])
+
+    user_rows = []
+    for i in range(1, users + 1):
+        lat = CENTER[0] + random.uniform(-2, 2)
+        lng = CENTER[1] + random.uniform(-2, 2)
+        user_rows.append({
+            'id': i, 'name': f'Usuário {i}', 'email': f'usuario{i}@exemplo.com', 'password_hash': '-',
+            'user_type': 'provider' if i % 2 else 'client', 'latitude': lat, 'longitude': lng,
+            'geo_cell': geo_cell(lat, lng), 'is_active': True, 'is_verified': i % 4 == 1,
+            'service_radius': random.choice([5, 10, 20, None]), 'city': 'São Paulo',
+            'created_at': now - timedelta(minutes=i)
+        })
+    for chunk in _chunks(user_rows):
+        db.session.execute(insert(User), chunk)
+
+    db.session.execute(insert(ProviderService), [
+        {'provider_id': i, 'category_id': random.randint(1, CATEGORIES), 'is_active': True}
+        for i in range(1, users + 1, 2)
+    ])
+
+    request_rows = []
+    for i in range(1, requests + 1):
+        lat = CENTER[0] + random.uniform(-2, 2)
+        lng = CENTER[1] + random.uniform(-2, 2)
+        urgency = random.choice(list(URGENCY_RANKS))
+        request_rows.append({
+            'id': i, 'client_id': random.randrange(2, users + 1, 2), 'category_id': random.randint(1, CATEGORIES),
+            'title': f'Pedido {i}', 'description': '-', 'address': '-', 'city': 'São Paulo', 'state': 'SP',
+            'zip_code': '00000-000', 'latitude': lat, 'longitude': lng, 'geo_cell': geo_cell(lat, lng),
+            'urgency': urgency, 'urgency_rank': URGENCY_RANKS[urgency],
+            'status': random.choice(['open', 'in_progress', 'completed', 'completed', 'completed']),
+            'created_at': now - timedelta(seconds=i)
+        })
+    for chunk in _chunks(request_rows):
+        db.session.execute(insert(ServiceRequest), chunk)
+
+    proposal_rows = [
+        {'service_request_id': request_id, 'provider_id': random.randrange(1, users + 1, 2), 'price': 100.0,
+         'status': 'pending', 'created_at': now - timedelta(seconds=request_id)}
+        for request_id in range(1, requests + 1) for _ in range(PROPOSALS_PER_REQUEST)
+    ]
+    for chunk in _chunks(proposal_rows):
+        db.session.execute(insert(Proposal), chunk)
+
+    evaluation_rows = [
+        {'service_request_id': request_id, 'evaluator_id': random.randrange(2, users + 1, 2),
+         'evaluated_id': random.randrange(1, users + 1, 2), 'rating': random.randint(1, 5),
+         'created_at': now - timedelta(seconds=request_id)}
+        for request_id in range(1, requests + 1, 2)
+    ]
+    for chunk in _chunks(evaluation_rows):
+        db.session.execute(insert(Evaluation), chunk)
+
+    message_rows = [
+        {'service_request_id': random.randint(1, requests), 'sender_id': random.randint(1, users),
+         'receiver_id': random.randint(1, users), 'content': '-', 'created_at': now - timedelta(seconds=i)}
+        for i in range(int(MESSAGES * scale))
+    ]
+    for chunk in _chunks(message_rows):
+        db.session.execute(insert(Message), chunk)
+
+    db.session.commit()
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    return users, requests
+
+
+def _page(query, *columns):
+    return query.order_by(*[column.desc() for column in columns]).limit(21)
+
+
+def _after(columns, values):
+    return tuple_(*columns) < tuple_(*values)
+
+
+def hot_queries(requests):
+    """
+    Consultas equivalentes às emitidas pelos endpoints mais acessados
+    """
+    lat, lng = CENTER
+    radius = 10
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+    old = datetime.utcnow() - timedelta(days=1)
+
+    provider_geo = User.query.filter_by(user_type='provider', is_active=True, is_verified=True).filter(
+        or_(*[User.geo_cell.between(start, end) for start, end in cell_ranges(lat, lng, radius)]),
+        User.latitude.between(min_lat, max_lat),
+        User.longitude.between(min_lng, max_lng),
+        distance_sq_expression(User.latitude, User.longitude, lat, lng) <= radius * radius
+    ).order_by(distance_sq_expression(User.latitude, User.longitude, lat, lng)).limit(50)
+
+    request_geo = ServiceRequest.query.filter(
+        ServiceRequest.status == 'open',
+        ServiceRequest.category_id.in_([1, 2]),
+        or_(*[ServiceRequest.geo_cell.between(start, end) for start, end in cell_ranges(lat, lng, radius)]),
+        ServiceRequest.latitude.between(min_lat, max_lat),
+        ServiceRequest.longitude.between(min_lng, max_lng)
+    )
+
+    request_keys = [ServiceRequest.created_at, ServiceRequest.id]
+    proposal_keys = [Proposal.created_at, Proposal.id]
+    evaluation_keys = [Evaluation.created_at, Evaluation.id]
+    message_keys = [Message.created_at, Message.id]
+    user_keys = [User.created_at, User.id]
+
+    return [
+        ('Pedidos do cliente', _page(ServiceRequest.query.filter_by(client_id=2), *request_keys)),
+        ('Pedidos do cliente (página seguinte)', _page(
+            ServiceRequest.query.filter_by(client_id=2).filter(_after(request_keys, (old, requests))), *request_keys)),
+        ('Pedidos abertos recentes', _page(ServiceRequest.query.filter_by(status='open'), *request_keys)),
+        ('Feed do prestador (área)', _page(
+            request_geo, ServiceRequest.urgency_rank, ServiceRequest.created_at, ServiceRequest.id)),
+        ('Propostas do pedido', Proposal.query.filter_by(service_request_id=1)),
+        ('Proposta aceita do pedido', Proposal.query.filter_by(service_request_id=1, status='accepted')),
+        ('Proposta existente do prestador', Proposal.query.filter_by(service_request_id=1, provider_id=1)),
+        ('Minhas propostas', _page(Proposal.query.filter_by(provider_id=1), *proposal_keys)),
+        ('Avaliações recebidas', _page(Evaluation.query.filter_by(evaluated_id=1), *evaluation_keys)),
+        ('Avaliações dadas', _page(Evaluation.query.filter_by(evaluator_id=2), *evaluation_keys)),
+        ('Avaliação existente', Evaluation.query.filter_by(service_request_id=1, evaluator_id=2, evaluated_id=1)),
+        ('Avaliações do pedido', Evaluation.query.filter_by(service_request_id=1)),
+        ('Prestadores por categoria', db.session.query(ProviderService.provider_id).filter_by(
+            category_id=1, is_active=True)),
+        ('Serviços do prestador', ProviderService.query.filter_by(provider_id=1, is_active=True)),
+        ('Busca de prestadores por raio', provider_geo),
+        ('Histórico de mensagens', _page(Message.query.filter_by(service_request_id=1), *message_keys)),
+        ('Login por e-mail', User.query.filter_by(email='usuario1@exemplo.com')),
+        ('Lista de usuários', _page(User.query, *user_keys)),
+        ('Lista de usuários (página seguinte)', _page(User.query.filter(_after(user_keys, (old, 100))), *user_keys)),
+    ]
+
+
+class PlanCapture:
+    """
+    Troca o SQL de cada execução por EXPLAIN do mesmo SQL, mantendo os
+    parâmetros já convertidos pelo SQLAlchemy
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN (FORMAT JSON) '
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._rewrite, retval=True)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(self.engine, 'before_cursor_execute', self._rewrite)
+
+    def _rewrite(self, conn, cursor, statement, parameters, context, executemany):
+        return self.prefix + statement, parameters
+
+    def explain(self, query):
+        with self.engine.connect() as connection:
+            result = connection.execute(query.statement)
+            return result.cursor.fetchall()
+
+
+def sqlite_problems(rows):
+    problems = []
+    for row in rows:
+        detail = row[-1]
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            table = detail.split()[1]
+            if table not in SMALL_TABLES:
+                problems.append(detail)
+    return problems
+
+
+def postgres_problems(rows):
+    problems = []
+
+    def walk(node):
+        if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') not in SMALL_TABLES:
+            problems.append(f"Seq Scan on {node.get('Relation Name')}")
+        for child in node.get('Plans', []):
+            walk(child)
+
+    plan = rows[0][0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    walk(plan[0]['Plan'])
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verifica os planos das consultas críticas')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplicador do volume de dados')
+    parser.add_argument('--verbose', action='store_true', help='mostra o plano completo de cada consulta')
+    args = parser.parse_args()
+
+    failures = 0
+    with app.app_context():
+        engine = db.engine
+        print(f'🗄️  Banco: {engine.url.render_as_string(hide_password=True)}')
+        db.drop_all()
+        db.create_all()
+        users, requests = seed(args.scale)
+        print(f'🌱 Massa: {users} usuários, {requests} pedidos')
+        print('=' * 60)
+
+        problems_for = sqlite_problems if engine.dialect.name == 'sqlite' else postgres_problems
+        queries = hot_queries(requests)
+
+        with PlanCapture(engine) as capture:
+            for description, query in queries:
+                rows = capture.explain(query)
+                problems = problems_for(rows)
+                failures += bool(problems)
+
+                print(f"{'❌' if problems else '✅'} {description}")
+                for problem in problems:
+                    print(f'      {problem}')
+                if args.verbose:
+                    for row in rows:
+                        print(f'      · {row[-1]}')
+
+    if failures:
+        print(f'\n❌ {failures} consulta(s) com varredura sequencial')
+        sys.exit(1)
+    print('\n✅ Todas as consultas usam índices')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Verifica o roteamento de leituras para réplicas com dois bancos SQLite:
+o primário e uma cópia que faz o papel de réplica (sem replicação, então
+qualquer escrita só aparece no primário).
+
+    python check_replica_routing.py
+
+- rotas @replica_reads leem da réplica
+- escritas vão ao primário e o cliente que escreveu lê do primário durante
+  DB_REPLICA_STICKY_SECONDS (cookie e, sem cookie, pela identidade do token)
+- rotas sem @replica_reads e clientes que não escreveram não são afetados
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+from flask_jwt_extended import create_access_token
+from src.config import DevelopmentConfig
+from src.factory import create_app
+from src.models.user import db, User
+from src.models.service import ServiceCategory
+from src.models.request import ServiceRequest
+
+STICKY_SECONDS = 1
+
+_directory = tempfile.mkdtemp()
+PRIMARY_FILE = os.path.join(_directory, 'primary.db')
+REPLICA_FILE = os.path.join(_directory, 'replica.db')
+
+
+class PrimaryConfig(DevelopmentConfig):
+    SQLALCHEMY_DATABASE_URI = f'sqlite:///{PRIMARY_FILE}'
+    SCHEMA_CHECK = 'upgrade'
+    DATABASE_REPLICA_URLS = []
+
+
+class ReplicaConfig(PrimaryConfig):
+    SCHEMA_CHECK = 'check'
+    DATABASE_REPLICA_URLS = [f'sqlite:///{REPLICA_FILE}']
+    DB_REPLICA_STICKY_SECONDS = STICKY_SECONDS
+
+
+def seed():
+    """Cria o primário e copia para a réplica, marcando a cópia para distingui-la"""
+    app = create_app(PrimaryConfig, web=False)
+    with app.app_context():
+        category = ServiceCategory(name='Elétrica')
+        client = User(name='Cliente', email='cliente@exemplo.com', password_hash='-', user_type='client')
+        provider = User(name='Prestador', email='prestador@exemplo.com', password_hash='-', user_type='provider')
+        db.session.add_all([category, client, provider])
+        db.session.flush()
+        service_request = ServiceRequest(
+            client_id=client.id, category_id=category.id, title='Trocar chuveiro',
+            description='Chuveiro queimado', address='Rua A, 1', city='São Paulo',
+            state='SP', zip_code='01000-000'
+        )
+        db.session.add(service_request)
+        db.session.commit()
+        ids = client.id, provider.id, category.id, service_request.id
+        db.engine.dispose()
+
+    shutil.copyfile(PRIMARY_FILE, REPLICA_FILE)
+    with sqlite3.connect(REPLICA_FILE) as connection:
+        connection.execute("UPDATE service_request SET title = 'Trocar chuveiro (réplica)'")
+        connection.execute("UPDATE user SET name = name || ' (réplica)'")
+    return ids
+
+
+def request_count(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute('SELECT COUNT(*) FROM service_request').fetchone()[0]
+
+
+def main():
+    client_id, provider_id, category_id, request_id = seed()
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        tokens = {
+            'client': create_access_token(identity=str(client_id)),
+            'provider': create_access_token(identity=str(provider_id)),
+        }
+
+    def get(http, path, user=None):
+        headers = {'Authorization': f'Bearer {tokens[user]}'} if user else {}
+        response = http.get(path, headers=headers)
+        assert response.status_code == 200, (path, response.status_code, response.get_json())
+        return response.get_json()
+
+    def order_titles(http, user='client'):
+        return [order['title'] for order in get(http, '/api/orders', user)['requests']]
+
+    client_http = app.test_client()
+    checks = []
+
+    checks.append(('Rota pública lê da réplica',
+                   get(client_http, f'/api/users/{client_id}')['name'] == 'Cliente (réplica)'))
+    checks.append(('Rota autenticada lê da réplica',
+                   get(client_http, f'/api/orders/{request_id}', 'client')['request']['title'] == 'Trocar chuveiro (réplica)'))
+    checks.append(('Rota sem @replica_reads lê do primário',
+                   get(client_http, '/api/auth/profile', 'client')['user']['name'] == 'Cliente'))
+
+    response = client_http.post('/api/orders', headers={'Authorization': f'Bearer {tokens["client"]}'}, json={
+        'category_id': category_id, 'title': 'Pintar parede', 'description': 'Sala',
+        'address': 'Rua A, 1', 'city': 'São Paulo', 'state': 'SP', 'zip_code': '01000-000'
+    })
+    checks.append(('Escrita vai ao primário',
+                   response.status_code == 201 and request_count(PRIMARY_FILE) == 2 and request_count(REPLICA_FILE) == 1))
+    checks.append(('Escrita devolve o cookie de permanência no primário',
+                   any(cookie.startswith('db_primary_until=') for cookie in response.headers.getlist('Set-Cookie'))))
+
+    checks.append(('Quem escreveu lê do primário (cookie)',
+                   'Pintar parede' in order_titles(client_http)))
+    checks.append(('Quem escreveu lê do primário (sem cookie, pelo token)',
+                   'Pintar parede' in order_titles(app.test_client())))
+    checks.append(('Outros usuários continuam na réplica',
+                   get(app.test_client(), f'/api/users/{client_id}', 'provider')['name'] == 'Cliente (réplica)'))
+
+    time.sleep(STICKY_SECONDS + 1.5)
+    checks.append(('Após a janela, volta para a réplica',
+                   order_titles(client_http) == ['Trocar chuveiro (réplica)']))
+
+    print(f'🔀 Roteamento de leituras (primário + 1 réplica, janela de {STICKY_SECONDS}s)')
+    print('=' * 60)
+    failures = 0
+    for description, ok in checks:
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {description}")
+
+    if failures:
+        print(f'\n❌ {failures} verificação(ões) falharam')
+        sys.exit(1)
+    print('\n✅ Roteamento correto')
+
+
+if __name__ == '__main__':
+    main()
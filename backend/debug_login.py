@@ -4,10 +4,13 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.models.user import db, User
-from src.main import app
+from src.factory import create_app
 from werkzeug.security import check_password_hash
 import json
 
+# Aplicação sem rotas nem Socket.IO: o script só usa o banco
+app = create_app(web=False)
+
 def debug_login():
     """Debug detalhado do processo de login"""
     
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Gera massa sintética do marketplace (src/utils/synthetic_data.py) em lotes
+de insert(): usuários em capitais brasileiras, serviços, pedidos, propostas,
+avaliações e mensagens consistentes entre si. A mesma --seed gera os mesmos
+dados; os ids continuam a partir dos já existentes no banco.
+
+    python generate_data.py --users 10000
+    python generate_data.py --users 1000000 --requests 2000000 --test-hash
+    python generate_data.py --database-url postgresql://localhost/carga --users 200000
+
+Todos os usuários têm a senha senha123. O hash é calculado uma vez e
+compartilhado; com --test-hash usa um hash pré-calculado de uma iteração
+(login barato, só para bancos de teste). O esquema é criado/atualizado pelas
+migrações antes da geração.
+"""
+import argparse
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Carrega as variáveis de ambiente
+load_dotenv()
+
+from src.config import config
+from src.factory import create_app
+from src.utils.synthetic_data import CHUNK_SIZE, PASSWORD, TEST_PASSWORD_HASH, seed_marketplace
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera massa sintética do marketplace')
+    parser.add_argument('--database-url', help='banco de destino (padrão: DATABASE_URL da configuração)')
+    parser.add_argument('--users', type=int, default=10000, help='total de usuários')
+    parser.add_argument('--provider-share', type=float, default=0.2, help='fração de prestadores entre os usuários')
+    parser.add_argument('--requests', type=int, help='pedidos (padrão: igual a --users)')
+    parser.add_argument('--proposals-per-request', type=int, default=3)
+    parser.add_argument('--messages-per-request', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='linhas por insert() e pedidos por transação')
+    parser.add_argument('--test-hash', action='store_true', help='hash de senha pré-calculado (bancos de teste)')
+    args = parser.parse_args()
+
+    base = config[os.environ.get('FLASK_ENV', 'development')]
+
+    class GeneratorConfig(base):
+        SQLALCHEMY_DATABASE_URI = args.database_url or base.SQLALCHEMY_DATABASE_URI
+        SCHEMA_CHECK = 'upgrade'
+        # Sem limite por comando: ANALYZE e a reindexação rodam sobre tabelas grandes
+        DB_STATEMENT_TIMEOUT_MS = 0
+
+    app = create_app(GeneratorConfig, web=False)
+
+    providers = int(args.users * args.provider_share)
+    requests = args.users if args.requests is None else args.requests
+    started = time.perf_counter()
+    last = {'table': None}
+
+    def progress(table, done, total):
+        if table != last['table']:
+            if last['table']:
+                print()
+            last['table'] = table
+        print(f'\r  {table:<9} {done:>10,}/{total:<10,} ({time.perf_counter() - started:6.1f}s)', end='', flush=True)
+
+    print(f'🏗️  Gerando {args.users:,} usuários ({providers:,} prestadores) e {requests:,} pedidos (seed {args.seed})')
+    with app.app_context():
+        marketplace = seed_marketplace(
+            providers=providers, clients=args.users - providers, requests=requests,
+            proposals_per_request=args.proposals_per_request, messages_per_request=args.messages_per_request,
+            seed=args.seed, password_hash=TEST_PASSWORD_HASH if args.test_hash else None,
+            chunk_size=args.chunk_size, progress=progress
+        )
+    print()
+
+    elapsed = time.perf_counter() - started
+    total = sum(marketplace.rows.values())
+    print(f'✅ {total:,} linhas em {elapsed:.1f}s ({total / elapsed:,.0f} linhas/s)')
+    for table, count in marketplace.rows.items():
+        print(f'   {table:<12} {count:>12,}')
+    print(f'🔑 Senha de todos os usuários: {PASSWORD}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Configuração do gunicorn para produção (gunicorn -c gunicorn.conf.py src.main:app).
+
+Modos de worker (GUNICORN_WORKER_CLASS):
+- gthread (padrão): threads por worker; o Socket.IO roda em modo threading
+  com simple-websocket e uma chamada lenta ao banco ocupa só uma thread.
+- gevent: cooperativo, milhares de conexões por worker; exige os pacotes
+  gevent e psycogreen (driver do PostgreSQL sem bloquear o loop).
+- sync: o padrão antigo do gunicorn, mantido para comparação no benchmark.
+
+Com mais de um worker os clientes Socket.IO devem usar apenas o transporte
+websocket (o long-polling precisa de sessão fixa no mesmo worker) e
+SOCKETIO_MESSAGE_QUEUE precisa estar configurada. Sem a fila, o padrão é um
+único worker e WEB_CONCURRENCY maior que 1 gera um aviso na inicialização.
+"""
+import glob
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# CPUs disponíveis para o processo (no container, não as do host)
+cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+
+# Sem fila de mensagens, os eventos Socket.IO só chegam às conexões do mesmo worker
+message_queue = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+
+bind = os.environ.get('GUNICORN_BIND') or f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+if worker_class == 'gevent':
+    workers = _env_int('WEB_CONCURRENCY', cpu_count if message_queue else 1)
+    worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS', 1000)
+elif worker_class == 'gthread':
+    # Threads compensam a espera de I/O no banco; o GIL limita o ganho de CPU por worker
+    workers = _env_int('WEB_CONCURRENCY', cpu_count if message_queue else 1)
+    threads = _env_int('GUNICORN_THREADS', 8)
+else:
+    workers = _env_int('WEB_CONCURRENCY', 2 * cpu_count + 1 if message_queue else 1)
+
+# Modo do Socket.IO compatível com o worker (lido por src/config.py)
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'gevent' if worker_class == 'gevent' else 'threading')
+
+# Conexões keep-alive atrás do proxy do Railway, timeout do worker travado e
+# tempo para concluir requisições em andamento ao reiniciar/escalar
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+# Reciclagem periódica dos workers (0 desativa)
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 0)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+
+# A aplicação é segura para --preload (ver src/factory.py), exceto com gevent,
+# que precisa aplicar o monkey patching antes de importar a aplicação
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false' if worker_class == 'gevent' else 'true').lower() == 'true'
+
+# Arquivo de heartbeat dos workers em memória, evitando travas de disco em containers
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# O acesso já é registrado pela aplicação (src/utils/logging_config.py)
+accesslog = None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    if workers > 1 and not message_queue:
+        server.log.warning(
+            '%d workers sem SOCKETIO_MESSAGE_QUEUE: eventos Socket.IO não chegam a conexões de '
+            'outros workers e o long-polling falha entre eles', workers
+        )
+
+    # Arquivos de métricas de workers de uma execução anterior não podem ser somados
+    directory = os.environ.get('METRICS_MULTIPROC_DIR')
+    if directory:
+        for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+            os.remove(path)
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            server.log.warning('psycogreen não instalado: consultas ao PostgreSQL bloqueiam o worker gevent')
+        else:
+            patch_psycopg()
@@ -4,7 +4,10 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.models.user import db, User
-from src.main import app
+from src.factory import create_app
+
+# Aplicação sem rotas nem Socket.IO: o script só usa o banco
+app = create_app(web=False)
 
 def list_users():
     """Lista todos os usuários cadastrados no banco de dados"""
@@ -1,142 +1,530 @@
 #!/usr/bin/env python3
 """
 Script para migrar dados do SQLite para PostgreSQL (Supabase)
+
+Lê cada tabela em blocos (pelo rowid do SQLite) e grava cada bloco com COPY
+em uma transação própria, junto com o checkpoint da tabela no destino: uma
+execução interrompida continua de onde parou. Tabelas sem dependência entre
+si são carregadas em paralelo; as demais esperam as tabelas referenciadas.
+No fim as sequências dos ids são ajustadas, contagem e checksum de cada
+tabela são comparados com a origem e o índice de busca de prestadores
+(provider_search, que não é copiado) é reconstruído no destino.
+
+    python migrate_to_postgres.py
+    python migrate_to_postgres.py --sqlite regiao-sul.db --workers 4 --chunk-size 20000
+    python migrate_to_postgres.py --restart          # descarta os checkpoints e recomeça
+    python migrate_to_postgres.py --verify-only      # só compara origem e destino
+
+O esquema do destino deve estar atualizado (flask --app src.main db upgrade com
+DATABASE_URL do PostgreSQL) e o da origem também: bancos SQLite antigos são
+atualizados com DATABASE_URL=sqlite:///caminho/app.db flask --app src.main db upgrade.
 """
 
+import argparse
+import hashlib
+import io
 import os
-import sys
 import sqlite3
-from sqlalchemy import create_engine, text
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime
 from dotenv import load_dotenv
-from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer
+from src.models.user import db
+from src.utils.search import SEARCH_TABLE
+# Todos os modelos mapeados para db.metadata conter todas as tabelas
+from src.models import service, request, proposal, evaluation, message, reference
 
 # Carrega as variáveis de ambiente
 load_dotenv()
 
-def convert_sqlite_to_postgres_value(value, column_name):
-    """Converte valores do SQLite para PostgreSQL"""
-    # Converte valores booleanos (SQLite usa 0/1, PostgreSQL usa true/false)
-    if column_name in ['is_active', 'is_verified', 'is_available', 'materials_included', 'is_read']:
-        return bool(value) if value is not None else None
-    
-    # Converte timestamps
-    if column_name in ['created_at', 'updated_at', 'preferred_date'] and isinstance(value, str):
-        try:
-            return datetime.fromisoformat(value.replace('Z', '+00:00'))
-        except:
-            return value
-    
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(__file__), 'src', 'database', 'app.db')
+
+# Progresso por tabela, gravado na mesma transação de cada bloco
+CHECKPOINT_TABLE = '_sqlite_migration_checkpoint'
+
+# Caracteres com significado no formato texto do COPY
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+COPY_NULL = '\\N'
+
+CHECKSUM_MODULUS = 2 ** 64
+
+_print_lock = threading.Lock()
+
+
+def log(message):
+    with _print_lock:
+        print(message, flush=True)
+
+
+class TablePlan:
+    """Colunas, tipos e dependências de uma tabela a migrar"""
+
+    def __init__(self, table, source_columns):
+        self.name = table.name
+        self.columns = [column.name for column in table.columns]
+        self.kinds = [_column_kind(column) for column in table.columns]
+        self.parents = {fk.column.table.name for fk in table.foreign_keys} - {self.name}
+        self.extra_columns = sorted(set(source_columns) - set(self.columns))
+
+        primary_key = list(table.primary_key.columns)
+        self.sequence_column = (
+            primary_key[0].name
+            if len(primary_key) == 1 and isinstance(primary_key[0].type, Integer) else None
+        )
+
+        self.identifier = sql.Identifier(self.name)
+        self.column_list = sql.SQL(', ').join(map(sql.Identifier, self.columns))
+        self.select = 'SELECT rowid, {} FROM "{}" WHERE rowid > ? ORDER BY rowid LIMIT ?'.format(
+            ', '.join(f'"{column}"' for column in self.columns), self.name
+        )
+
+    def copy_line(self, row):
+        return '\t'.join(_copy_value(value, kind) for value, kind in zip(row, self.kinds)) + '\n'
+
+    def insert_values(self, row):
+        return tuple(
+            bool(value) if kind == 'bool' and value is not None else value
+            for value, kind in zip(row, self.kinds)
+        )
+
+
+def _column_kind(column):
+    if isinstance(column.type, Boolean):
+        return 'bool'
+    if isinstance(column.type, (DateTime, Date)):
+        return 'datetime'
+    if isinstance(column.type, Float):
+        return 'float'
+    return None
+
+
+def _copy_value(value, kind):
+    if value is None:
+        return COPY_NULL
+    if kind == 'bool':
+        return 't' if value else 'f'
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, bytes):
+        return '\\\\x' + value.hex()
+    return str(value)
+
+
+def _normalize(value, kind):
+    """Mesma representação para o valor lido do SQLite e do PostgreSQL (checksum)"""
+    if value is None:
+        return None
+    if kind == 'bool':
+        return bool(value)
+    if kind == 'datetime':
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        return value.isoformat() if isinstance(value, (datetime, date)) else value
+    if kind == 'float':
+        return float(value)
     return value
 
-def migrate_data():
+
+def _row_digest(row, kinds):
+    values = tuple(_normalize(value, kind) for value, kind in zip(row, kinds))
+    return int.from_bytes(hashlib.blake2b(repr(values).encode(), digest_size=8).digest(), 'big')
+
+
+def connect_sqlite(path):
+    return sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+
+
+def connect_postgres(url):
+    # psycopg2 não entende o sufixo do driver usado pelo SQLAlchemy
+    connection = psycopg2.connect(url.replace('postgresql+psycopg2://', 'postgresql://', 1))
+    with connection.cursor() as cursor:
+        # Cada bloco grava dados e checkpoint juntos: perder os últimos commits numa
+        # queda do servidor só faz a próxima execução repetir esses blocos
+        cursor.execute('SET synchronous_commit TO off')
+    connection.commit()
+    return connection
+
+
+def plan_tables(sqlite_path):
+    """Tabelas dos modelos presentes na origem, na ordem das chaves estrangeiras"""
+    plans = []
+    missing = []
+    with connect_sqlite(sqlite_path) as source:
+        for table in db.metadata.sorted_tables:
+            source_columns = [row[1] for row in source.execute(f'PRAGMA table_info("{table.name}")')]
+            if not source_columns:
+                log(f"⚠️  Tabela {table.name} não encontrada no SQLite, pulando...")
+                continue
+            absent = [column.name for column in table.columns if column.name not in source_columns]
+            if absent:
+                missing.append(f"{table.name} ({', '.join(absent)})")
+                continue
+            plan = TablePlan(table, source_columns)
+            if plan.extra_columns:
+                log(f"⚠️  Colunas de {table.name} sem correspondente no modelo, ignoradas: {', '.join(plan.extra_columns)}")
+            plans.append(plan)
+
+    if missing:
+        raise RuntimeError(
+            'o esquema do SQLite está desatualizado, faltam colunas em ' + '; '.join(missing) +
+            f'. Atualize com DATABASE_URL=sqlite:///{os.path.abspath(sqlite_path)} flask --app src.main db upgrade'
+        )
+
+    # Tabelas ausentes na origem não bloqueiam as que as referenciam
+    names = {plan.name for plan in plans}
+    for plan in plans:
+        plan.parents &= names
+    return plans
+
+
+def prepare_target(postgres_url, plans, restart):
+    """
+    Confere o esquema do destino, cria a tabela de checkpoints e esvazia as
+    tabelas que ainda não começaram. Retorna os checkpoints {tabela: (rowid, linhas, concluída)}.
+    """
+    connection = connect_postgres(postgres_url)
+    try:
+        with connection, connection.cursor() as cursor:
+            absent = []
+            for plan in plans:
+                cursor.execute('SELECT to_regclass(%s)', (f'"{plan.name}"',))
+                if cursor.fetchone()[0] is None:
+                    absent.append(plan.name)
+            if absent:
+                raise RuntimeError(
+                    f"tabelas ausentes no PostgreSQL: {', '.join(absent)}. "
+                    'Crie o esquema com flask --app src.main db upgrade'
+                )
+
+            if restart:
+                cursor.execute(sql.SQL('DROP TABLE IF EXISTS {}').format(sql.Identifier(CHECKPOINT_TABLE)))
+            cursor.execute(sql.SQL(
+                'CREATE TABLE IF NOT EXISTS {} ('
+                'table_name TEXT PRIMARY KEY, last_rowid BIGINT NOT NULL, row_count BIGINT NOT NULL, '
+                'done BOOLEAN NOT NULL DEFAULT FALSE, updated_at TIMESTAMPTZ NOT NULL DEFAULT now())'
+            ).format(sql.Identifier(CHECKPOINT_TABLE)))
+            cursor.execute(sql.SQL('SELECT table_name, last_rowid, row_count, done FROM {}').format(
+                sql.Identifier(CHECKPOINT_TABLE)
+            ))
+            checkpoints = {name: (last_rowid, rows, done) for name, last_rowid, rows, done in cursor.fetchall()}
+
+            # Uma tabela só começa depois das que ela referencia, então as que não
+            # começaram não têm dependentes carregados e podem ser esvaziadas juntas
+            fresh = [plan.identifier for plan in plans if plan.name not in checkpoints]
+            if fresh:
+                # O índice de busca referencia "user" (o TRUNCATE exige os dois juntos) e é
+                # reconstruído no fim por rebuild_search_index
+                cursor.execute('SELECT to_regclass(%s)', (SEARCH_TABLE,))
+                if cursor.fetchone()[0] is not None:
+                    fresh.append(sql.Identifier(SEARCH_TABLE))
+                cursor.execute(sql.SQL('TRUNCATE TABLE {} RESTART IDENTITY').format(sql.SQL(', ').join(fresh)))
+    finally:
+        connection.close()
+
+    return checkpoints
+
+
+def _write_copy(cursor, plan, rows):
+    buffer = io.StringIO()
+    buffer.writelines(plan.copy_line(row[1:]) for row in rows)
+    buffer.seek(0)
+    cursor.copy_expert(
+        sql.SQL('COPY {} ({}) FROM STDIN').format(plan.identifier, plan.column_list).as_string(cursor),
+        buffer
+    )
+
+
+def _write_insert(cursor, plan, rows):
+    execute_values(
+        cursor,
+        sql.SQL('INSERT INTO {} ({}) VALUES %s').format(plan.identifier, plan.column_list).as_string(cursor),
+        [plan.insert_values(row[1:]) for row in rows],
+        page_size=1000
+    )
+
+
+WRITERS = {'copy': _write_copy, 'insert': _write_insert}
+
+
+def _save_checkpoint(cursor, name, last_rowid, rows, done=False):
+    cursor.execute(sql.SQL(
+        'INSERT INTO {} (table_name, last_rowid, row_count, done) VALUES (%s, %s, %s, %s) '
+        'ON CONFLICT (table_name) DO UPDATE SET last_rowid = EXCLUDED.last_rowid, '
+        'row_count = EXCLUDED.row_count, done = EXCLUDED.done, updated_at = now()'
+    ).format(sql.Identifier(CHECKPOINT_TABLE)), (name, last_rowid, rows, done))
+
+
+def _reset_sequence(cursor, plan):
+    """Próximo id da sequência depois do maior id migrado"""
+    if plan.sequence_column is None:
+        return
+    cursor.execute(
+        sql.SQL('SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({column}), 1), MAX({column}) IS NOT NULL) FROM {table}').format(
+            column=sql.Identifier(plan.sequence_column), table=plan.identifier
+        ),
+        (f'"{plan.name}"', plan.sequence_column)
+    )
+
+
+def copy_table(plan, sqlite_path, postgres_url, chunk_size, method, checkpoint):
+    """Copia uma tabela bloco a bloco a partir do checkpoint; retorna as linhas gravadas nesta execução"""
+    last_rowid, rows, _ = checkpoint or (0, 0, False)
+    resumed_rows = rows
+    write = WRITERS[method]
+    started = reported = time.perf_counter()
+
+    source = connect_sqlite(sqlite_path)
+    target = connect_postgres(postgres_url)
+    try:
+        if checkpoint:
+            log(f"↪️  {plan.name}: retomando após {rows} registros")
+        while True:
+            batch = source.execute(plan.select, (last_rowid, chunk_size)).fetchall()
+            if not batch:
+                break
+            with target, target.cursor() as cursor:
+                write(cursor, plan, batch)
+                last_rowid, rows = batch[-1][0], rows + len(batch)
+                _save_checkpoint(cursor, plan.name, last_rowid, rows)
+
+            now = time.perf_counter()
+            if now - reported >= 5:
+                reported = now
+                log(f"   {plan.name}: {rows} registros ({(rows - resumed_rows) / (now - started):.0f}/s)")
+
+        with target, target.cursor() as cursor:
+            _reset_sequence(cursor, plan)
+            _save_checkpoint(cursor, plan.name, last_rowid, rows, done=True)
+    finally:
+        source.close()
+        target.close()
+
+    elapsed = time.perf_counter() - started
+    log(f"✅ Migrados {rows} registros da tabela {plan.name} ({elapsed:.1f}s)")
+    return rows - resumed_rows
+
+
+def run_parallel(plans, task, workers, completed=()):
+    """
+    Executa task(plan) com até `workers` tabelas ao mesmo tempo, cada uma só
+    depois das tabelas que ela referencia. Uma falha não interrompe as tabelas
+    independentes; as dependentes dela não são executadas.
+    Retorna ({tabela: resultado}, {tabela: erro}).
+    """
+    pending = {plan.name: plan for plan in plans if plan.name not in completed}
+    done = set(completed)
+    results, failures = {}, {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while pending or running:
+            for name, plan in list(pending.items()):
+                if plan.parents <= done:
+                    running[executor.submit(task, plan)] = name
+                    del pending[name]
+                elif plan.parents & failures.keys():
+                    failures[name] = 'depende de tabela que falhou'
+                    del pending[name]
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                    done.add(name)
+                except Exception as e:
+                    failures[name] = str(e).strip()
+                    log(f"❌ Erro ao migrar tabela {name}: {failures[name]}")
+
+    for name in pending:
+        failures[name] = 'dependência circular entre tabelas'
+    return results, failures
+
+
+def verify_table(plan, sqlite_path, postgres_url, chunk_size, checksum):
+    """Contagem e checksum (soma dos hashes das linhas, independe da ordem) na origem e no destino"""
+    quoted_columns = ', '.join(f'"{column}"' for column in plan.columns)
+    summary = {}
+
+    source = connect_sqlite(sqlite_path)
+    try:
+        if checksum:
+            count = total = 0
+            cursor = source.execute(f'SELECT {quoted_columns} FROM "{plan.name}"')
+            while batch := cursor.fetchmany(chunk_size):
+                count += len(batch)
+                total = (total + sum(_row_digest(row, plan.kinds) for row in batch)) % CHECKSUM_MODULUS
+            summary['source'] = (count, total)
+        else:
+            summary['source'] = (source.execute(f'SELECT COUNT(*) FROM "{plan.name}"').fetchone()[0], None)
+    finally:
+        source.close()
+
+    target = connect_postgres(postgres_url)
+    try:
+        if checksum:
+            count = total = 0
+            # Cursor nomeado: as linhas vêm do servidor em blocos
+            with target.cursor(name=f'verify_{plan.name}') as cursor:
+                cursor.itersize = chunk_size
+                cursor.execute(sql.SQL('SELECT {} FROM {}').format(plan.column_list, plan.identifier))
+                for row in cursor:
+                    count += 1
+                    total = (total + _row_digest(row, plan.kinds)) % CHECKSUM_MODULUS
+            summary['target'] = (count, total)
+        else:
+            with target.cursor() as cursor:
+                cursor.execute(sql.SQL('SELECT COUNT(*) FROM {}').format(plan.identifier))
+                summary['target'] = (cursor.fetchone()[0], None)
+        target.rollback()
+    finally:
+        target.close()
+
+    if summary['source'] != summary['target']:
+        raise RuntimeError(
+            f"divergência: SQLite {summary['source'][0]} registros, PostgreSQL {summary['target'][0]} registros"
+            + (' (checksum diferente)' if summary['source'][0] == summary['target'][0] else '')
+        )
+    log(f"✅ {plan.name}: {summary['source'][0]} registros conferidos" + (' (contagem e checksum)' if checksum else ''))
+    return summary['source'][0]
+
+
+def rebuild_search_index(postgres_url):
+    """
+    Reconstrói provider_search no destino a partir dos usuários e serviços
+    migrados. Retorna o número de prestadores indexados.
+    """
+    from src.config import ProductionConfig
+    from src.factory import create_app
+    from src.utils.search import reindex_all_providers
+
+    class TargetConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = postgres_url
+        SCHEMA_CHECK = 'off'
+        DB_POOL_PROFILE = 'null'
+        # Sem limite por comando: o INSERT ... SELECT percorre todos os prestadores
+        DB_STATEMENT_TIMEOUT_MS = 0
+
+    app = create_app(TargetConfig, web=False)
+    with app.app_context():
+        total = reindex_all_providers()
+        db.engine.dispose()
+    return total
+
+
+def drop_checkpoints(postgres_url):
+    connection = connect_postgres(postgres_url)
+    try:
+        with connection, connection.cursor() as cursor:
+            cursor.execute(sql.SQL('DROP TABLE IF EXISTS {}').format(sql.Identifier(CHECKPOINT_TABLE)))
+    finally:
+        connection.close()
+
+
+def migrate_data(sqlite_path, postgres_url, chunk_size=10000, workers=4, method='copy',
+                 restart=False, verify=True, checksum=True, verify_only=False):
     """Migra dados do SQLite para PostgreSQL"""
-    
-    # Configurações
-    sqlite_db_path = os.path.join(os.path.dirname(__file__), 'src', 'database', 'app.db')
-    postgres_url = os.environ.get('DATABASE_URL')
-    
+
     if not postgres_url:
         print("❌ DATABASE_URL não encontrada no arquivo .env")
         return False
-    
-    if not os.path.exists(sqlite_db_path):
-        print(f"❌ Banco SQLite não encontrado em: {sqlite_db_path}")
+
+    if not os.path.exists(sqlite_path):
+        print(f"❌ Banco SQLite não encontrado em: {sqlite_path}")
         print("ℹ️  Isso é normal se for a primeira execução. As tabelas serão criadas no PostgreSQL.")
         return True
-    
+
     try:
-        # Conecta ao SQLite
-        sqlite_conn = sqlite3.connect(sqlite_db_path)
-        sqlite_conn.row_factory = sqlite3.Row
-        
-        # Conecta ao PostgreSQL
-        postgres_engine = create_engine(postgres_url)
-        
-        print("🔄 Iniciando migração dos dados...")
-        
-        # Lista de tabelas para migrar (na ordem correta devido às foreign keys)
-        # Nota: 'user' é uma palavra reservada no PostgreSQL, então usamos aspas
-        tables_to_migrate = [
-            ('service_category', 'service_category'),
-            ('user', '"user"'),  # Aspas para palavra reservada
-            ('service_request', 'service_request'),
-            ('provider_service', 'provider_service'),
-            ('proposal', 'proposal'),
-            ('evaluation', 'evaluation'),
-            ('message', 'message')
-        ]
-        
-        with postgres_engine.connect() as postgres_conn:
-            # Inicia uma transação
-            trans = postgres_conn.begin()
-            
-            try:
-                for sqlite_table, postgres_table in tables_to_migrate:
-                    try:
-                        # Verifica se a tabela existe no SQLite
-                        cursor = sqlite_conn.execute(
-                            "SELECT name FROM sqlite_master WHERE type='table' AND name=?", 
-                            (sqlite_table,)
-                        )
-                        if not cursor.fetchone():
-                            print(f"⚠️  Tabela {sqlite_table} não encontrada no SQLite, pulando...")
-                            continue
-                        
-                        # Busca dados do SQLite
-                        cursor = sqlite_conn.execute(f"SELECT * FROM {sqlite_table}")
-                        rows = cursor.fetchall()
-                        
-                        if not rows:
-                            print(f"ℹ️  Tabela {sqlite_table} está vazia, pulando...")
-                            continue
-                        
-                        # Prepara os dados para inserção
-                        columns = [description[0] for description in cursor.description]
-                        
-                        # Limpa a tabela no PostgreSQL antes de inserir
-                        postgres_conn.execute(text(f"TRUNCATE TABLE {postgres_table} RESTART IDENTITY CASCADE"))
-                        
-                        # Insere os dados no PostgreSQL
-                        for row in rows:
-                            placeholders = ', '.join([f':{col}' for col in columns])
-                            query = f"INSERT INTO {postgres_table} ({', '.join(columns)}) VALUES ({placeholders})"
-                            
-                            # Converte Row para dict e ajusta os valores
-                            row_dict = {}
-                            for col in columns:
-                                row_dict[col] = convert_sqlite_to_postgres_value(row[col], col)
-                            
-                            postgres_conn.execute(text(query), row_dict)
-                        
-                        print(f"✅ Migrados {len(rows)} registros da tabela {sqlite_table}")
-                        
-                    except Exception as e:
-                        print(f"❌ Erro ao migrar tabela {sqlite_table}: {str(e)}")
-                        continue
-                
-                # Confirma a transação
-                trans.commit()
-                
-            except Exception as e:
-                # Desfaz a transação em caso de erro
-                trans.rollback()
-                raise e
-        
-        sqlite_conn.close()
+        plans = plan_tables(sqlite_path)
+
+        if not verify_only:
+            print("🔄 Iniciando migração dos dados...")
+            started = time.perf_counter()
+            checkpoints = prepare_target(postgres_url, plans, restart)
+            completed = {name for name, (_, _, done) in checkpoints.items() if done}
+            for name in sorted(completed):
+                print(f"⏭️  {name}: já migrada em uma execução anterior")
+
+            results, failures = run_parallel(
+                plans,
+                lambda plan: copy_table(plan, sqlite_path, postgres_url, chunk_size, method, checkpoints.get(plan.name)),
+                workers, completed
+            )
+            if failures:
+                for name, error in failures.items():
+                    print(f"❌ {name}: {error}")
+                print("ℹ️  Corrija o problema e execute novamente: as tabelas concluídas e os blocos gravados são mantidos.")
+                return False
+
+            elapsed = time.perf_counter() - started
+            rows = sum(results.values())
+            print(f"📦 {rows} registros gravados em {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f}/s)")
+
+        if verify or verify_only:
+            print("🔍 Conferindo os dados migrados...")
+            _, failures = run_parallel(
+                plans, lambda plan: verify_table(plan, sqlite_path, postgres_url, chunk_size, checksum), workers
+            )
+            if failures:
+                for name, error in failures.items():
+                    print(f"❌ {name}: {error}")
+                return False
+
+        if verify_only:
+            print("🎉 Origem e destino conferem!")
+            return True
+
+        total = rebuild_search_index(postgres_url)
+        print(f"🔎 Índice de busca reconstruído: {total} prestadores")
+
+        drop_checkpoints(postgres_url)
         print("🎉 Migração concluída com sucesso!")
         return True
-        
+
     except Exception as e:
         print(f"❌ Erro durante a migração: {str(e)}")
         return False
 
-if __name__ == '__main__':
+
+def main():
+    parser = argparse.ArgumentParser(description='Migra os dados do SQLite para o PostgreSQL')
+    parser.add_argument('--sqlite', default=DEFAULT_SQLITE_PATH, help='arquivo SQLite de origem')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), help='PostgreSQL de destino (padrão: DATABASE_URL)')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='registros por bloco/transação')
+    parser.add_argument('--workers', type=int, default=4, help='tabelas carregadas em paralelo')
+    parser.add_argument('--method', choices=sorted(WRITERS), default='copy', help='COPY (padrão) ou INSERT em lote')
+    parser.add_argument('--restart', action='store_true', help='ignora os checkpoints e recomeça do zero')
+    parser.add_argument('--no-verify', dest='verify', action='store_false', help='não confere os dados no fim')
+    parser.add_argument('--no-checksum', dest='checksum', action='store_false', help='confere só a contagem de registros')
+    parser.add_argument('--verify-only', action='store_true', help='só compara origem e destino')
+    args = parser.parse_args()
+
     print("🚀 Iniciando migração do SQLite para PostgreSQL...")
-    success = migrate_data()
-    
+    success = migrate_data(
+        args.sqlite, args.database_url, chunk_size=args.chunk_size, workers=args.workers, method=args.method,
+        restart=args.restart, verify=args.verify, checksum=args.checksum, verify_only=args.verify_only
+    )
+
     if success:
         print("\n✅ Migração concluída! Agora você pode iniciar a aplicação com PostgreSQL.")
         sys.exit(0)
     else:
         print("\n❌ Migração falhou. Verifique os logs acima.")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Esquema inicial (tabelas criadas até então por db.create_all())
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# if_not_exists: bancos criados pelo antigo db.create_all() já têm estas
+# tabelas e passam por esta revisão sem alterações
+
+
+def upgrade():
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('user_type', sa.String(length=20), nullable=False),
+        sa.Column('address', sa.String(length=255), nullable=True),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('state', sa.String(length=50), nullable=True),
+        sa.Column('zip_code', sa.String(length=10), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('profile_picture', sa.String(length=255), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('bio', sa.Text(), nullable=True),
+        sa.Column('experience_years', sa.Integer(), nullable=True),
+        sa.Column('service_radius', sa.Integer(), nullable=True),
+        sa.Column('is_available', sa.Boolean(), nullable=True),
+        sa.Column('average_rating', sa.Float(), nullable=True),
+        sa.Column('total_services', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'service_category',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('icon', sa.String(length=100), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'provider_service',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('provider_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('base_price', sa.Float(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['service_category.id']),
+        sa.ForeignKeyConstraint(['provider_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'service_request',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('address', sa.String(length=255), nullable=False),
+        sa.Column('city', sa.String(length=100), nullable=False),
+        sa.Column('state', sa.String(length=50), nullable=False),
+        sa.Column('zip_code', sa.String(length=10), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('urgency', sa.String(length=20), nullable=True),
+        sa.Column('budget_min', sa.Float(), nullable=True),
+        sa.Column('budget_max', sa.Float(), nullable=True),
+        sa.Column('preferred_date', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('images', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['service_category.id']),
+        sa.ForeignKeyConstraint(['client_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'proposal',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('service_request_id', sa.Integer(), nullable=False),
+        sa.Column('provider_id', sa.Integer(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('estimated_duration', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('materials_included', sa.Boolean(), nullable=True),
+        sa.Column('availability', sa.String(length=200), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['provider_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['service_request_id'], ['service_request.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'evaluation',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('service_request_id', sa.Integer(), nullable=False),
+        sa.Column('evaluator_id', sa.Integer(), nullable=False),
+        sa.Column('evaluated_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('punctuality', sa.Integer(), nullable=True),
+        sa.Column('quality', sa.Integer(), nullable=True),
+        sa.Column('communication', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['evaluated_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['evaluator_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['service_request_id'], ['service_request.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'message',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('service_request_id', sa.Integer(), nullable=False),
+        sa.Column('sender_id', sa.Integer(), nullable=False),
+        sa.Column('receiver_id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('message_type', sa.String(length=20), nullable=True),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['receiver_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['sender_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['service_request_id'], ['service_request.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('message')
+    op.drop_table('evaluation')
+    op.drop_table('proposal')
+    op.drop_table('service_request')
+    op.drop_table('provider_service')
+    op.drop_table('service_category')
+    op.drop_table('user')
@@ -0,0 +1,204 @@
+"""Busca textual, grade espacial, agregados de avaliação e índices das consultas frequentes
+
+Revision ID: 0002_search_geo_ratings_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.geo import geo_cell
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_search_geo_ratings_indexes'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+RATING_COLUMNS = [
+    ('rating_sum', 'rating'), ('rating_count', 'rating'),
+    ('punctuality_sum', 'punctuality'), ('punctuality_count', 'punctuality'),
+    ('quality_sum', 'quality'), ('quality_count', 'quality'),
+    ('communication_sum', 'communication'), ('communication_count', 'communication'),
+]
+
+# (nome, tabela, colunas) - mesmos índices declarados nos modelos
+INDEXES = [
+    ('ix_user_geo_cell', 'user', ['geo_cell']),
+    ('ix_user_type_active_verified', 'user', ['user_type', 'is_active', 'is_verified']),
+    ('ix_user_created_at_id', 'user', ['created_at', 'id']),
+    ('ix_service_request_status_created', 'service_request', ['status', 'created_at']),
+    ('ix_service_request_client_created', 'service_request', ['client_id', 'created_at', 'id']),
+    ('ix_service_request_feed', 'service_request', ['status', 'category_id', 'urgency_rank', 'created_at', 'id']),
+    ('ix_service_request_geo', 'service_request', ['status', 'geo_cell']),
+    ('ix_proposal_request_status', 'proposal', ['service_request_id', 'status']),
+    ('ix_proposal_provider_created', 'proposal', ['provider_id', 'created_at', 'id']),
+    ('ix_proposal_request_provider', 'proposal', ['service_request_id', 'provider_id']),
+    ('ix_evaluation_evaluated_created', 'evaluation', ['evaluated_id', 'created_at', 'id']),
+    ('ix_evaluation_evaluator_created', 'evaluation', ['evaluator_id', 'created_at', 'id']),
+    ('ix_evaluation_request_evaluator_evaluated', 'evaluation', ['service_request_id', 'evaluator_id', 'evaluated_id']),
+    ('ix_provider_service_category_active', 'provider_service', ['category_id', 'is_active', 'provider_id']),
+    ('ix_provider_service_provider_category', 'provider_service', ['provider_id', 'category_id']),
+    ('ix_message_request_created', 'message', ['service_request_id', 'created_at', 'id']),
+]
+
+SEARCH_TABLE = 'provider_search'
+PG_TEXT_CONFIG = 'portuguese'
+BACKFILL_CHUNK = 1000
+
+
+def _dialect():
+    return op.get_bind().dialect.name
+
+
+def _add_column_if_missing(table, column):
+    # Bancos criados pelo antigo db.create_all() com versões recentes dos modelos já têm a coluna
+    existing = {col['name'] for col in sa.inspect(op.get_bind()).get_columns(table)}
+    if column.name not in existing:
+        op.add_column(table, column)
+
+
+def _backfill_geo_cells(table):
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        f'SELECT id, latitude, longitude FROM "{table}" '
+        'WHERE latitude IS NOT NULL AND longitude IS NOT NULL'
+    )).fetchall()
+
+    params = [{'id': row[0], 'cell': geo_cell(row[1], row[2])} for row in rows]
+    statement = sa.text(f'UPDATE "{table}" SET geo_cell = :cell WHERE id = :id')
+    for start in range(0, len(params), BACKFILL_CHUNK):
+        bind.execute(statement, params[start:start + BACKFILL_CHUNK])
+
+
+def _backfill_rating_aggregates():
+    assignments = ', '.join(
+        f'{column} = (SELECT COALESCE({"SUM" if column.endswith("_sum") else "COUNT"}({source}), 0) '
+        f'FROM evaluation WHERE evaluation.evaluated_id = "user".id)'
+        for column, source in RATING_COLUMNS
+    )
+    op.execute(f'UPDATE "user" SET {assignments} WHERE id IN (SELECT evaluated_id FROM evaluation)')
+
+    # Média e total de serviços a partir dos agregados, como recompute_rating_aggregates();
+    # o * 1.0 evita a divisão inteira (numeric no PostgreSQL, real no SQLite)
+    op.execute(
+        'UPDATE "user" SET average_rating = CASE WHEN rating_count > 0 '
+        'THEN ROUND(rating_sum * 1.0 / rating_count, 2) ELSE 0 END'
+    )
+    op.execute('UPDATE "user" SET total_services = rating_count WHERE user_type = \'provider\'')
+
+
+def _create_search_table():
+    if _dialect() == 'sqlite':
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "name, bio, services, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        services = "group_concat(sc.name || ' ' || COALESCE(ps.description, ''), ' ')"
+        document = f"u.id, COALESCE(u.name, ''), COALESCE(u.bio, ''), COALESCE(({{services}}), '')"
+        columns = 'rowid, name, bio, services'
+    else:
+        op.execute(
+            f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+            'provider_id INTEGER PRIMARY KEY REFERENCES "user" (id) ON DELETE CASCADE, '
+            'document TSVECTOR NOT NULL)'
+        )
+        services = "string_agg(concat_ws(' ', sc.name, ps.description), ' ')"
+        document = (
+            f"u.id, setweight(to_tsvector('{PG_TEXT_CONFIG}', COALESCE(u.name, '')), 'A') || "
+            f"setweight(to_tsvector('{PG_TEXT_CONFIG}', COALESCE(({{services}}), '')), 'B') || "
+            f"setweight(to_tsvector('{PG_TEXT_CONFIG}', COALESCE(u.bio, '')), 'C')"
+        )
+        columns = 'provider_id, document'
+
+    subquery = (
+        f'SELECT {services} FROM provider_service ps '
+        'JOIN service_category sc ON sc.id = ps.category_id '
+        'WHERE ps.provider_id = u.id AND ps.is_active = :active'
+    )
+    op.execute(f'DELETE FROM {SEARCH_TABLE}')
+    op.get_bind().execute(sa.text(
+        f'INSERT INTO {SEARCH_TABLE} ({columns}) '
+        f'SELECT {document.format(services=subquery)} FROM "user" u WHERE u.user_type = :provider'
+    ), {'active': True, 'provider': 'provider'})
+
+
+def _drop_invalid_index(name):
+    # Um CREATE INDEX CONCURRENTLY interrompido deixa o índice marcado como inválido;
+    # o IF NOT EXISTS o manteria assim, então é removido e recriado
+    invalid = op.get_bind().execute(sa.text(
+        'SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+        'WHERE c.relname = :name AND NOT i.indisvalid'
+    ), {'name': name}).scalar()
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def _create_indexes():
+    postgres = _dialect() == 'postgresql'
+
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação e não bloqueia escritas
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if postgres:
+                _drop_invalid_index(name)
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+        if postgres:
+            _drop_invalid_index(f'ix_{SEARCH_TABLE}_document')
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{SEARCH_TABLE}_document '
+                f'ON {SEARCH_TABLE} USING GIN (document)'
+            )
+
+
+def upgrade():
+    _add_column_if_missing('user', sa.Column('geo_cell', sa.Integer(), nullable=True))
+    for column, _ in RATING_COLUMNS:
+        _add_column_if_missing('user', sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+    _add_column_if_missing('service_request', sa.Column('geo_cell', sa.Integer(), nullable=True))
+    _add_column_if_missing('service_request', sa.Column(
+        'urgency_rank', sa.SmallInteger(), nullable=False, server_default='1'
+    ))
+
+    op.create_table(
+        'reference_version',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+        if_not_exists=True
+    )
+
+    # Colunas derivadas, mantidas pelos modelos a partir daqui
+    _backfill_geo_cells('user')
+    _backfill_geo_cells('service_request')
+    op.execute(
+        "UPDATE service_request SET urgency_rank = CASE urgency "
+        "WHEN 'low' THEN 0 WHEN 'high' THEN 2 WHEN 'urgent' THEN 3 ELSE 1 END"
+    )
+    _backfill_rating_aggregates()
+    _create_search_table()
+
+    # Índices por último, já com os dados preenchidos
+    _create_indexes()
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+    op.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+    op.drop_table('reference_version')
+
+    with op.batch_alter_table('service_request') as batch_op:
+        batch_op.drop_column('urgency_rank')
+        batch_op.drop_column('geo_cell')
+
+    with op.batch_alter_table('user') as batch_op:
+        for column, _ in reversed(RATING_COLUMNS):
+            batch_op.drop_column(column)
+        batch_op.drop_column('geo_cell')
@@ -5,7 +5,10 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from src.models.user import db
 from src.models.service import ServiceCategory
-from src.main import app
+from src.factory import create_app
+
+# Aplicação sem rotas nem Socket.IO: o script só usa o banco
+app = create_app(web=False)
 
 def populate_categories():
     categories = [
@@ -13,6 +13,23 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///app.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Pool de conexões (ver src/utils/db_pool.py): perfil direct, pgbouncer ou null
+    DB_POOL_PROFILE = os.environ.get('DB_POOL_PROFILE', 'direct')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))  # segundos inteiros
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    # Limite de execução por comando SQL em ms (PostgreSQL); vazio = sem limite
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS') or 0) or None
+    
+    # Réplicas de leitura separadas por vírgula (ver src/utils/replicas.py); vazio = só o primário
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    # Janela (s) em que as leituras de quem acabou de escrever ficam no primário
+    DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 10))
+    
+    # Verificação da revisão do esquema na inicialização: check, upgrade ou off
+    SCHEMA_CHECK = os.environ.get('SCHEMA_CHECK', 'check')
+    
     # Configurações do Supabase
     SUPABASE_URL = os.environ.get('SUPABASE_URL')
     SUPABASE_ANON_KEY = os.environ.get('SUPABASE_ANON_KEY')
@@ -21,11 +38,50 @@ class Config:
     # Configurações do JWT
     JWT_ACCESS_TOKEN_EXPIRES = False
     JWT_ALGORITHM = 'HS256'
+    
+    # Fila de mensagens (ex.: redis://...) para o Socket.IO com vários workers/instâncias
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    # threading, gevent ou eventlet; vazio detecta pelo que estiver instalado (ver gunicorn.conf.py)
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE') or None
+    
+    # Intervalo (s) entre verificações de versão dos snapshots de dados de referência
+    REFERENCE_CACHE_TTL = float(os.environ.get('REFERENCE_CACHE_TTL', 5))
+    
+    # Métricas Prometheus em /api/_metrics (desativadas por padrão)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+    METRICS_FLUSH_INTERVAL = int(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+    
+    # Logging (ver src/utils/logging_config.py): formato json ou text (padrão: json em
+    # produção), destino stdout ou file (logs/ com rotação externa pelo logrotate)
+    LOG_FORMAT = os.environ.get('LOG_FORMAT')
+    LOG_DESTINATION = os.environ.get('LOG_DESTINATION', 'stdout')
+    LOG_DIR = os.environ.get('LOG_DIR')
+    LOG_LEVEL = os.environ.get('LOG_LEVEL')  # padrão: DEBUG em desenvolvimento, INFO nos demais
+    # Fração das requisições com logs INFO/DEBUG gravados (avisos e erros sempre)
+    LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+    # Registros aguardando a thread de gravação; acima disso são descartados
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    
+    # Hash de senhas (ver src/utils/passwords.py): método do werkzeug para hashes novos
+    # (os antigos são refeitos no login), threads do pool por worker, operações que podem
+    # esperar na fila e espera máxima (s) antes de responder 503
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 16))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 5))
+    
+    # Cache por worker do usuário autenticado (ver src/utils/identity.py): validade (s) de
+    # cada registro, 0 desativa, e número máximo de usuários
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 5))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 10000))
 
 class DevelopmentConfig(Config):
     """Configurações para desenvolvimento"""
     DEBUG = True
     FLASK_ENV = 'development'
+    SCHEMA_CHECK = os.environ.get('SCHEMA_CHECK', 'upgrade')
 
 class ProductionConfig(Config):
     """Configurações para produção"""
@@ -36,6 +92,10 @@ class TestingConfig(Config):
     """Configurações para testes"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SCHEMA_CHECK = 'upgrade'
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'WARNING')
+    # Uma iteração, como o hash pré-calculado da massa sintética (src/utils/synthetic_data.py)
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1')
 
 # Dicionário de configurações
 config = {
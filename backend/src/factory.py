@@ -0,0 +1,175 @@
+import os
+import weakref
+from flask import Flask
+from flask_cors import CORS
+from flask_jwt_extended import JWTManager
+from sqlalchemy.pool import StaticPool
+from src.config import config
+from src.models.user import db
+from src.utils.db_pool import engine_options, setup_pool
+from src.utils.identity import init_identity
+from src.utils.logging_config import setup_logging, setup_request_logging
+from src.utils.replicas import replica_binds, setup_replica_routing
+from src.utils.schema import init_migrations, running_cli, verify_schema
+from src.utils.serialization import FastJSONProvider
+
+# Extensões criadas sem aplicação; ligadas a cada app em create_app()
+cors = CORS()
+jwt = JWTManager()
+
+# Engines cujo pool herdado é descartado nos processos filhos; referências fracas
+# para não manter vivos os engines de aplicações já descartadas (scripts, benchmarks)
+_fork_engines = weakref.WeakSet()
+
+
+def create_app(config_name=None, web=True):
+    """
+    Cria e configura a aplicação.
+
+    config_name é uma chave de src.config.config ou uma classe de configuração;
+    por padrão usa FLASK_ENV. Com web=False (scripts de manutenção) não registra
+    rotas, Socket.IO, CORS nem métricas, só banco, JWT e logging.
+    """
+    if config_name is None:
+        config_name = os.environ.get('FLASK_ENV', 'development')
+    config_object = config[config_name] if isinstance(config_name, str) else config_name
+
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config.from_object(config_object)
+    # orjson quando instalado; modelos @serializable vão direto para o jsonify
+    app.json = FastJSONProvider(app)
+
+    setup_logging(app)
+    jwt.init_app(app)
+    init_identity(jwt)
+
+    # Sem limite por comando no CLI: migrações criam índices em tabelas grandes
+    cli = running_cli()
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **engine_options(app.config['SQLALCHEMY_DATABASE_URI'], app.config, statement_timeout=not cli),
+        **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    }
+    # Réplicas de leitura só atendem rotas (ver src/utils/replicas.py)
+    if web:
+        app.config['SQLALCHEMY_BINDS'] = {
+            **replica_binds(app.config, statement_timeout=not cli),
+            **app.config.get('SQLALCHEMY_BINDS', {})
+        }
+
+    _import_models()
+    db.init_app(app)
+
+    if web:
+        _init_web(app)
+
+    _register_commands(app)
+    if cli:
+        init_migrations(app)
+
+    # O esquema é criado/alterado pelas migrações (flask --app src.main db upgrade);
+    # aqui só a revisão é conferida
+    with app.app_context():
+        for engine in db.engines.values():
+            setup_pool(app, engine, statement_timeout=not cli)
+        verify_schema(app)
+        for engine in db.engines.values():
+            _prepare_for_fork(engine)
+
+    return app
+
+
+def _import_models():
+    # Todos os modelos precisam estar mapeados antes do primeiro uso das relações
+    from src.models import service, request, proposal, evaluation, message, reference
+
+
+def _init_web(app):
+    from src.utils.metrics import setup_metrics
+    from src.utils.static_assets import setup_static_assets
+    from src.utils.realtime import socketio
+
+    setup_request_logging(app)
+    setup_metrics(app)
+    setup_replica_routing(app)
+
+    cors.init_app(app, origins="*")
+
+    # Eventos em tempo real, ver src/utils/realtime.py
+    socketio.init_app(
+        app,
+        cors_allowed_origins="*",
+        message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'),
+        async_mode=app.config.get('SOCKETIO_ASYNC_MODE')
+    )
+
+    _register_blueprints(app)
+    setup_static_assets(app)
+
+
+def _register_blueprints(app):
+    from src.routes.user import user_bp
+    from src.routes.auth import auth_bp
+    from src.routes.service import service_bp
+    from src.routes.order import order_bp
+    from src.routes.proposal import proposal_bp
+    from src.routes.evaluation import evaluation_bp
+    from src.routes.message import message_bp
+    from src.routes.health import health_bp
+
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(service_bp, url_prefix='/api/services')
+    app.register_blueprint(order_bp, url_prefix='/api/orders')
+    app.register_blueprint(message_bp, url_prefix='/api/orders')
+    app.register_blueprint(proposal_bp, url_prefix='/api/proposals')
+    app.register_blueprint(evaluation_bp, url_prefix='/api/evaluations')
+    app.register_blueprint(health_bp, url_prefix='/api')
+
+
+def _register_commands(app):
+    @app.cli.command('reindex-search')
+    def reindex_search_command():
+        """Reconstrói o índice de busca textual dos prestadores"""
+        from src.utils.search import reindex_all_providers
+
+        total = reindex_all_providers()
+        print(f'{total} prestadores indexados')
+
+    @app.cli.command('recompute-ratings')
+    def recompute_ratings_command():
+        """Recalcula os agregados de avaliação de todos os usuários"""
+        from src.utils.ratings import recompute_rating_aggregates
+
+        total = recompute_rating_aggregates()
+        print(f'Agregados recalculados para {total} usuários avaliados')
+
+    @app.cli.command('compress-static')
+    def compress_static_command():
+        """Grava as variantes .gz/.br dos arquivos estáticos (rodar após copiar o build)"""
+        from src.utils.static_assets import compress_static
+
+        total = compress_static(app.static_folder)
+        print(f'{total} variantes comprimidas gravadas em {app.static_folder}')
+
+
+def _prepare_for_fork(engine):
+    """
+    Seguro para gunicorn --preload: fecha as conexões abertas no processo
+    mestre e faz cada filho descartar o pool herdado sem fechar os sockets do pai
+    """
+    # SQLite em memória (testes) vive na única conexão do StaticPool
+    if isinstance(engine.pool, StaticPool):
+        return
+
+    engine.dispose()
+    _fork_engines.add(engine)
+
+
+def _dispose_engines_in_child():
+    for engine in list(_fork_engines):
+        engine.dispose(close=False)
+
+
+# Um único hook por processo, registrado na importação: create_app() pode rodar várias vezes
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_engines_in_child)
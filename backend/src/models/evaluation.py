@@ -1,7 +1,19 @@
 from src.models.user import db
 from datetime import datetime
+from src.utils.serialization import serializable
 
+@serializable(
+    'id', 'service_request_id', 'evaluator_id', 'evaluated_id', 'rating', 'comment',
+    'punctuality', 'quality', 'communication', 'created_at'
+)
 class Evaluation(db.Model):
+    __table_args__ = (
+        # Avaliações recebidas/dadas paginadas por (created_at, id)
+        db.Index('ix_evaluation_evaluated_created', 'evaluated_id', 'created_at', 'id'),
+        db.Index('ix_evaluation_evaluator_created', 'evaluator_id', 'created_at', 'id'),
+        db.Index('ix_evaluation_request_evaluator_evaluated', 'service_request_id', 'evaluator_id', 'evaluated_id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     service_request_id = db.Column(db.Integer, db.ForeignKey('service_request.id'), nullable=False)
     evaluator_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # quem avalia
@@ -12,18 +24,3 @@ class Evaluation(db.Model):
     quality = db.Column(db.Integer, nullable=True)  # 1 a 5
     communication = db.Column(db.Integer, nullable=True)  # 1 a 5
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'service_request_id': self.service_request_id,
-            'evaluator_id': self.evaluator_id,
-            'evaluated_id': self.evaluated_id,
-            'rating': self.rating,
-            'comment': self.comment,
-            'punctuality': self.punctuality,
-            'quality': self.quality,
-            'communication': self.communication,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
-
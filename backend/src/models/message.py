@@ -1,7 +1,17 @@
 from src.models.user import db
 from datetime import datetime
+from src.utils.serialization import serializable
 
+@serializable(
+    'id', 'service_request_id', 'sender_id', 'receiver_id', 'content', 'message_type',
+    'is_read', 'created_at'
+)
 class Message(db.Model):
+    __table_args__ = (
+        # Histórico paginado por pedido: WHERE service_request_id = ? ORDER BY created_at DESC, id DESC
+        db.Index('ix_message_request_created', 'service_request_id', 'created_at', 'id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     service_request_id = db.Column(db.Integer, db.ForeignKey('service_request.id'), nullable=False)
     sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -14,16 +24,3 @@ class Message(db.Model):
     # Relacionamentos
     sender = db.relationship('User', foreign_keys=[sender_id], backref='sent_messages')
     receiver = db.relationship('User', foreign_keys=[receiver_id], backref='received_messages')
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'service_request_id': self.service_request_id,
-            'sender_id': self.sender_id,
-            'receiver_id': self.receiver_id,
-            'content': self.content,
-            'message_type': self.message_type,
-            'is_read': self.is_read,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
-
@@ -1,7 +1,19 @@
 from src.models.user import db
 from datetime import datetime
+from src.utils.serialization import serializable
 
+@serializable(
+    'id', 'service_request_id', 'provider_id', 'price', 'estimated_duration', 'description',
+    'materials_included', 'availability', 'status', 'created_at', 'updated_at'
+)
 class Proposal(db.Model):
+    __table_args__ = (
+        db.Index('ix_proposal_request_status', 'service_request_id', 'status'),
+        # Propostas do prestador paginadas por (created_at, id)
+        db.Index('ix_proposal_provider_created', 'provider_id', 'created_at', 'id'),
+        db.Index('ix_proposal_request_provider', 'service_request_id', 'provider_id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     service_request_id = db.Column(db.Integer, db.ForeignKey('service_request.id'), nullable=False)
     provider_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -13,19 +25,3 @@ class Proposal(db.Model):
     status = db.Column(db.String(20), default='pending')  # 'pending', 'accepted', 'rejected', 'cancelled'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'service_request_id': self.service_request_id,
-            'provider_id': self.provider_id,
-            'price': self.price,
-            'estimated_duration': self.estimated_duration,
-            'description': self.description,
-            'materials_included': self.materials_included,
-            'availability': self.availability,
-            'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
-
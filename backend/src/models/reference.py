@@ -0,0 +1,6 @@
+from src.models.user import db
+
+class ReferenceVersion(db.Model):
+    """Contador de versão de dados de referência (ex.: categorias), compartilhado entre workers"""
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
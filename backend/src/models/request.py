@@ -1,7 +1,27 @@
 from src.models.user import db
 from datetime import datetime
+from src.utils.geo import geo_cell
+from src.utils.serialization import serializable
 
+# Prioridade numérica da urgência, usada na ordenação do feed dos prestadores
+URGENCY_RANKS = {'low': 0, 'normal': 1, 'high': 2, 'urgent': 3}
+
+@serializable(
+    'id', 'client_id', 'category_id', 'title', 'description', 'address', 'city', 'state',
+    'zip_code', 'latitude', 'longitude', 'urgency', 'budget_min', 'budget_max',
+    'preferred_date', 'status', 'images', 'created_at', 'updated_at'
+)
 class ServiceRequest(db.Model):
+    __table_args__ = (
+        db.Index('ix_service_request_status_created', 'status', 'created_at'),
+        # Pedidos do cliente paginados por (created_at, id)
+        db.Index('ix_service_request_client_created', 'client_id', 'created_at', 'id'),
+        # Feed dos prestadores: pedidos abertos por categoria, mais urgentes e recentes primeiro
+        db.Index('ix_service_request_feed', 'status', 'category_id', 'urgency_rank', 'created_at', 'id'),
+        # Feed dos prestadores: pedidos abertos por célula da grade espacial
+        db.Index('ix_service_request_geo', 'status', 'geo_cell'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     client_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('service_category.id'), nullable=False)
@@ -13,7 +33,9 @@ class ServiceRequest(db.Model):
     zip_code = db.Column(db.String(10), nullable=False)
     latitude = db.Column(db.Float, nullable=True)
     longitude = db.Column(db.Float, nullable=True)
+    geo_cell = db.Column(db.Integer, nullable=True)  # célula da grade espacial (ver src/utils/geo.py)
     urgency = db.Column(db.String(20), default='normal')  # 'low', 'normal', 'high', 'urgent'
+    urgency_rank = db.Column(db.SmallInteger, nullable=False, default=1, server_default='1')
     budget_min = db.Column(db.Float, nullable=True)
     budget_max = db.Column(db.Float, nullable=True)
     preferred_date = db.Column(db.DateTime, nullable=True)
@@ -24,28 +46,11 @@ class ServiceRequest(db.Model):
     
     # Relacionamentos
     proposals = db.relationship('Proposal', backref='service_request', lazy=True, cascade='all, delete-orphan')
-    messages = db.relationship('Message', backref='service_request', lazy=True, cascade='all, delete-orphan')
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'client_id': self.client_id,
-            'category_id': self.category_id,
-            'title': self.title,
-            'description': self.description,
-            'address': self.address,
-            'city': self.city,
-            'state': self.state,
-            'zip_code': self.zip_code,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'urgency': self.urgency,
-            'budget_min': self.budget_min,
-            'budget_max': self.budget_max,
-            'preferred_date': self.preferred_date.isoformat() if self.preferred_date else None,
-            'status': self.status,
-            'images': self.images,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    # lazy='dynamic': a conversa nunca é carregada inteira, só por consultas paginadas
+    messages = db.relationship('Message', backref='service_request', lazy='dynamic', cascade='all, delete-orphan')
 
+@db.event.listens_for(ServiceRequest, 'before_insert')
+@db.event.listens_for(ServiceRequest, 'before_update')
+def update_request_derived_columns(mapper, connection, target):
+    target.geo_cell = geo_cell(target.latitude, target.longitude)
+    target.urgency_rank = URGENCY_RANKS.get(target.urgency or 'normal', URGENCY_RANKS['normal'])
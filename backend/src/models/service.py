@@ -1,6 +1,10 @@
 from src.models.user import db
 from datetime import datetime
+from src.utils.serialization import serializable
 
+@serializable(
+    'id', 'name', 'description', 'icon', 'is_active', 'created_at'
+)
 class ServiceCategory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
@@ -12,18 +16,18 @@ class ServiceCategory(db.Model):
     # Relacionamentos
     service_requests = db.relationship('ServiceRequest', backref='category', lazy=True)
     provider_services = db.relationship('ProviderService', backref='category', lazy=True)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'icon': self.icon,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
 
+@serializable(
+    'id', 'provider_id', 'category_id', 'description', 'base_price', 'is_active', 'created_at'
+)
 class ProviderService(db.Model):
+    __table_args__ = (
+        # Busca de prestadores por categoria
+        db.Index('ix_provider_service_category_active', 'category_id', 'is_active', 'provider_id'),
+        # Serviços do prestador (feed, listagem e verificação de duplicidade)
+        db.Index('ix_provider_service_provider_category', 'provider_id', 'category_id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     provider_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('service_category.id'), nullable=False)
@@ -31,15 +35,3 @@ class ProviderService(db.Model):
     base_price = db.Column(db.Float, nullable=True)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'provider_id': self.provider_id,
-            'category_id': self.category_id,
-            'description': self.description,
-            'base_price': self.base_price,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
-
@@ -1,10 +1,34 @@
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+from src.utils.geo import geo_cell
+from src.utils.passwords import hash_password, password_needs_rehash, verify_password
+from src.utils.replicas import RoutingSession
+from src.utils.serialization import serializable
 
-db = SQLAlchemy()
+# RoutingSession envia as leituras das rotas @replica_reads às réplicas, quando houver
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
+def _criterion_average(criterion):
+    total, count = f'{criterion}_sum', f'{criterion}_count'
+    return lambda user: User._average(getattr(user, total), getattr(user, count))
+
+@serializable(
+    'id', 'name', 'email', 'phone', 'user_type', 'address', 'city', 'state', 'zip_code',
+    'latitude', 'longitude', 'profile_picture', 'is_verified', 'is_active', 'bio',
+    'experience_years', 'service_radius', 'is_available', 'average_rating', 'total_services',
+    ('total_evaluations', 'rating_count'),
+    ('average_punctuality', _criterion_average('punctuality')),
+    ('average_quality', _criterion_average('quality')),
+    ('average_communication', _criterion_average('communication')),
+    'created_at', 'updated_at'
+)
 class User(db.Model):
+    __table_args__ = (
+        db.Index('ix_user_type_active_verified', 'user_type', 'is_active', 'is_verified'),
+        # GET /api/users paginado por (created_at, id)
+        db.Index('ix_user_created_at_id', 'created_at', 'id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -17,6 +41,7 @@ class User(db.Model):
     zip_code = db.Column(db.String(10), nullable=True)
     latitude = db.Column(db.Float, nullable=True)
     longitude = db.Column(db.Float, nullable=True)
+    geo_cell = db.Column(db.Integer, nullable=True, index=True)  # célula da grade espacial (ver src/utils/geo.py)
     profile_picture = db.Column(db.String(255), nullable=True)
     is_verified = db.Column(db.Boolean, default=False)
     is_active = db.Column(db.Boolean, default=True)
@@ -37,37 +62,34 @@ class User(db.Model):
     average_rating = db.Column(db.Float, default=0.0)
     total_services = db.Column(db.Integer, default=0)
     
+    # Agregados das avaliações recebidas, mantidos por incremento (ver src/utils/ratings.py)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    punctuality_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    punctuality_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    quality_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    quality_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    communication_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    communication_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    # Hash no pool de src/utils/passwords.py; podem levantar PasswordHasherBusy
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        return password_needs_rehash(self.password_hash)
+
+    @staticmethod
+    def _average(total, count):
+        return round(total / count, 2) if count else None
 
     def __repr__(self):
         return f'<User {self.name}>'
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'phone': self.phone,
-            'user_type': self.user_type,
-            'address': self.address,
-            'city': self.city,
-            'state': self.state,
-            'zip_code': self.zip_code,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'profile_picture': self.profile_picture,
-            'is_verified': self.is_verified,
-            'is_active': self.is_active,
-            'bio': self.bio,
-            'experience_years': self.experience_years,
-            'service_radius': self.service_radius,
-            'is_available': self.is_available,
-            'average_rating': self.average_rating,
-            'total_services': self.total_services,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+@db.event.listens_for(User, 'before_insert')
+@db.event.listens_for(User, 'before_update')
+def update_user_geo_cell(mapper, connection, target):
+    target.geo_cell = geo_cell(target.latitude, target.longitude)
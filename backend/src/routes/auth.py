@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, current_user, jwt_required, get_jwt_identity
 from src.models.user import User, db
+from src.utils.geo import is_valid_coordinate
+from src.utils.passwords import PasswordHasherBusy, verify_dummy_password
+from src.utils.search import sync_provider_search
 import re
 
 auth_bp = Blueprint('auth', __name__)
@@ -9,11 +12,32 @@ def validate_email(email):
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
+def parse_coordinates(latitude, longitude):
+    """
+    Converte o par latitude/longitude do JSON para float. Retorna (None, None)
+    se os dois estiverem ausentes e None se o par for inválido.
+    """
+    if latitude is None and longitude is None:
+        return None, None
+    if isinstance(latitude, bool) or isinstance(longitude, bool):
+        return None
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if not is_valid_coordinate(latitude, longitude):
+        return None
+    return latitude, longitude
+
+def hashing_busy_response():
+    # Pool de hash de senhas saturado: o cliente tenta de novo em instantes
+    return jsonify({'error': 'Servidor ocupado, tente novamente em instantes'}), 503, {'Retry-After': '2'}
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     try:
         data = request.get_json()
-        current_app.logger.info(f'Tentativa de registro para email: {data.get("email", "N/A")}')
+        current_app.logger.info('Tentativa de registro para email: %s', data.get('email', 'N/A'))
         
         # Validações básicas
         required_fields = ['name', 'email', 'password', 'user_type']
@@ -30,9 +54,14 @@ def register():
         if len(data['password']) < 6:
             return jsonify({'error': 'Senha deve ter pelo menos 6 caracteres'}), 400
         
+        coordinates = parse_coordinates(data.get('latitude'), data.get('longitude'))
+        if coordinates is None:
+            return jsonify({'error': 'Coordenadas inválidas'}), 400
+        latitude, longitude = coordinates
+        
         # Verificar se o e-mail já existe
         if User.query.filter_by(email=data['email']).first():
-            current_app.logger.warning(f'Tentativa de registro com email já existente: {data["email"]}')
+            current_app.logger.warning('Tentativa de registro com email já existente: %s', data['email'])
             return jsonify({'error': 'E-mail já cadastrado'}), 400
         
         # Criar novo usuário
@@ -45,6 +74,8 @@ def register():
             city=data.get('city'),
             state=data.get('state'),
             zip_code=data.get('zip_code'),
+            latitude=latitude,
+            longitude=longitude,
             bio=data.get('bio'),
             experience_years=data.get('experience_years'),
             service_radius=data.get('service_radius')
@@ -52,9 +83,11 @@ def register():
         user.set_password(data['password'])
         
         db.session.add(user)
+        db.session.flush()
+        sync_provider_search(user.id)
         db.session.commit()
         
-        current_app.logger.info(f'Usuário registrado com sucesso: {user.email} (ID: {user.id})')
+        current_app.logger.info('Usuário registrado com sucesso: %s (ID: %s)', user.email, user.id)
         
         # Criar token de acesso
         access_token = create_access_token(identity=str(user.id))
@@ -65,16 +98,20 @@ def register():
             'user': user.to_dict()
         }), 201
         
+    except PasswordHasherBusy:
+        db.session.rollback()
+        current_app.logger.warning('Registro recusado: pool de hash de senhas ocupado')
+        return hashing_busy_response()
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f'Erro no registro: {str(e)}')
+        current_app.logger.error('Erro no registro: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     try:
         data = request.get_json()
-        current_app.logger.info(f'Tentativa de login para email: {data.get("email", "N/A")}')
+        current_app.logger.debug('Tentativa de login para email: %s', data.get('email', 'N/A'))
         
         if not data.get('email') or not data.get('password'):
             return jsonify({'error': 'E-mail e senha são obrigatórios'}), 400
@@ -83,25 +120,36 @@ def login():
         
         # Log detalhado para debug
         if not user:
-            current_app.logger.warning(f'Usuário não encontrado para email: {data.get("email", "N/A")}')
+            # Verificação com um hash fictício: a resposta leva o mesmo tempo de uma senha errada
+            verify_dummy_password(data['password'])
+            current_app.logger.warning('Usuário não encontrado para email: %s', data.get('email', 'N/A'))
             return jsonify({'error': 'E-mail ou senha incorretos'}), 401
         
-        current_app.logger.info(f'Usuário encontrado: ID={user.id}, Email={user.email}, Ativo={user.is_active}')
+        current_app.logger.debug('Usuário encontrado: ID=%s, Email=%s, Ativo=%s', user.id, user.email, user.is_active)
         
         password_check = user.check_password(data['password'])
-        current_app.logger.info(f'Verificação de senha para {user.email}: {password_check}')
+        current_app.logger.debug('Verificação de senha para %s: %s', user.email, password_check)
         
         if not password_check:
-            current_app.logger.warning(f'Senha incorreta para email: {data.get("email", "N/A")}')
+            current_app.logger.warning('Senha incorreta para email: %s', data.get('email', 'N/A'))
             return jsonify({'error': 'E-mail ou senha incorretos'}), 401
         
         if not user.is_active:
-            current_app.logger.warning(f'Tentativa de login com conta desativada: {user.email}')
+            current_app.logger.warning('Tentativa de login com conta desativada: %s', user.email)
             return jsonify({'error': 'Conta desativada'}), 401
         
+        # Hash com método ou parâmetros antigos: refeito agora que a senha foi conferida
+        if user.password_needs_rehash():
+            try:
+                user.set_password(data['password'])
+                db.session.commit()
+                current_app.logger.info('Hash de senha atualizado para o usuário %s', user.id)
+            except PasswordHasherBusy:
+                db.session.rollback()
+        
         access_token = create_access_token(identity=str(user.id))
         
-        current_app.logger.info(f'Login bem-sucedido para usuário: {user.email} (ID: {user.id})')
+        current_app.logger.info('Login bem-sucedido para usuário: %s (ID: %s)', user.email, user.id)
         
         return jsonify({
             'message': 'Login realizado com sucesso',
@@ -109,21 +157,19 @@ def login():
             'user': user.to_dict()
         }), 200
         
+    except PasswordHasherBusy:
+        current_app.logger.warning('Login recusado: pool de hash de senhas ocupado')
+        return hashing_busy_response()
     except Exception as e:
-        current_app.logger.error(f'Erro no login: {str(e)}')
+        current_app.logger.error('Erro no login: %s', e)
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
     try:
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'error': 'Usuário não encontrado'}), 404
-        
-        return jsonify({'user': user.to_dict()}), 200
+        # Perfil já serializado no cache do usuário autenticado (src/utils/identity.py)
+        return jsonify({'user': current_user.to_dict()}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -143,13 +189,24 @@ def update_profile():
         # Campos que podem ser atualizados
         updatable_fields = [
             'name', 'phone', 'address', 'city', 'state', 'zip_code',
-            'bio', 'experience_years', 'service_radius', 'is_available'
+            'latitude', 'longitude', 'bio', 'experience_years', 'service_radius', 'is_available'
         ]
         
+        # Coordenada ausente no corpo mantém o valor atual; o par resultante é validado
+        if 'latitude' in data or 'longitude' in data:
+            coordinates = parse_coordinates(
+                data.get('latitude', user.latitude),
+                data.get('longitude', user.longitude)
+            )
+            if coordinates is None:
+                return jsonify({'error': 'Coordenadas inválidas'}), 400
+            data['latitude'], data['longitude'] = coordinates
+        
         for field in updatable_fields:
             if field in data:
                 setattr(user, field, data[field])
         
+        sync_provider_search(user.id)
         db.session.commit()
         
         return jsonify({
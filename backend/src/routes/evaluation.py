@@ -4,10 +4,21 @@ from src.models.user import db, User
 from src.models.request import ServiceRequest
 from src.models.proposal import Proposal
 from src.models.evaluation import Evaluation
-from sqlalchemy import func
+from src.utils.pagination import InvalidCursor, get_page_args, paginate
+from src.utils.ratings import CRITERIA, apply_evaluation
+from src.utils.realtime import emit_event
+from src.utils.replicas import replica_reads
+from sqlalchemy.orm import joinedload
 
 evaluation_bp = Blueprint('evaluation', __name__)
 
+def _load_evaluator():
+    # Avaliador no mesmo SELECT (JOIN), só com as colunas exibidas
+    return joinedload(Evaluation.evaluator).load_only(User.id, User.name, User.user_type)
+
+def _load_evaluated():
+    return joinedload(Evaluation.evaluated).load_only(User.id, User.name, User.user_type)
+
 @evaluation_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_evaluation():
@@ -25,6 +36,11 @@ def create_evaluation():
         if not isinstance(data['rating'], int) or data['rating'] < 1 or data['rating'] > 5:
             return jsonify({'error': 'Rating deve ser um número entre 1 e 5'}), 400
         
+        for criterion in CRITERIA:
+            score = data.get(criterion)
+            if score is not None and (not isinstance(score, int) or score < 1 or score > 5):
+                return jsonify({'error': f'Campo {criterion} deve ser um número entre 1 e 5'}), 400
+        
         # Verificar se o pedido existe
         service_request = ServiceRequest.query.get(data['service_request_id'])
         if not service_request:
@@ -92,23 +108,19 @@ def create_evaluation():
         
         db.session.add(evaluation)
         
-        # Atualizar média de avaliações do usuário avaliado
-        avg_rating = db.session.query(func.avg(Evaluation.rating)).filter_by(
-            evaluated_id=data['evaluated_id']
-        ).scalar()
-        
-        total_evaluations = Evaluation.query.filter_by(
-            evaluated_id=data['evaluated_id']
-        ).count() + 1
-        
-        evaluated_user.average_rating = round(avg_rating, 2) if avg_rating else data['rating']
-        
-        # Se é prestador sendo avaliado, atualizar total de serviços
-        if evaluated_user.user_type == 'provider':
-            evaluated_user.total_services = total_evaluations
+        # Atualizar agregados de avaliação do usuário avaliado (incremento atômico)
+        apply_evaluation(evaluated_user, evaluation)
         
         db.session.commit()
         
+        emit_event('evaluation:created', {
+            'id': evaluation.id,
+            'request_id': evaluation.service_request_id,
+            'evaluator_id': evaluation.evaluator_id,
+            'evaluated_id': evaluation.evaluated_id,
+            'rating': evaluation.rating
+        }, user_ids=[evaluation.evaluator_id, evaluation.evaluated_id])
+        
         return jsonify({
             'message': 'Avaliação criada com sucesso',
             'evaluation': evaluation.to_dict()
@@ -119,6 +131,7 @@ def create_evaluation():
         return jsonify({'error': str(e)}), 500
 
 @evaluation_bp.route('/user/<int:user_id>', methods=['GET'])
+@replica_reads
 def get_user_evaluations(user_id):
     try:
         # Verificar se o usuário existe
@@ -126,12 +139,18 @@ def get_user_evaluations(user_id):
         if not user:
             return jsonify({'error': 'Usuário não encontrado'}), 404
         
-        evaluations = Evaluation.query.filter_by(evaluated_id=user_id).order_by(Evaluation.created_at.desc()).all()
+        limit, cursor = get_page_args()
+        evaluations, next_cursor = paginate(
+            Evaluation.query.options(_load_evaluator()).filter_by(evaluated_id=user_id),
+            [Evaluation.created_at, Evaluation.id],
+            limit,
+            cursor
+        )
         
         # Incluir informações do avaliador
         evaluations_data = []
         for evaluation in evaluations:
-            evaluator = User.query.get(evaluation.evaluator_id)
+            evaluator = evaluation.evaluator
             evaluation_data = evaluation.to_dict()
             evaluation_data['evaluator'] = {
                 'id': evaluator.id,
@@ -142,15 +161,19 @@ def get_user_evaluations(user_id):
         
         return jsonify({
             'evaluations': evaluations_data,
+            'next_cursor': next_cursor,
             'average_rating': user.average_rating,
-            'total_evaluations': len(evaluations)
+            'total_evaluations': user.rating_count
         }), 200
         
+    except InvalidCursor:
+        return jsonify({'error': 'Cursor inválido'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @evaluation_bp.route('/request/<int:request_id>', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_request_evaluations(request_id):
     try:
         user_id = int(get_jwt_identity())
@@ -176,12 +199,15 @@ def get_request_evaluations(request_id):
         if not is_client and not is_provider:
             return jsonify({'error': 'Não autorizado'}), 403
         
-        evaluations = Evaluation.query.filter_by(service_request_id=request_id).all()
+        evaluations = Evaluation.query.options(
+            _load_evaluator(),
+            _load_evaluated()
+        ).filter_by(service_request_id=request_id).all()
         
         evaluations_data = []
         for evaluation in evaluations:
-            evaluator = User.query.get(evaluation.evaluator_id)
-            evaluated = User.query.get(evaluation.evaluated_id)
+            evaluator = evaluation.evaluator
+            evaluated = evaluation.evaluated
             
             evaluation_data = evaluation.to_dict()
             evaluation_data['evaluator'] = {
@@ -203,19 +229,32 @@ def get_request_evaluations(request_id):
 
 @evaluation_bp.route('/my-evaluations', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_my_evaluations():
     try:
         user_id = int(get_jwt_identity())
         
         # Avaliações recebidas
-        received = Evaluation.query.filter_by(evaluated_id=user_id).order_by(Evaluation.created_at.desc()).all()
+        limit, cursor = get_page_args('received_')
+        received, received_next_cursor = paginate(
+            Evaluation.query.options(_load_evaluator()).filter_by(evaluated_id=user_id),
+            [Evaluation.created_at, Evaluation.id],
+            limit,
+            cursor
+        )
         
         # Avaliações dadas
-        given = Evaluation.query.filter_by(evaluator_id=user_id).order_by(Evaluation.created_at.desc()).all()
+        limit, cursor = get_page_args('given_')
+        given, given_next_cursor = paginate(
+            Evaluation.query.options(_load_evaluated()).filter_by(evaluator_id=user_id),
+            [Evaluation.created_at, Evaluation.id],
+            limit,
+            cursor
+        )
         
         received_data = []
         for evaluation in received:
-            evaluator = User.query.get(evaluation.evaluator_id)
+            evaluator = evaluation.evaluator
             evaluation_data = evaluation.to_dict()
             evaluation_data['evaluator'] = {
                 'id': evaluator.id,
@@ -226,7 +265,7 @@ def get_my_evaluations():
         
         given_data = []
         for evaluation in given:
-            evaluated = User.query.get(evaluation.evaluated_id)
+            evaluated = evaluation.evaluated
             evaluation_data = evaluation.to_dict()
             evaluation_data['evaluated'] = {
                 'id': evaluated.id,
@@ -237,9 +276,13 @@ def get_my_evaluations():
         
         return jsonify({
             'received': received_data,
-            'given': given_data
+            'received_next_cursor': received_next_cursor,
+            'given': given_data,
+            'given_next_cursor': given_next_cursor
         }), 200
         
+    except InvalidCursor:
+        return jsonify({'error': 'Cursor inválido'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,16 @@
+from flask import Blueprint, jsonify
+from sqlalchemy import text
+from src.models.user import db
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/health', methods=['GET'])
+def health():
+    """
+    Health check do Railway: responde sem tocar no disco e confere a conexão com o banco
+    """
+    try:
+        db.session.execute(text('SELECT 1'))
+        return jsonify({'status': 'ok'}), 200
+    except Exception as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 503
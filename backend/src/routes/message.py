@@ -0,0 +1,168 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.models.user import db
+from src.models.request import ServiceRequest
+from src.models.proposal import Proposal
+from src.models.message import Message
+from src.utils.pagination import InvalidCursor, get_page_args, paginate
+from src.utils.realtime import emit_event
+from sqlalchemy import or_, update
+
+message_bp = Blueprint('message', __name__)
+
+MESSAGE_TYPES = ['text', 'image', 'file']
+MAX_MESSAGE_LENGTH = 5000
+
+def _provider_ids(request_id):
+    # Prestadores que enviaram proposta para o pedido participam da conversa
+    return {
+        row[0] for row in db.session.query(Proposal.provider_id).filter(
+            Proposal.service_request_id == request_id,
+            Proposal.status != 'cancelled'
+        )
+    }
+
+@message_bp.route('/<int:request_id>/messages', methods=['GET'])
+@jwt_required()
+def get_messages(request_id):
+    try:
+        user_id = int(get_jwt_identity())
+        
+        service_request = db.session.get(ServiceRequest, request_id)
+        if not service_request:
+            return jsonify({'error': 'Pedido não encontrado'}), 404
+        
+        query = Message.query.filter_by(service_request_id=request_id)
+        
+        if service_request.client_id == user_id:
+            # Cliente pode filtrar a conversa com um prestador específico
+            with_user = request.args.get('with', type=int)
+            if with_user:
+                query = query.filter(or_(Message.sender_id == with_user, Message.receiver_id == with_user))
+        elif user_id in _provider_ids(request_id):
+            # Prestador vê apenas a própria conversa com o cliente
+            query = query.filter(or_(Message.sender_id == user_id, Message.receiver_id == user_id))
+        else:
+            return jsonify({'error': 'Não autorizado'}), 403
+        
+        # Página mais recente primeiro; next_cursor busca mensagens mais antigas
+        limit, cursor = get_page_args()
+        messages, next_cursor = paginate(query, [Message.created_at, Message.id], limit, cursor)
+        
+        return jsonify({
+            'messages': [message.to_dict() for message in messages],
+            'next_cursor': next_cursor
+        }), 200
+    
+    except InvalidCursor:
+        return jsonify({'error': 'Cursor inválido'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@message_bp.route('/<int:request_id>/messages', methods=['POST'])
+@jwt_required()
+def send_message(request_id):
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json()
+        
+        content = (data.get('content') or '').strip()
+        if not content:
+            return jsonify({'error': 'Campo content é obrigatório'}), 400
+        
+        if len(content) > MAX_MESSAGE_LENGTH:
+            return jsonify({'error': f'Mensagem deve ter no máximo {MAX_MESSAGE_LENGTH} caracteres'}), 400
+        
+        message_type = data.get('message_type', 'text')
+        if message_type not in MESSAGE_TYPES:
+            return jsonify({'error': 'Tipo de mensagem inválido'}), 400
+        
+        service_request = db.session.get(ServiceRequest, request_id)
+        if not service_request:
+            return jsonify({'error': 'Pedido não encontrado'}), 404
+        
+        provider_ids = _provider_ids(request_id)
+        
+        if service_request.client_id == user_id:
+            # Cliente escolhe o prestador; sem receiver_id, vai para o prestador da proposta aceita
+            receiver_id = data.get('receiver_id')
+            if not receiver_id:
+                accepted = Proposal.query.filter_by(
+                    service_request_id=request_id,
+                    status='accepted'
+                ).first()
+                receiver_id = accepted.provider_id if accepted else None
+            
+            if receiver_id not in provider_ids:
+                return jsonify({'error': 'Destinatário deve ser um prestador com proposta neste pedido'}), 400
+        elif user_id in provider_ids:
+            receiver_id = service_request.client_id
+        else:
+            return jsonify({'error': 'Não autorizado'}), 403
+        
+        message = Message(
+            service_request_id=request_id,
+            sender_id=user_id,
+            receiver_id=receiver_id,
+            content=content,
+            message_type=message_type
+        )
+        
+        db.session.add(message)
+        db.session.commit()
+        
+        message_data = message.to_dict()
+        emit_event('message:created', message_data, user_ids=[user_id, receiver_id])
+        
+        return jsonify({
+            'message': 'Mensagem enviada com sucesso',
+            'data': message_data
+        }), 201
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@message_bp.route('/<int:request_id>/messages/read', methods=['POST'])
+@jwt_required()
+def mark_messages_read(request_id):
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json(silent=True) or {}
+        
+        # Confirma a leitura de todas as mensagens recebidas até up_to_id (ou todas)
+        statement = update(Message).where(
+            Message.service_request_id == request_id,
+            Message.receiver_id == user_id,
+            Message.is_read == False
+        )
+        
+        up_to_id = data.get('up_to_id')
+        if up_to_id is not None:
+            if not isinstance(up_to_id, int):
+                return jsonify({'error': 'up_to_id inválido'}), 400
+            statement = statement.where(Message.id <= up_to_id)
+        
+        statement = statement.values(is_read=True)
+        options = {'synchronize_session': False}
+        if db.session.connection().dialect.update_returning:
+            # Remetentes das mensagens confirmadas: os outros participantes da conversa
+            senders = db.session.execute(statement.returning(Message.sender_id), execution_options=options).scalars().all()
+            updated = len(senders)
+        else:
+            senders = [row.sender_id for row in db.session.query(Message.sender_id).filter(statement.whereclause).distinct()]
+            updated = db.session.execute(statement, execution_options=options).rowcount
+        db.session.commit()
+        
+        if updated:
+            emit_event('message:read', {
+                'request_id': request_id,
+                'reader_id': user_id,
+                'up_to_id': up_to_id
+            }, user_ids=[user_id, *set(senders)])
+        
+        return jsonify({'updated': updated}), 200
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
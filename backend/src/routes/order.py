@@ -1,12 +1,60 @@
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import current_user, jwt_required, get_jwt_identity
 from src.models.user import db, User
-from src.models.request import ServiceRequest
-from src.models.service import ServiceCategory
+from src.models.request import ServiceRequest, URGENCY_RANKS
+from src.models.service import ServiceCategory, ProviderService
+from src.utils.geo import (
+    DEFAULT_SERVICE_RADIUS_KM, MAX_SEARCH_RADIUS_KM, bounding_box, cell_ranges,
+    distance_sq_expression, haversine_km, is_valid_coordinate
+)
+from src.utils.pagination import InvalidCursor, get_page_args, paginate
+from src.utils.realtime import emit_event, request_payload
+from src.utils.replicas import replica_reads
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 order_bp = Blueprint('order', __name__)
 
+def _provider_feed_query(provider):
+    """
+    Pedidos abertos nas categorias ativas do prestador e dentro do seu raio de
+    atendimento. Pedidos sem coordenadas entram quando são da mesma cidade.
+    """
+    query = ServiceRequest.query.filter(ServiceRequest.status == 'open')
+    
+    category_ids = [row[0] for row in db.session.query(ProviderService.category_id).filter_by(
+        provider_id=provider.id,
+        is_active=True
+    )]
+    # Prestador ainda sem serviços cadastrados vê todas as categorias
+    if category_ids:
+        query = query.filter(ServiceRequest.category_id.in_(category_ids))
+    
+    same_city = None
+    if provider.city:
+        same_city = and_(
+            ServiceRequest.geo_cell.is_(None),
+            func.lower(ServiceRequest.city) == provider.city.lower()
+        )
+    
+    if is_valid_coordinate(provider.latitude, provider.longitude):
+        lat, lng = provider.latitude, provider.longitude
+        radius_km = min(provider.service_radius or DEFAULT_SERVICE_RADIUS_KM, MAX_SEARCH_RADIUS_KM)
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+        
+        within_radius = and_(
+            or_(*[ServiceRequest.geo_cell.between(start, end) for start, end in cell_ranges(lat, lng, radius_km)]),
+            ServiceRequest.latitude.between(min_lat, max_lat),
+            ServiceRequest.longitude.between(min_lng, max_lng),
+            distance_sq_expression(ServiceRequest.latitude, ServiceRequest.longitude, lat, lng) <= radius_km * radius_km
+        )
+        query = query.filter(or_(within_radius, same_city) if same_city is not None else within_radius)
+    elif same_city is not None:
+        query = query.filter(func.lower(ServiceRequest.city) == provider.city.lower())
+    
+    return query
+
 @order_bp.route('', methods=['POST'])
 @order_bp.route('/', methods=['POST'])
 @jwt_required()
@@ -15,7 +63,7 @@ def create_order():
         user_id = int(get_jwt_identity())
         data = request.get_json()
         
-        current_app.logger.info(f'Usuário {user_id} iniciando criação de pedido')
+        current_app.logger.info('Usuário %s iniciando criação de pedido', user_id)
         
         # Validações básicas
         required_fields = ['category_id', 'title', 'description', 'address', 'city', 'state', 'zip_code']
@@ -26,15 +74,18 @@ def create_order():
         # Verificar se a categoria existe
         category = ServiceCategory.query.get(data['category_id'])
         if not category:
-            current_app.logger.warning(f'Tentativa de criar pedido com categoria inexistente: {data["category_id"]} por usuário {user_id}')
+            current_app.logger.warning('Tentativa de criar pedido com categoria inexistente: %s por usuário %s', data['category_id'], user_id)
             return jsonify({'error': 'Categoria não encontrada'}), 404
         
         # Verificar se o usuário é um cliente
-        user = User.query.get(user_id)
-        if not user or user.user_type != 'client':
-            current_app.logger.warning(f'Usuário não-cliente {user_id} tentou criar pedido')
+        user = current_user
+        if user.user_type != 'client':
+            current_app.logger.warning('Usuário não-cliente %s tentou criar pedido', user_id)
             return jsonify({'error': 'Apenas clientes podem criar pedidos'}), 403
         
+        if data.get('urgency', 'normal') not in URGENCY_RANKS:
+            return jsonify({'error': 'Urgência inválida'}), 400
+        
         # Converter data preferida se fornecida
         preferred_date = None
         if data.get('preferred_date'):
@@ -64,7 +115,7 @@ def create_order():
         db.session.add(service_request)
         db.session.commit()
         
-        current_app.logger.info(f'Pedido criado com sucesso: ID {service_request.id} por usuário {user_id} - {service_request.title}')
+        current_app.logger.info('Pedido criado com sucesso: ID %s por usuário %s - %s', service_request.id, user_id, service_request.title)
         
         return jsonify({
             'message': 'Pedido criado com sucesso',
@@ -73,44 +124,75 @@ def create_order():
         
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f'Erro na criação de pedido por usuário {user_id if "user_id" in locals() else "N/A"}: {str(e)}')
+        current_app.logger.error('Erro na criação de pedido por usuário %s: %s', user_id if 'user_id' in locals() else 'N/A', e)
         return jsonify({'error': str(e)}), 500
 
 @order_bp.route('', methods=['GET'])
 @order_bp.route('/', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_requests():
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = current_user
+        limit, cursor = get_page_args()
         
         if user.user_type == 'client':
             # Cliente vê seus próprios pedidos
-            requests = ServiceRequest.query.filter_by(client_id=user_id).order_by(ServiceRequest.created_at.desc()).all()
+            requests, next_cursor = paginate(
+                ServiceRequest.query.filter_by(client_id=user_id),
+                [ServiceRequest.created_at, ServiceRequest.id],
+                limit,
+                cursor
+            )
+            requests_data = [req.to_dict() for req in requests]
         else:
-            # Prestador vê pedidos disponíveis na sua área/categoria
-            # Por simplicidade, mostrar todos os pedidos abertos
-            requests = ServiceRequest.query.filter_by(status='open').order_by(ServiceRequest.created_at.desc()).limit(50).all()
+            # Prestador vê pedidos abertos da sua área e categorias, mais urgentes primeiro
+            requests, next_cursor = paginate(
+                _provider_feed_query(user),
+                [ServiceRequest.urgency_rank, ServiceRequest.created_at, ServiceRequest.id],
+                limit,
+                cursor
+            )
+            
+            requests_data = []
+            for req in requests:
+                request_data = req.to_dict()
+                if is_valid_coordinate(user.latitude, user.longitude) and req.geo_cell is not None:
+                    request_data['distance_km'] = round(
+                        haversine_km(user.latitude, user.longitude, req.latitude, req.longitude), 2
+                    )
+                requests_data.append(request_data)
         
         return jsonify({
-            'requests': [req.to_dict() for req in requests]
+            'requests': requests_data,
+            'next_cursor': next_cursor
         }), 200
         
+    except InvalidCursor:
+        return jsonify({'error': 'Cursor inválido'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @order_bp.route('/<int:request_id>', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_request_detail(request_id):
     try:
-        service_request = ServiceRequest.query.get(request_id)
+        # Cliente e categoria carregados no mesmo SELECT
+        service_request = ServiceRequest.query.options(
+            joinedload(ServiceRequest.client).load_only(
+                User.id, User.name, User.average_rating, User.total_services
+            ),
+            joinedload(ServiceRequest.category)
+        ).filter_by(id=request_id).first()
         
         if not service_request:
             return jsonify({'error': 'Pedido não encontrado'}), 404
         
         # Incluir informações do cliente
-        client = User.query.get(service_request.client_id)
-        category = ServiceCategory.query.get(service_request.category_id)
+        client = service_request.client
+        category = service_request.category
         
         request_data = service_request.to_dict()
         request_data['client'] = {
@@ -160,6 +242,8 @@ def update_request(request_id):
         
         db.session.commit()
         
+        emit_event('request:updated', request_payload(service_request), request_id=service_request.id)
+        
         return jsonify({
             'message': 'Pedido atualizado com sucesso',
             'request': service_request.to_dict()
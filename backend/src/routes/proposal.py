@@ -1,8 +1,14 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import current_user, jwt_required, get_jwt_identity
 from src.models.user import db, User
 from src.models.request import ServiceRequest
 from src.models.proposal import Proposal
+from src.utils.locking import lock_for_update
+from src.utils.pagination import InvalidCursor, get_page_args, paginate
+from src.utils.realtime import emit_event, proposal_payload, request_payload
+from src.utils.replicas import replica_reads
+from sqlalchemy import and_, update
+from sqlalchemy.orm import joinedload
 
 proposal_bp = Blueprint('proposal', __name__)
 
@@ -29,8 +35,7 @@ def create_proposal():
             return jsonify({'error': 'Pedido não está mais disponível'}), 400
         
         # Verificar se o usuário é um prestador
-        user = User.query.get(user_id)
-        if user.user_type != 'provider':
+        if current_user.user_type != 'provider':
             return jsonify({'error': 'Apenas prestadores podem enviar propostas'}), 403
         
         # Verificar se o prestador não é o mesmo cliente do pedido
@@ -59,6 +64,9 @@ def create_proposal():
         db.session.add(proposal)
         db.session.commit()
         
+        emit_event('proposal:created', proposal_payload(proposal),
+                   user_ids=[service_request.client_id, proposal.provider_id])
+        
         return jsonify({
             'message': 'Proposta enviada com sucesso',
             'proposal': proposal.to_dict()
@@ -70,6 +78,7 @@ def create_proposal():
 
 @proposal_bp.route('/request/<int:request_id>', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_proposals_by_request(request_id):
     try:
         user_id = int(get_jwt_identity())
@@ -83,12 +92,18 @@ def get_proposals_by_request(request_id):
         if service_request.client_id != user_id:
             return jsonify({'error': 'Não autorizado'}), 403
         
-        proposals = Proposal.query.filter_by(service_request_id=request_id).all()
+        # Prestadores carregados no mesmo SELECT (JOIN), só com as colunas usadas
+        proposals = Proposal.query.options(
+            joinedload(Proposal.provider).load_only(
+                User.id, User.name, User.average_rating, User.total_services,
+                User.profile_picture, User.bio, User.experience_years
+            )
+        ).filter_by(service_request_id=request_id).all()
         
         # Incluir informações do prestador em cada proposta
         proposals_data = []
         for proposal in proposals:
-            provider = User.query.get(proposal.provider_id)
+            provider = proposal.provider
             proposal_data = proposal.to_dict()
             proposal_data['provider'] = {
                 'id': provider.id,
@@ -106,6 +121,37 @@ def get_proposals_by_request(request_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _reject_other_proposals(proposal):
+    """
+    Rejeita com um único UPDATE as demais propostas pendentes do pedido e
+    retorna os payloads dos eventos de cada uma
+    """
+    condition = and_(
+        Proposal.service_request_id == proposal.service_request_id,
+        Proposal.id != proposal.id,
+        Proposal.status == 'pending'
+    )
+    statement = update(Proposal).where(condition).values(status='rejected')
+    
+    if db.session.connection().dialect.update_returning:
+        rows = db.session.execute(
+            statement.returning(Proposal.id, Proposal.provider_id, Proposal.price),
+            execution_options={'synchronize_session': False}
+        ).all()
+    else:
+        # SQLite anterior à 3.35 (sem RETURNING): as linhas não mudam entre as duas
+        # consultas porque a transação já tem o pedido bloqueado
+        rows = db.session.query(Proposal.id, Proposal.provider_id, Proposal.price).filter(condition).all()
+        db.session.execute(statement, execution_options={'synchronize_session': False})
+    
+    return [{
+        'id': row.id,
+        'request_id': proposal.service_request_id,
+        'provider_id': row.provider_id,
+        'price': row.price,
+        'status': 'rejected'
+    } for row in rows]
+
 @proposal_bp.route('/<int:proposal_id>/accept', methods=['POST'])
 @jwt_required()
 def accept_proposal(proposal_id):
@@ -116,32 +162,50 @@ def accept_proposal(proposal_id):
         if not proposal:
             return jsonify({'error': 'Proposta não encontrada'}), 404
         
+        # Pedido bloqueado até o commit: aceites simultâneos no mesmo pedido são
+        # feitos um de cada vez, e o seguinte já encontra o pedido em andamento
+        service_request = lock_for_update(ServiceRequest, proposal.service_request_id)
+        
         # Verificar se o usuário é o dono do pedido
-        service_request = ServiceRequest.query.get(proposal.service_request_id)
         if service_request.client_id != user_id:
+            db.session.rollback()
             return jsonify({'error': 'Não autorizado'}), 403
         
-        # Verificar se a proposta ainda está pendente
-        if proposal.status != 'pending':
+        # Aceitar a proposta se ela ainda estiver pendente
+        accepted = db.session.execute(
+            update(Proposal).where(
+                Proposal.id == proposal_id,
+                Proposal.status == 'pending'
+            ).values(status='accepted'),
+            execution_options={'synchronize_session': False}
+        )
+        if accepted.rowcount != 1:
+            db.session.rollback()
             return jsonify({'error': 'Proposta não está mais disponível'}), 400
         
-        # Aceitar a proposta
-        proposal.status = 'accepted'
-        
-        # Atualizar status do pedido
-        service_request.status = 'in_progress'
+        # Atualizar status do pedido se ele ainda estiver aberto
+        started = db.session.execute(
+            update(ServiceRequest).where(
+                ServiceRequest.id == service_request.id,
+                ServiceRequest.status == 'open'
+            ).values(status='in_progress'),
+            execution_options={'synchronize_session': False}
+        )
+        if started.rowcount != 1:
+            db.session.rollback()
+            return jsonify({'error': 'Pedido não está mais disponível'}), 400
         
         # Rejeitar todas as outras propostas
-        other_proposals = Proposal.query.filter_by(
-            service_request_id=proposal.service_request_id
-        ).filter(Proposal.id != proposal_id).all()
-        
-        for other_proposal in other_proposals:
-            if other_proposal.status == 'pending':
-                other_proposal.status = 'rejected'
+        rejected_payloads = _reject_other_proposals(proposal)
         
         db.session.commit()
         
+        emit_event('proposal:accepted', proposal_payload(proposal),
+                   user_ids=[service_request.client_id, proposal.provider_id])
+        for payload in rejected_payloads:
+            emit_event('proposal:rejected', payload, user_ids=[payload['provider_id']])
+        emit_event('request:updated', request_payload(service_request), request_id=service_request.id)
+        
         return jsonify({
             'message': 'Proposta aceita com sucesso',
             'proposal': proposal.to_dict()
@@ -173,6 +237,9 @@ def reject_proposal(proposal_id):
         proposal.status = 'rejected'
         db.session.commit()
         
+        emit_event('proposal:rejected', proposal_payload(proposal),
+                   user_ids=[service_request.client_id, proposal.provider_id])
+        
         return jsonify({
             'message': 'Proposta rejeitada',
             'proposal': proposal.to_dict()
@@ -184,17 +251,34 @@ def reject_proposal(proposal_id):
 
 @proposal_bp.route('/my-proposals', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_my_proposals():
     try:
         user_id = int(get_jwt_identity())
         
-        proposals = Proposal.query.filter_by(provider_id=user_id).order_by(Proposal.created_at.desc()).all()
+        limit, cursor = get_page_args()
+        query = Proposal.query.options(
+            joinedload(Proposal.service_request).load_only(
+                ServiceRequest.id, ServiceRequest.client_id, ServiceRequest.title,
+                ServiceRequest.description, ServiceRequest.city, ServiceRequest.state,
+                ServiceRequest.status
+            ).joinedload(ServiceRequest.client).load_only(
+                User.id, User.name, User.average_rating
+            )
+        ).filter_by(provider_id=user_id)
+        
+        proposals, next_cursor = paginate(
+            query,
+            [Proposal.created_at, Proposal.id],
+            limit,
+            cursor
+        )
         
         # Incluir informações do pedido em cada proposta
         proposals_data = []
         for proposal in proposals:
-            service_request = ServiceRequest.query.get(proposal.service_request_id)
-            client = User.query.get(service_request.client_id)
+            service_request = proposal.service_request
+            client = service_request.client
             
             proposal_data = proposal.to_dict()
             proposal_data['service_request'] = {
@@ -212,8 +296,13 @@ def get_my_proposals():
             }
             proposals_data.append(proposal_data)
         
-        return jsonify({'proposals': proposals_data}), 200
+        return jsonify({
+            'proposals': proposals_data,
+            'next_cursor': next_cursor
+        }), 200
         
+    except InvalidCursor:
+        return jsonify({'error': 'Cursor inválido'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1,18 +1,37 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from src.models.user import db
 from src.models.service import ServiceCategory, ProviderService
+from src.utils.geo import (
+    DEFAULT_SEARCH_RADIUS_KM, MAX_SEARCH_RADIUS_KM, bounding_box, cell_ranges,
+    distance_sq_expression, haversine_km, is_valid_coordinate
+)
+from src.utils.reference_cache import ReferenceSnapshot, bump_version
+from src.utils.replicas import replica_reads
+from src.utils.search import provider_matches, sync_provider_search
 from sqlalchemy import or_
+import math
 
 service_bp = Blueprint('service', __name__)
 
+def _load_categories():
+    categories = ServiceCategory.query.filter_by(is_active=True).all()
+    return {
+        'categories': [category.to_dict() for category in categories]
+    }
+
+categories_snapshot = ReferenceSnapshot('categories', _load_categories)
+
 @service_bp.route('/categories', methods=['GET'])
+@replica_reads
 def get_categories():
     try:
-        categories = ServiceCategory.query.filter_by(is_active=True).all()
-        return jsonify({
-            'categories': [category.to_dict() for category in categories]
-        }), 200
+        body, etag = categories_snapshot.get()
+        
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -37,7 +56,9 @@ def create_category():
         )
         
         db.session.add(category)
+        bump_version('categories')
         db.session.commit()
+        categories_snapshot.invalidate()
         
         return jsonify({
             'message': 'Categoria criada com sucesso',
@@ -80,6 +101,7 @@ def add_provider_service():
         )
         
         db.session.add(provider_service)
+        sync_provider_search(user_id)
         db.session.commit()
         
         return jsonify({
@@ -93,6 +115,7 @@ def add_provider_service():
 
 @service_bp.route('/provider-services', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_provider_services():
     try:
         user_id = int(get_jwt_identity())
@@ -106,6 +129,7 @@ def get_provider_services():
         return jsonify({'error': str(e)}), 500
 
 @service_bp.route('/search', methods=['GET'])
+@replica_reads
 def search_providers():
     try:
         # Parâmetros de busca
@@ -114,11 +138,39 @@ def search_providers():
         state = request.args.get('state')
         keyword = request.args.get('keyword')
         min_rating = request.args.get('min_rating', type=float)
+        lat = request.args.get('lat', type=float)
+        lng = request.args.get('lng', type=float)
+        radius_km = request.args.get('radius_km', default=DEFAULT_SEARCH_RADIUS_KM, type=float)
         
         # Query base
         from src.models.user import User
         query = User.query.filter_by(user_type='provider', is_active=True, is_verified=True)
         
+        # Filtro geográfico: faixas de células da grade (índice em User.geo_cell),
+        # caixa delimitadora e distância dentro do raio buscado e do raio do prestador
+        distance_sq = None
+        if lat is not None or lng is not None:
+            if not is_valid_coordinate(lat, lng):
+                return jsonify({'error': 'Coordenadas inválidas'}), 400
+            
+            if not math.isfinite(radius_km) or radius_km <= 0:
+                return jsonify({'error': 'Raio de busca inválido'}), 400
+            radius_km = min(radius_km, MAX_SEARCH_RADIUS_KM)
+            
+            min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+            distance_sq = distance_sq_expression(User.latitude, User.longitude, lat, lng)
+            
+            query = query.filter(
+                or_(*[User.geo_cell.between(start, end) for start, end in cell_ranges(lat, lng, radius_km)]),
+                User.latitude.between(min_lat, max_lat),
+                User.longitude.between(min_lng, max_lng),
+                distance_sq <= radius_km * radius_km,
+                or_(
+                    User.service_radius.is_(None),
+                    distance_sq <= User.service_radius * User.service_radius
+                )
+            )
+        
         # Filtros
         if city:
             query = query.filter(User.city.ilike(f'%{city}%'))
@@ -129,7 +181,11 @@ def search_providers():
         if min_rating:
             query = query.filter(User.average_rating >= min_rating)
         
-        if keyword:
+        # Palavra-chave: índice de texto completo com ordenação por relevância
+        matches = provider_matches(keyword) if keyword else None
+        if matches is not None:
+            query = query.join(matches, matches.c.provider_id == User.id)
+        elif keyword:
             query = query.filter(or_(
                 User.name.ilike(f'%{keyword}%'),
                 User.bio.ilike(f'%{keyword}%')
@@ -143,12 +199,24 @@ def search_providers():
             ).subquery()
             query = query.filter(User.id.in_(provider_ids))
         
+        if matches is not None:
+            query = query.order_by(matches.c.rank)
+        
+        if distance_sq is not None:
+            query = query.order_by(distance_sq)
+        
         providers = query.limit(50).all()
         
+        providers_data = []
+        for provider in providers:
+            provider_data = provider.to_dict()
+            if distance_sq is not None:
+                provider_data['distance_km'] = round(haversine_km(lat, lng, provider.latitude, provider.longitude), 2)
+            providers_data.append(provider_data)
+        
         return jsonify({
-            'providers': [provider.to_dict() for provider in providers]
+            'providers': providers_data
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-
@@ -1,12 +1,22 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User, db
+from src.utils.pagination import InvalidCursor, get_page_args, paginate
+from src.utils.replicas import replica_reads
 
 user_bp = Blueprint('user', __name__)
 
 @user_bp.route('/users', methods=['GET'])
+@replica_reads
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    limit, cursor = get_page_args()
+    try:
+        users, next_cursor = paginate(User.query, [User.created_at, User.id], limit, cursor)
+    except InvalidCursor:
+        return jsonify({'error': 'Cursor inválido'}), 400
+    return jsonify({
+        'users': [user.to_dict() for user in users],
+        'next_cursor': next_cursor
+    })
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
@@ -18,6 +28,7 @@ def create_user():
     return jsonify(user.to_dict()), 201
 
 @user_bp.route('/users/<int:user_id>', methods=['GET'])
+@replica_reads
 def get_user(user_id):
     user = User.query.get_or_404(user_id)
     return jsonify(user.to_dict())
@@ -0,0 +1,153 @@
+import time
+import weakref
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+from src.utils.metrics import register_gauge_collector, registry
+
+# Perfis de pool (DB_POOL_PROFILE):
+# - direct: conexão direta ao PostgreSQL; statement_timeout enviado na conexão
+# - pgbouncer: pooler em modo transação (PgBouncer, Supavisor na porta 6543); sem
+#   parâmetros de inicialização, statement_timeout aplicado com SET LOCAL por transação
+# - null: sem pool local (scripts, jobs curtos)
+POOL_PROFILES = ('direct', 'pgbouncer', 'null')
+
+# Engines já instrumentados por setup_pool
+_instrumented_engines = weakref.WeakSet()
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool que mede quanto cada checkout leva: espera por uma conexão
+    livre, pre-ping e abertura de conexões novas
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except Exception as e:
+            # TimeoutError do pool esgotado e falhas de conexão
+            registry.inc('db_pool_errors_total', {'database': pool_name(self), 'error': type(e).__name__})
+            raise
+        finally:
+            registry.observe('db_pool_checkout_seconds', {'database': pool_name(self)}, time.perf_counter() - started)
+
+
+def pool_name(pool):
+    """
+    Nome do banco do pool nas métricas: primary ou o bind da réplica
+    """
+    return getattr(pool, 'logging_name', None) or 'primary'
+
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(database_uri, config, statement_timeout=True, name='primary'):
+    """
+    Opções do create_engine para a URL conforme o perfil configurado.
+    SQLite em memória fica com o StaticPool do Flask-SQLAlchemy.
+    statement_timeout=False omite o limite por comando (migrações no CLI);
+    name identifica o pool nas métricas (primary ou o bind da réplica).
+    """
+    url = make_url(database_uri)
+    if _is_memory_sqlite(url):
+        return {}
+
+    profile = config.get('DB_POOL_PROFILE', 'direct')
+    if profile not in POOL_PROFILES:
+        raise ValueError(f'DB_POOL_PROFILE inválido: {profile}')
+
+    if profile == 'null':
+        return {'poolclass': NullPool}
+
+    options = {
+        'poolclass': TimedQueuePool,
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 10),
+        'pool_logging_name': name,
+    }
+
+    if url.get_backend_name() != 'postgresql':
+        return options
+
+    options.update({
+        # Conexões mortas após ociosidade (proxy, pooler, failover) são trocadas antes do uso
+        'pool_pre_ping': True,
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        # Reusa as conexões mais quentes; as excedentes ficam ociosas e são recicladas
+        'pool_use_lifo': True,
+    })
+
+    timeout_ms = config.get('DB_STATEMENT_TIMEOUT_MS')
+    if statement_timeout and timeout_ms and profile == 'direct':
+        options['connect_args'] = {'options': f'-c statement_timeout={int(timeout_ms)}'}
+
+    return options
+
+
+def setup_pool(app, engine, statement_timeout=True):
+    """
+    Eventos do engine: contadores de conexões abertas/invalidadas, gauges do
+    pool e, no perfil pgbouncer, o statement_timeout de cada transação
+    """
+    if engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine)
+
+    labels = {'database': pool_name(engine.pool)}
+
+    @event.listens_for(engine, 'connect')
+    def _count_connect(dbapi_connection, connection_record):
+        registry.inc('db_pool_connects_total', labels)
+
+    @event.listens_for(engine, 'invalidate')
+    def _count_invalidate(dbapi_connection, connection_record, exception):
+        registry.inc('db_pool_invalidations_total', labels)
+
+    register_gauge_collector(_pool_gauge_collector(engine))
+
+    timeout_ms = app.config.get('DB_STATEMENT_TIMEOUT_MS')
+    if (statement_timeout and timeout_ms and app.config.get('DB_POOL_PROFILE') == 'pgbouncer'
+            and engine.dialect.name == 'postgresql'):
+        statement = f'SET LOCAL statement_timeout = {int(timeout_ms)}'
+
+        @event.listens_for(engine, 'begin')
+        def _set_statement_timeout(connection):
+            connection.exec_driver_sql(statement)
+
+
+def _pool_gauge_collector(engine):
+    # Referência fraca: o coletor fica registrado no processo, o engine pode ser descartado
+    engine_ref = weakref.ref(engine)
+
+    def collect(registry):
+        engine = engine_ref()
+        if engine is None:
+            return
+        status = pool_status(engine)
+        if not status:
+            return
+        database = pool_name(engine.pool)
+        registry.set('db_pool_size', {'database': database}, status['size'])
+        for state in ('checked_in', 'checked_out', 'overflow'):
+            registry.set('db_pool_connections', {'database': database, 'state': state}, status[state])
+    return collect
+
+
+def pool_status(engine):
+    """
+    Estado atual do pool deste processo
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        'size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': max(pool.overflow(), 0),
+    }
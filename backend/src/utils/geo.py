@@ -0,0 +1,102 @@
+import math
+
+# Raio médio da Terra e comprimento de um grau de latitude, em km
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 2 * math.pi * EARTH_RADIUS_KM / 360
+
+# Tamanho da célula da grade espacial (~11 km de lado na latitude)
+CELL_SIZE_DEG = 0.1
+# Multiplicador que separa a linha (latitude) da coluna (longitude) na chave da célula
+CELL_ROW_FACTOR = 10000
+
+DEFAULT_SEARCH_RADIUS_KM = 20
+MAX_SEARCH_RADIUS_KM = 100
+# Raio de atendimento assumido para prestadores sem service_radius
+DEFAULT_SERVICE_RADIUS_KM = 20
+
+
+def is_valid_coordinate(latitude, longitude):
+    """
+    Verifica se o par latitude/longitude é utilizável
+    """
+    if latitude is None or longitude is None:
+        return False
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180
+
+
+def _row(latitude):
+    return int(math.floor((latitude + 90) / CELL_SIZE_DEG))
+
+
+def _column(longitude):
+    return int(math.floor((longitude + 180) / CELL_SIZE_DEG))
+
+
+def geo_cell(latitude, longitude):
+    """
+    Calcula a chave inteira da célula da grade que contém o ponto.
+    Células vizinhas na mesma latitude têm chaves consecutivas, o que
+    permite buscar uma faixa inteira com um único BETWEEN no índice B-tree.
+    """
+    if not is_valid_coordinate(latitude, longitude):
+        return None
+    return _row(latitude) * CELL_ROW_FACTOR + _column(longitude)
+
+
+def _longitude_span(latitude, radius_km):
+    cos_lat = max(math.cos(math.radians(latitude)), 0.01)
+    return radius_km / (KM_PER_DEGREE * cos_lat)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Retorna (min_lat, max_lat, min_lng, max_lng) que envolve o círculo de busca
+    """
+    lat_span = radius_km / KM_PER_DEGREE
+    lng_span = _longitude_span(latitude, radius_km)
+    return (
+        max(latitude - lat_span, -90.0),
+        min(latitude + lat_span, 90.0),
+        max(longitude - lng_span, -180.0),
+        min(longitude + lng_span, 180.0)
+    )
+
+
+def cell_ranges(latitude, longitude, radius_km):
+    """
+    Lista as faixas (início, fim) de chaves de célula que cobrem o círculo de busca,
+    uma faixa por linha da grade
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    first_column = _column(min_lng)
+    last_column = _column(max_lng)
+
+    return [
+        (row * CELL_ROW_FACTOR + first_column, row * CELL_ROW_FACTOR + last_column)
+        for row in range(_row(min_lat), _row(max_lat) + 1)
+    ]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Distância em km entre dois pontos pela fórmula de haversine
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lng2 - lng1)
+
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distance_sq_expression(lat_column, lng_column, latitude, longitude):
+    """
+    Expressão SQL com o quadrado da distância equiretangular em km.
+    Usa apenas aritmética (o cosseno da origem é uma constante), então funciona
+    em qualquer banco e pode ser usada em WHERE e ORDER BY.
+    """
+    cos_lat = math.cos(math.radians(latitude))
+    dlat = (lat_column - latitude) * KM_PER_DEGREE
+    dlng = (lng_column - longitude) * (KM_PER_DEGREE * cos_lat)
+    return dlat * dlat + dlng * dlng
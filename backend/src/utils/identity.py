@@ -0,0 +1,137 @@
+"""
+Usuário autenticado das rotas @jwt_required(): o user_lookup_loader do
+Flask-JWT-Extended resolve a identidade do token por um cache em memória de
+registros leves (UserRecord), disponível nas rotas como current_user. Com o
+registro no cache, autenticar a requisição não consulta o banco.
+
+O cache é por processo, limitado a USER_CACHE_SIZE usuários (LRU) e cada
+registro vale por USER_CACHE_TTL segundos. Alterações em usuários pelo ORM
+(perfil, desativação, exclusão) e os agregados de avaliação
+(invalidate_user) removem o registro deste processo depois do commit; nos
+demais workers o registro antigo vale até o fim do TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, jsonify
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.models.user import db, User
+from src.utils.metrics import registry
+
+# Colunas copiadas para o registro; o restante do perfil fica em to_dict()
+RECORD_FIELDS = ('id', 'name', 'email', 'user_type', 'is_active', 'city', 'latitude', 'longitude', 'service_radius')
+
+# Ids de usuários alterados na transação corrente (session.info)
+_PENDING_KEY = 'identity_invalidations'
+
+
+class UserRecord:
+    """
+    Cópia somente leitura do usuário, sem ligação com a sessão: as rotas leem
+    os atributos de RECORD_FIELDS e to_dict() devolve o perfil serializado
+    """
+    __slots__ = RECORD_FIELDS + ('_profile',)
+
+    def __init__(self, user):
+        for field in RECORD_FIELDS:
+            setattr(self, field, getattr(user, field))
+        self._profile = user.to_dict()
+
+    def to_dict(self):
+        return self._profile
+
+
+class UserCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = OrderedDict()
+        # Incrementado a cada invalidação: um registro lido do banco antes dela não é guardado
+        self._epoch = 0
+
+    def get(self, user_id):
+        ttl = current_app.config.get('USER_CACHE_TTL', 5)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._records.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._records.move_to_end(user_id)
+                registry.inc('user_cache_lookups_total', {'result': 'hit'})
+                return entry[0]
+            epoch = self._epoch
+
+        registry.inc('user_cache_lookups_total', {'result': 'miss'})
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        record = UserRecord(user)
+
+        if ttl > 0:
+            size = current_app.config.get('USER_CACHE_SIZE', 10000)
+            with self._lock:
+                if self._epoch == epoch:
+                    self._records[user_id] = (record, now + ttl)
+                    self._records.move_to_end(user_id)
+                    while len(self._records) > size:
+                        self._records.popitem(last=False)
+        return record
+
+    def invalidate(self, user_ids):
+        with self._lock:
+            self._epoch += 1
+            for user_id in user_ids:
+                self._records.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._records.clear()
+
+
+user_cache = UserCache()
+
+
+def load_user(user_id):
+    """Registro do usuário pelo cache (None se não existir)"""
+    return user_cache.get(user_id)
+
+
+def invalidate_user(user_id):
+    """
+    Remove o usuário do cache quando a transação corrente for confirmada.
+    Necessário só para alterações fora do ORM (UPDATE direto); as feitas em
+    objetos User são detectadas no flush.
+    """
+    db.session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_users(session, flush_context):
+    changed = [obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)]
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        user_cache.invalidate(changed)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def init_identity(jwt):
+    """Registra o carregamento do usuário do token no JWTManager"""
+
+    @jwt.user_lookup_loader
+    def _lookup_user(jwt_header, jwt_data):
+        return load_user(int(jwt_data[current_app.config.get('JWT_IDENTITY_CLAIM', 'sub')]))
+
+    @jwt.user_lookup_error_loader
+    def _user_not_found(jwt_header, jwt_data):
+        return jsonify({'error': 'Usuário não encontrado'}), 401
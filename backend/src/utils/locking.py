@@ -0,0 +1,32 @@
+"""
+Bloqueio de linhas para transições de estado disputadas (ex.: aceitar uma
+proposta): a linha lida por lock_for_update fica reservada para a transação
+corrente até o commit/rollback, e transações concorrentes que pedem o mesmo
+bloqueio esperam e depois leem o estado já alterado.
+
+- PostgreSQL: SELECT ... FOR UPDATE, bloqueio só da linha
+- SQLite: não há bloqueio por linha; a transação passa a ser BEGIN IMMEDIATE,
+  que reserva a escrita do banco inteiro (as demais escritas esperam até o
+  busy timeout da conexão)
+"""
+from src.models.user import db
+
+
+def _begin_immediate(connection):
+    # O pysqlite só abre a transação antes da primeira escrita; com ela já aberta
+    # o banco já está reservado para esta conexão
+    dbapi_connection = connection.connection.dbapi_connection
+    if not dbapi_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+
+def lock_for_update(model, ident):
+    """
+    Relê a linha de model com a chave ident bloqueada até o fim da transação.
+    Retorna None se ela não existir.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name == 'sqlite':
+        _begin_immediate(connection)
+        return db.session.get(model, ident, populate_existing=True)
+    return db.session.get(model, ident, with_for_update=True, populate_existing=True)
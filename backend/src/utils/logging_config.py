@@ -1,138 +1,325 @@
+import atexit
+import copy
 import logging
 import os
-from logging.handlers import RotatingFileHandler
-from flask import request, g
+import queue
+import random
+import re
+import sys
 import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+from src.utils.metrics import registry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s]: %(message)s [in %(pathname)s:%(lineno)d]'
+ACCESS_TEXT_FORMAT = '%(asctime)s [%(request_id)s] - %(message)s'
+
+# X-Request-ID recebido do proxy é reaproveitado se tiver um formato seguro para os logs
+REQUEST_ID_HEADER = 'X-Request-ID'
+VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
+
+# Argumentos imutáveis podem ser formatados depois, na thread do listener
+LAZY_ARG_TYPES = (str, int, float, bool, type(None))
+
+# Atributos padrão do LogRecord; os demais vieram de extra= e vão para o JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'request_id', 'method', 'path', 'taskName'
+}
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+# Um pipeline (fila + listener) por processo, compartilhado por todas as apps criadas nele
+_pipeline = None
+
+
+class RequestQueueHandler(QueueHandler):
+    """
+    Envia os registros para a fila sem formatar a mensagem na thread da
+    requisição: só anexa o id e a rota da requisição. Com a fila cheia o
+    registro é descartado (e contado) em vez de travar a resposta.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if has_request_context():
+            record.request_id = g.get('request_id', '-')
+            record.method = request.method
+            record.path = request.path
+        else:
+            record.request_id = '-'
+
+        # Argumentos mutáveis (exceções, objetos, dicionários) podem mudar até o
+        # listener formatar: nesses casos a mensagem é montada aqui
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(type(arg) in LAZY_ARG_TYPES for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+
+        # Tracebacks prendem os frames da requisição; vão para a fila já como texto
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            registry.inc('log_records_dropped_total', {'level': record.levelname})
+
+
+class RequestSampler(logging.Filter):
+    """
+    Mantém os registros abaixo de WARNING só das requisições sorteadas
+    (LOG_SAMPLE_RATE); avisos e erros são sempre gravados
+    """
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not has_request_context():
+            return True
+        return g.get('log_sampled', True)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Uma linha JSON por registro, com o id da requisição e os campos passados
+    em extra= (ex.: status e duration_ms no log de acesso)
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        if getattr(record, 'path', None):
+            entry['method'] = record.method
+            entry['path'] = record.path
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.levelno >= logging.WARNING:
+            entry['source'] = f'{record.pathname}:{record.lineno}'
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _Listener(QueueListener):
+    def stop(self):
+        # Com a fila cheia o sentinela não entra: desiste em vez de travar o encerramento
+        if self._thread is None:
+            return
+        try:
+            self.queue.put(self._sentinel, timeout=2)
+        except queue.Full:
+            return
+        self._thread.join(timeout=5)
+        self._thread = None
+
+
+class _Pipeline:
+    def __init__(self, handlers, queue_size):
+        self.handlers = handlers
+        self.queue_size = queue_size
+        self.handler = RequestQueueHandler(queue.Queue(queue_size))
+        self.handler.addFilter(RequestSampler())
+        self.listener = None
+        self.start()
+
+    def start(self):
+        self.listener = _Listener(self.handler.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def restart_in_child(self):
+        # Após o fork (gunicorn --preload) a thread do listener não existe no worker e a
+        # fila pode ter travas herdadas em uso: cada worker recomeça com fila e thread novas
+        self.handler.queue = queue.Queue(self.queue_size)
+        self.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+
+
+def _log_level(app):
+    return app.config.get('LOG_LEVEL') or ('DEBUG' if app.debug else 'INFO')
+
+
+def _build_handlers(app):
+    json_format = (app.config.get('LOG_FORMAT') or ('text' if app.debug else 'json')) == 'json'
+
+    def formatter(text_format):
+        if json_format:
+            return JsonFormatter()
+        return logging.Formatter(text_format, defaults={'request_id': '-'})
+
+    if app.config.get('LOG_DESTINATION', 'stdout') != 'file':
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter(TEXT_FORMAT))
+        return [stream_handler]
+
+    # Vários workers gravam nos mesmos arquivos em modo append; a rotação fica com o
+    # logrotate (WatchedFileHandler reabre o arquivo quando ele é trocado), já que a
+    # rotação feita por cada processo sobrescreveria os arquivos dos outros
+    logs_dir = app.config.get('LOG_DIR') or os.path.join(os.path.dirname(app.root_path), 'logs')
+    os.makedirs(logs_dir, exist_ok=True)
+
+    app_handler = WatchedFileHandler(os.path.join(logs_dir, 'servico_em_casa.log'))
+    app_handler.setFormatter(formatter(TEXT_FORMAT))
+    app_handler.addFilter(lambda record: record.name != 'access')
+
+    error_handler = WatchedFileHandler(os.path.join(logs_dir, 'errors.log'))
+    error_handler.setFormatter(formatter(TEXT_FORMAT))
+    error_handler.setLevel(logging.ERROR)
+
+    access_handler = WatchedFileHandler(os.path.join(logs_dir, 'access.log'))
+    access_handler.setFormatter(formatter(ACCESS_TEXT_FORMAT))
+    access_handler.addFilter(logging.Filter('access'))
+
+    return [app_handler, error_handler, access_handler]
+
+
+def _shutdown():
+    if _pipeline is not None:
+        _pipeline.stop()
+
+
+def _restart_in_child():
+    if _pipeline is not None:
+        _pipeline.restart_in_child()
+
 
 def setup_logging(app):
     """
     Configura o sistema de logging para a aplicação Flask
+
+    As rotas só colocam os registros em uma fila; uma thread por processo
+    (QueueListener) formata e grava em stdout (padrão, JSON em produção) ou
+    em arquivos (LOG_DESTINATION=file). O pipeline é criado uma vez por
+    processo e reaproveitado pelas demais apps.
     """
-    # Criar diretório de logs se não existir
-    logs_dir = os.path.join(os.path.dirname(app.root_path), 'logs')
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
-    
-    if not app.debug:
-        # Configuração para produção
-        # Log principal da aplicação
-        file_handler = RotatingFileHandler(
-            os.path.join(logs_dir, 'servico_em_casa.log'),
-            maxBytes=10240000,  # 10MB
-            backupCount=10
-        )
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-        ))
-        file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
-        
-        # Log de erros separado
-        error_handler = RotatingFileHandler(
-            os.path.join(logs_dir, 'errors.log'),
-            maxBytes=10240000,  # 10MB
-            backupCount=5
-        )
-        error_handler.setFormatter(logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-        ))
-        error_handler.setLevel(logging.ERROR)
-        app.logger.addHandler(error_handler)
-        
-        # Log de acesso HTTP
-        access_handler = RotatingFileHandler(
-            os.path.join(logs_dir, 'access.log'),
-            maxBytes=10240000,  # 10MB
-            backupCount=5
-        )
-        access_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(message)s'
-        ))
-        access_handler.setLevel(logging.INFO)
-        
-        # Criar logger específico para acesso
-        access_logger = logging.getLogger('access')
-        access_logger.addHandler(access_handler)
-        access_logger.setLevel(logging.INFO)
-        
-        app.logger.setLevel(logging.INFO)
-        app.logger.info('Serviço em Casa startup')
-    else:
-        # Configuração para desenvolvimento
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]',
-            handlers=[
-                logging.StreamHandler()
-            ]
-        )
-        app.logger.setLevel(logging.DEBUG)
-        app.logger.info('Serviço em Casa startup')
+    global _pipeline
+
+    if _pipeline is None:
+        _pipeline = _Pipeline(_build_handlers(app), app.config.get('LOG_QUEUE_SIZE', 10000))
+        atexit.register(_shutdown)
+        os.register_at_fork(after_in_child=_restart_in_child)
+
+    root = logging.getLogger()
+    if _pipeline.handler not in root.handlers:
+        root.addHandler(_pipeline.handler)
+    # Bibliotecas (SQLAlchemy, alembic...) só com avisos; os níveis da aplicação vêm de LOG_LEVEL
+    root.setLevel(logging.WARNING)
+
+    level = _log_level(app)
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(level)
+
+    access_logger = logging.getLogger('access')
+    access_logger.setLevel(level)
+
+    app.logger.info('Serviço em Casa startup')
+
 
 def setup_request_logging(app):
     """
-    Configura logging de requisições HTTP
+    Configura logging de requisições HTTP: id da requisição (X-Request-ID),
+    amostragem dos logs INFO/DEBUG e uma linha de acesso por resposta
     """
+    sample_rate = app.config.get('LOG_SAMPLE_RATE', 1.0)
+    access_logger = logging.getLogger('access')
+
     @app.before_request
     def before_request():
-        g.start_time = time.time()
-        
+        g.start_time = time.perf_counter()
+
+        request_id = request.headers.get(REQUEST_ID_HEADER)
+        g.request_id = request_id if request_id and VALID_REQUEST_ID.match(request_id) else uuid.uuid4().hex
+        g.log_sampled = sample_rate >= 1 or random.random() < sample_rate
+
         # Log da requisição recebida
         if not request.path.startswith('/static'):
-            app.logger.debug(f'Requisição recebida: {request.method} {request.path} - IP: {request.remote_addr}')
-    
+            app.logger.debug('Requisição recebida: %s %s - IP: %s', request.method, request.path, request.remote_addr)
+
     @app.after_request
     def after_request(response):
         # Calcular tempo de resposta
-        if hasattr(g, 'start_time'):
-            duration = time.time() - g.start_time
-        else:
-            duration = 0
-        
-        # Log da resposta (apenas para rotas da API)
+        duration = time.perf_counter() - g.start_time if 'start_time' in g else 0
+
+        if 'request_id' in g:
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+
+        # Log da resposta (apenas para rotas da API); erros do servidor escapam da amostragem
         if not request.path.startswith('/static'):
-            access_logger = logging.getLogger('access')
-            log_message = f'{request.remote_addr} - "{request.method} {request.path}" {response.status_code} - {duration:.3f}s'
-            
-            if not app.debug:
-                access_logger.info(log_message)
-            else:
-                app.logger.info(f'Resposta: {response.status_code} - {duration:.3f}s')
-        
+            level = logging.WARNING if response.status_code >= 500 else logging.INFO
+            if access_logger.isEnabledFor(level):
+                access_logger.log(
+                    level, '%s - "%s %s" %s - %.3fs',
+                    request.remote_addr, request.method, request.path, response.status_code, duration,
+                    extra={'status': response.status_code, 'duration_ms': round(duration * 1000, 2),
+                           'remote_addr': request.remote_addr}
+                )
+
         return response
-    
+
     @app.errorhandler(404)
     def not_found_error(error):
-        app.logger.warning(f'Página não encontrada: {request.method} {request.path} - IP: {request.remote_addr}')
+        app.logger.warning('Página não encontrada: %s %s - IP: %s', request.method, request.path, request.remote_addr)
         return {'error': 'Página não encontrada'}, 404
-    
+
     @app.errorhandler(500)
     def internal_error(error):
-        app.logger.error(f'Erro interno do servidor: {request.method} {request.path} - IP: {request.remote_addr} - Erro: {str(error)}')
+        app.logger.error(
+            'Erro interno do servidor: %s %s - IP: %s - Erro: %s',
+            request.method, request.path, request.remote_addr, error
+        )
         return {'error': 'Erro interno do servidor'}, 500
 
+
 def log_user_action(user_id, action, details=None):
     """
     Função auxiliar para logar ações específicas do usuário
     """
     from flask import current_app
-    
-    message = f'Usuário {user_id}: {action}'
+
+    extra = {'user_id': user_id, 'action': action}
     if details:
-        message += f' - {details}'
-    
-    current_app.logger.info(message)
+        current_app.logger.info('Usuário %s: %s - %s', user_id, action, details, extra=extra)
+    else:
+        current_app.logger.info('Usuário %s: %s', user_id, action, extra=extra)
+
 
 def log_security_event(event_type, details, user_id=None):
     """
     Função auxiliar para logar eventos de segurança
     """
     from flask import current_app
-    
-    message = f'SEGURANÇA - {event_type}'
+
+    message = 'SEGURANÇA - %s'
+    args = [event_type]
     if user_id:
-        message += f' - Usuário: {user_id}'
+        message += ' - Usuário: %s'
+        args.append(user_id)
     if details:
-        message += f' - {details}'
-    
-    current_app.logger.warning(message)
\ No newline at end of file
+        message += ' - %s'
+        args.append(details)
+
+    current_app.logger.warning(message, *args, extra={'event_type': event_type})
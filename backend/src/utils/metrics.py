@@ -0,0 +1,288 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PREFIX = 'servico'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# nome -> (tipo, buckets, descrição)
+METRICS = {
+    'http_request_duration_seconds': ('histogram', LATENCY_BUCKETS, 'Tempo total da requisição'),
+    'http_db_duration_seconds': ('histogram', LATENCY_BUCKETS, 'Tempo gasto no banco por requisição'),
+    'http_db_queries': ('histogram', QUERY_COUNT_BUCKETS, 'Comandos SQL por requisição'),
+    'http_response_size_bytes': ('histogram', SIZE_BUCKETS, 'Tamanho do corpo da resposta'),
+    'http_requests_total': ('counter', None, 'Requisições por endpoint, método e status'),
+    'db_pool_checkout_seconds': ('histogram', POOL_WAIT_BUCKETS, 'Tempo para obter uma conexão do pool'),
+    'db_pool_connects_total': ('counter', None, 'Conexões abertas com o banco'),
+    'db_pool_invalidations_total': ('counter', None, 'Conexões descartadas (pre-ping, erro de conexão)'),
+    'db_pool_errors_total': ('counter', None, 'Falhas ao obter conexão do pool, por tipo'),
+    'db_pool_size': ('gauge', None, 'Tamanho configurado do pool'),
+    'db_pool_connections': ('gauge', None, 'Conexões do pool por estado'),
+    'db_read_routing_total': ('counter', None, 'Requisições @replica_reads por destino das leituras'),
+    'log_records_dropped_total': ('counter', None, 'Registros de log descartados com a fila cheia'),
+    'password_hash_queue_seconds': ('histogram', POOL_WAIT_BUCKETS, 'Espera na fila do pool de hash de senhas'),
+    'password_hash_duration_seconds': ('histogram', LATENCY_BUCKETS, 'Tempo de cálculo do hash de senha'),
+    'password_hash_rejected_total': ('counter', None, 'Operações de hash recusadas (fila cheia ou espera esgotada)'),
+    'password_hash_in_flight': ('gauge', None, 'Operações de hash em execução ou na fila'),
+    'user_cache_lookups_total': ('counter', None, 'Consultas ao cache do usuário autenticado (hit/miss)'),
+}
+
+# Funções chamadas antes de cada snapshot para atualizar os gauges do processo
+_gauge_collectors = []
+
+
+class MetricsRegistry:
+    """
+    Histogramas e contadores do processo, indexados por (métrica, rótulos).
+    O snapshot é um dicionário serializável em JSON, o que permite somar os
+    valores de vários workers do gunicorn.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][1]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+            entry['buckets'][bisect_left(buckets, value)] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = value
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                [name, [list(label) for label in labels], _copy_value(value)]
+                for (name, labels), value in self._values.items()
+            ]
+
+
+registry = MetricsRegistry()
+
+
+def register_gauge_collector(collector):
+    """
+    Registra uma função que atualiza gauges (ex.: estado do pool) antes de cada snapshot
+    """
+    if collector not in _gauge_collectors:
+        _gauge_collectors.append(collector)
+
+
+def _collect_gauges():
+    for collector in _gauge_collectors:
+        try:
+            collector(registry)
+        except Exception as e:
+            current_app.logger.warning('Falha ao coletar gauges: %s', e)
+
+
+def _copy_value(value):
+    if isinstance(value, dict):
+        return {'buckets': list(value['buckets']), 'sum': value['sum'], 'count': value['count']}
+    return value
+
+
+def merge_snapshots(snapshots):
+    merged = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot:
+            key = (name, tuple(tuple(label) for label in labels))
+            current = merged.get(key)
+            if current is None:
+                merged[key] = _copy_value(value)
+            elif isinstance(value, dict):
+                current['buckets'] = [a + b for a, b in zip(current['buckets'], value['buckets'])]
+                current['sum'] += value['sum']
+                current['count'] += value['count']
+            else:
+                merged[key] = current + value
+    return merged
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    escaped = [
+        '%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in items
+    ]
+    return '{' + ','.join(escaped) + '}'
+
+
+def render_prometheus(merged):
+    """
+    Gera o formato de exposição de texto do Prometheus (versão 0.0.4)
+    """
+    lines = []
+    for name, (metric_type, buckets, description) in METRICS.items():
+        series = sorted((labels, value) for (metric, labels), value in merged.items() if metric == name)
+        full_name = f'{PREFIX}_{name}'
+        lines.append(f'# HELP {full_name} {description}')
+        lines.append(f'# TYPE {full_name} {metric_type}')
+
+        for labels, value in series:
+            if metric_type in ('counter', 'gauge'):
+                lines.append(f'{full_name}{_format_labels(labels)} {value}')
+                continue
+
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ['+Inf'], value['buckets']):
+                cumulative += count
+                lines.append(f'{full_name}_bucket{_format_labels(labels, ("le", bound))} {cumulative}')
+            lines.append(f'{full_name}_sum{_format_labels(labels)} {value["sum"]}')
+            lines.append(f'{full_name}_count{_format_labels(labels)} {value["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _worker_file(directory):
+    return os.path.join(directory, f'metrics-{os.getpid()}.json')
+
+
+def flush_to_directory(directory):
+    """
+    Grava o snapshot deste processo no diretório compartilhado entre workers.
+    A escrita é atômica (arquivo temporário + rename).
+    """
+    _collect_gauges()
+    path = _worker_file(directory)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(tmp_path, path)
+
+
+def _process_alive(path):
+    try:
+        os.kill(int(os.path.basename(path)[len('metrics-'):-len('.json')]), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect_snapshots(directory):
+    _collect_gauges()
+    snapshots = [registry.snapshot()]
+    if not directory:
+        return snapshots
+
+    own_file = _worker_file(directory)
+    for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+        if path == own_file:
+            continue
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        # Gauges de workers encerrados não descrevem mais o estado atual
+        if not _process_alive(path):
+            snapshot = [entry for entry in snapshot if METRICS.get(entry[0], ('',))[0] != 'gauge']
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get('query_start_time')
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+
+    if has_request_context() and 'db_queries' in g:
+        g.db_queries += 1
+        g.db_time += elapsed
+
+
+def setup_metrics(app):
+    """
+    Configura a coleta de métricas por endpoint e a rota /api/_metrics.
+    Só é ativada com METRICS_ENABLED; com METRICS_MULTIPROC_DIR os workers
+    compartilham seus valores por arquivos nesse diretório.
+    """
+    if not app.config.get('METRICS_ENABLED'):
+        return
+
+    directory = app.config.get('METRICS_MULTIPROC_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 5)
+    state = {'last_flush': 0.0}
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_start = time.perf_counter()
+        g.db_queries = 0
+        g.db_time = 0.0
+
+    @app.after_request
+    def record_request_metrics(response):
+        if 'metrics_start' not in g:
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        labels = {'endpoint': endpoint}
+
+        registry.observe('http_request_duration_seconds', labels, time.perf_counter() - g.metrics_start)
+        registry.observe('http_db_duration_seconds', labels, g.db_time)
+        registry.observe('http_db_queries', labels, g.db_queries)
+        if response.content_length is not None:
+            registry.observe('http_response_size_bytes', labels, response.content_length)
+        registry.inc('http_requests_total', {
+            'endpoint': endpoint,
+            'method': request.method,
+            'status': str(response.status_code)
+        })
+
+        now = time.monotonic()
+        if directory and now - state['last_flush'] >= flush_interval:
+            state['last_flush'] = now
+            try:
+                flush_to_directory(directory)
+            except OSError as e:
+                current_app.logger.warning('Falha ao gravar métricas em %s: %s', directory, e)
+
+        return response
+
+    @app.route('/api/_metrics', methods=['GET'])
+    def metrics():
+        token = app.config.get('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return {'error': 'Não autorizado'}, 401
+
+        merged = merge_snapshots(collect_snapshots(directory))
+        return Response(render_prometheus(merged), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime
+from flask import request
+from sqlalchemy import literal, tuple_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Cursor de paginação malformado ou adulterado"""
+
+
+def encode_cursor(values):
+    """
+    Gera o token opaco que identifica a última linha de uma página
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, columns):
+    """
+    Converte o token de volta para os valores das colunas de ordenação
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+    except ValueError:
+        raise InvalidCursor(token)
+
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursor(token)
+
+    values = []
+    for column, value in zip(columns, payload):
+        try:
+            if column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise InvalidCursor(token)
+        values.append(value)
+    return values
+
+
+def get_page_args(prefix=''):
+    """
+    Lê limit e cursor da query string (ex.: ?limit=20&cursor=...)
+    """
+    limit = request.args.get(f'{prefix}limit', default=DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    cursor = request.args.get(f'{prefix}cursor') or None
+    return limit, cursor
+
+
+def paginate(query, columns, limit, cursor=None):
+    """
+    Paginação por chave (keyset) em ordem decrescente das colunas informadas,
+    normalmente (created_at, id). Cada página custa uma busca no índice a partir
+    do cursor, independente de quão fundo o usuário já rolou.
+
+    Retorna (itens, next_cursor); next_cursor é None na última página.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        bound = [literal(value, column.type) for column, value in zip(columns, values)]
+        query = query.filter(tuple_(*columns) < tuple_(*bound))
+
+    items = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+
+    return items, next_cursor
@@ -0,0 +1,177 @@
+"""
+Hash de senhas fora da thread da requisição: um pool limitado por processo
+(PASSWORD_HASH_WORKERS threads) calcula os hashes, e no máximo
+PASSWORD_HASH_QUEUE_SIZE operações esperam na fila. Com a fila cheia, ou
+depois de PASSWORD_HASH_TIMEOUT segundos de espera, a operação é recusada
+com PasswordHasherBusy (as rotas respondem 503 com Retry-After) em vez de
+uma rajada de logins ocupar todas as threads e a CPU do worker.
+
+O KDF do hashlib libera o GIL, então as threads do pool rodam em paralelo
+com as requisições. No worker gevent o pool usa threads nativas do gevent,
+sem bloquear o loop.
+
+O método (PASSWORD_HASH_METHOD, no formato do werkzeug) vale para os hashes
+novos; hashes gravados com outro método ou outros parâmetros são refeitos no
+próximo login bem-sucedido.
+"""
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+from src.utils.metrics import register_gauge_collector, registry
+
+try:
+    from gevent import monkey as gevent_monkey
+    from gevent.threadpool import ThreadPoolExecutor as GeventThreadPoolExecutor
+except ImportError:
+    gevent_monkey = None
+
+DEFAULTS = {
+    'PASSWORD_HASH_METHOD': 'scrypt',
+    'PASSWORD_HASH_WORKERS': 2,
+    'PASSWORD_HASH_QUEUE_SIZE': 16,
+    'PASSWORD_HASH_TIMEOUT': 5.0,
+}
+
+# Um pool por processo, criado no primeiro uso (depois do fork do gunicorn)
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+class PasswordHasherBusy(Exception):
+    """Fila de hash cheia ou espera acima de PASSWORD_HASH_TIMEOUT"""
+
+
+def _executor(workers):
+    # Com o threading do monkey patching, as threads do concurrent.futures seriam greenlets
+    if gevent_monkey is not None and gevent_monkey.is_module_patched('threading'):
+        return GeventThreadPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+
+
+class PasswordHasher:
+    def __init__(self, method, workers, queue_size, timeout):
+        self.method = method
+        self.timeout = timeout
+        self._executor = _executor(workers)
+        # Vagas para as operações em execução e na fila
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._dummy_hash = None
+
+    def _run(self, operation, function, *args):
+        labels = {'operation': operation}
+        if not self._slots.acquire(blocking=False):
+            registry.inc('password_hash_rejected_total', {**labels, 'reason': 'queue_full'})
+            raise PasswordHasherBusy()
+
+        with self._lock:
+            self._in_flight += 1
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            registry.observe('password_hash_queue_seconds', labels, started - submitted)
+            try:
+                return function(*args)
+            finally:
+                registry.observe('password_hash_duration_seconds', labels, time.perf_counter() - started)
+
+        def release(_future):
+            # A vaga só volta quando a operação termina ou é cancelada ainda na fila
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+        future = self._executor.submit(task)
+        future.add_done_callback(release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeout:
+            future.cancel()
+            registry.inc('password_hash_rejected_total', {**labels, 'reason': 'timeout'})
+            raise PasswordHasherBusy()
+
+    def hash(self, password):
+        return self._run('hash', generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run('verify', check_password_hash, password_hash, password)
+
+    def dummy_hash(self):
+        """Hash de uma senha aleatória com o método atual, calculado uma vez"""
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash(secrets.token_urlsafe(16))
+        return self._dummy_hash
+
+    def needs_rehash(self, password_hash):
+        # O prefixo do hash (ex.: scrypt:32768:8:1) traz o método com todos os parâmetros
+        current = self.dummy_hash().split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != current
+
+    def in_flight(self):
+        return self._in_flight
+
+
+def _config(name):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+
+def get_hasher():
+    global _hasher
+
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher(
+                    _config('PASSWORD_HASH_METHOD'), _config('PASSWORD_HASH_WORKERS'),
+                    _config('PASSWORD_HASH_QUEUE_SIZE'), _config('PASSWORD_HASH_TIMEOUT')
+                )
+    return _hasher
+
+
+def _reset_in_child():
+    # As threads do pool não existem no processo filho
+    global _hasher, _hasher_lock
+    _hasher = None
+    _hasher_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_in_child)
+
+
+def _gauge_collector(registry):
+    if _hasher is not None:
+        registry.set('password_hash_in_flight', {}, _hasher.in_flight())
+
+
+register_gauge_collector(_gauge_collector)
+
+
+def hash_password(password):
+    return get_hasher().hash(password)
+
+
+def verify_password(password_hash, password):
+    return get_hasher().verify(password_hash, password)
+
+
+def verify_dummy_password(password):
+    """
+    Mesmo custo de uma verificação real, para e-mails não cadastrados: o tempo
+    da resposta não revela se o e-mail existe e a fila limita essas tentativas
+    como as demais
+    """
+    hasher = get_hasher()
+    hasher.verify(hasher.dummy_hash(), password)
+    return False
+
+
+def password_needs_rehash(password_hash):
+    return get_hasher().needs_rehash(password_hash)
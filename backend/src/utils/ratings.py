@@ -0,0 +1,95 @@
+from sqlalchemy import Numeric, cast, func, update
+from src.models.user import db, User
+from src.models.evaluation import Evaluation
+from src.utils.identity import invalidate_user, user_cache
+
+# Critérios de avaliação opcionais, cada um com colunas <critério>_sum e <critério>_count em User
+CRITERIA = ('punctuality', 'quality', 'communication')
+
+BULK_UPDATE_CHUNK = 1000
+
+
+def apply_evaluation(evaluated_user, evaluation):
+    """
+    Soma a nova avaliação aos agregados do usuário avaliado com um único UPDATE
+    incremental, na mesma transação da inserção. As expressões do SET usam os
+    valores antigos da linha, então avaliações simultâneas não se perdem.
+    """
+    values = {
+        User.rating_sum: User.rating_sum + evaluation.rating,
+        User.rating_count: User.rating_count + 1,
+        User.average_rating: func.round(
+            cast(User.rating_sum + evaluation.rating, Numeric) / (User.rating_count + 1), 2
+        )
+    }
+
+    for criterion in CRITERIA:
+        score = getattr(evaluation, criterion)
+        if score is not None:
+            sum_column = getattr(User, f'{criterion}_sum')
+            count_column = getattr(User, f'{criterion}_count')
+            values[sum_column] = sum_column + score
+            values[count_column] = count_column + 1
+
+    # Para prestadores, total de serviços = total de avaliações recebidas
+    if evaluated_user.user_type == 'provider':
+        values[User.total_services] = User.rating_count + 1
+
+    db.session.execute(
+        update(User).where(User.id == evaluated_user.id).values(values),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.expire(evaluated_user)
+    # UPDATE direto: o ORM não vê a mudança, então o perfil em cache é descartado aqui
+    invalidate_user(evaluated_user.id)
+
+
+def recompute_rating_aggregates():
+    """
+    Recalcula em lote os agregados de todos os usuários a partir da tabela de
+    avaliações (backfill/reparo). Retorna o número de usuários com avaliações.
+    """
+    columns = [func.sum(Evaluation.rating), func.count(Evaluation.rating)]
+    for criterion in CRITERIA:
+        column = getattr(Evaluation, criterion)
+        columns += [func.coalesce(func.sum(column), 0), func.count(column)]
+
+    rows = db.session.query(Evaluation.evaluated_id, *columns).group_by(Evaluation.evaluated_id).all()
+    provider_ids = {
+        row[0] for row in db.session.query(User.id).filter_by(user_type='provider')
+    }
+
+    # Zera todos e depois grava os valores de quem tem avaliações
+    reset = {User.rating_sum: 0, User.rating_count: 0, User.average_rating: 0.0}
+    for criterion in CRITERIA:
+        reset[getattr(User, f'{criterion}_sum')] = 0
+        reset[getattr(User, f'{criterion}_count')] = 0
+    db.session.execute(update(User).values(reset), execution_options={'synchronize_session': False})
+    db.session.execute(
+        update(User).where(User.user_type == 'provider').values(total_services=0),
+        execution_options={'synchronize_session': False}
+    )
+
+    params = []
+    for row in rows:
+        evaluated_id, rating_sum, rating_count = row[0], row[1], row[2]
+        values = {
+            'id': evaluated_id,
+            'rating_sum': rating_sum,
+            'rating_count': rating_count,
+            'average_rating': round(rating_sum / rating_count, 2)
+        }
+        for index, criterion in enumerate(CRITERIA):
+            values[f'{criterion}_sum'] = row[3 + 2 * index]
+            values[f'{criterion}_count'] = row[4 + 2 * index]
+        if evaluated_id in provider_ids:
+            values['total_services'] = rating_count
+        params.append(values)
+
+    # UPDATE em lote por chave primária (executemany)
+    for start in range(0, len(params), BULK_UPDATE_CHUNK):
+        db.session.execute(update(User), params[start:start + BULK_UPDATE_CHUNK])
+
+    db.session.commit()
+    user_cache.clear()
+    return len(params)
@@ -0,0 +1,120 @@
+from flask import current_app, request
+from flask_jwt_extended import decode_token
+from flask_socketio import SocketIO, join_room, leave_room
+from src.models.user import db
+from src.models.request import ServiceRequest
+from src.models.proposal import Proposal
+
+socketio = SocketIO()
+
+# sid da conexão Socket.IO -> id do usuário autenticado
+_connected_users = {}
+
+
+def user_room(user_id):
+    return f'user:{user_id}'
+
+
+def request_room(request_id):
+    return f'request:{request_id}'
+
+
+def emit_event(event, payload, request_id=None, user_ids=()):
+    """
+    Envia o evento para a sala do pedido e para as salas dos usuários
+    informados. Cada conexão recebe o evento uma única vez, mesmo estando
+    em mais de uma dessas salas.
+    """
+    # Sem servidor Socket.IO (scripts, shell) não há para quem enviar
+    if socketio.server is None:
+        return
+
+    rooms = [request_room(request_id)] if request_id is not None else []
+    rooms += [user_room(user_id) for user_id in user_ids]
+    if not rooms:
+        return
+
+    try:
+        socketio.emit(event, payload, to=rooms)
+    except Exception as e:
+        current_app.logger.warning('Falha ao emitir %s: %s', event, e)
+
+
+def proposal_payload(proposal):
+    return {
+        'id': proposal.id,
+        'request_id': proposal.service_request_id,
+        'provider_id': proposal.provider_id,
+        'price': proposal.price,
+        'status': proposal.status
+    }
+
+
+def request_payload(service_request):
+    return {
+        'id': service_request.id,
+        'status': service_request.status,
+        'updated_at': service_request.updated_at.isoformat() if service_request.updated_at else None
+    }
+
+
+@socketio.on('connect')
+def handle_connect(auth=None):
+    """
+    Autentica a conexão com o mesmo JWT da API, enviado em auth.token
+    (ou ?token= na URL), e entra na sala do usuário
+    """
+    token = (auth or {}).get('token') or request.args.get('token')
+    if not token:
+        return False
+
+    try:
+        user_id = int(decode_token(token)['sub'])
+    except Exception:
+        return False
+
+    _connected_users[request.sid] = user_id
+    join_room(user_room(user_id))
+
+
+@socketio.on('disconnect')
+def handle_disconnect(*args):
+    _connected_users.pop(request.sid, None)
+
+
+@socketio.on('join_request')
+def handle_join_request(data):
+    """
+    Entra na sala de um pedido. Permitido ao cliente dono do pedido e aos
+    prestadores com proposta nele. A sala recebe só a mudança de status do
+    pedido; propostas, avaliações e leituras vão para as salas dos usuários
+    envolvidos.
+    """
+    user_id = _connected_users.get(request.sid)
+    request_id = (data or {}).get('request_id')
+    if user_id is None or not isinstance(request_id, int):
+        return {'error': 'Pedido inválido'}
+
+    service_request = db.session.get(ServiceRequest, request_id)
+    if not service_request:
+        return {'error': 'Pedido não encontrado'}
+
+    if service_request.client_id != user_id:
+        has_proposal = db.session.query(Proposal.id).filter(
+            Proposal.service_request_id == request_id,
+            Proposal.provider_id == user_id,
+            Proposal.status != 'cancelled'
+        ).first()
+        if not has_proposal:
+            return {'error': 'Não autorizado'}
+
+    join_room(request_room(request_id))
+    return {'joined': request_id}
+
+
+@socketio.on('leave_request')
+def handle_leave_request(data):
+    request_id = (data or {}).get('request_id')
+    if isinstance(request_id, int):
+        leave_room(request_room(request_id))
+    return {'left': request_id}
@@ -0,0 +1,83 @@
+import hashlib
+import threading
+import time
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.user import db
+from src.models.reference import ReferenceVersion
+
+
+def get_version(name):
+    row = db.session.get(ReferenceVersion, name)
+    return row.version if row else 0
+
+
+def bump_version(name):
+    """
+    Incrementa a versão dentro da transação corrente; os outros workers
+    percebem a mudança na próxima verificação e reconstroem seus snapshots.
+    Um único upsert: escritas simultâneas antes de a linha existir não
+    disputam o mesmo INSERT.
+    """
+    dialects = {'postgresql': postgresql, 'sqlite': sqlite}
+    dialect = dialects.get(db.session.get_bind().dialect.name)
+    if dialect is None:
+        result = db.session.execute(
+            update(ReferenceVersion)
+            .where(ReferenceVersion.name == name)
+            .values(version=ReferenceVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            db.session.add(ReferenceVersion(name=name, version=1))
+        return
+
+    statement = dialect.insert(ReferenceVersion).values(name=name, version=1)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[ReferenceVersion.name],
+        set_={'version': ReferenceVersion.version + 1}
+    ))
+
+
+class ReferenceSnapshot:
+    """
+    Snapshot em memória de dados de referência, já serializado em bytes,
+    com ETag forte. A versão no banco é consultada no máximo uma vez a cada
+    REFERENCE_CACHE_TTL segundos.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._body = None
+        self._etag = None
+        self._version = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._body = None
+            self._checked_at = 0.0
+
+    def get(self):
+        """
+        Retorna (corpo em bytes, etag)
+        """
+        ttl = current_app.config.get('REFERENCE_CACHE_TTL', 5)
+
+        with self._lock:
+            now = time.monotonic()
+            if self._body is not None and now - self._checked_at < ttl:
+                return self._body, self._etag
+
+            version = get_version(self.name)
+            self._checked_at = now
+            if self._body is None or version != self._version:
+                body = current_app.json.dumps(self.loader()).encode()
+                digest = hashlib.sha1(body).hexdigest()[:16]
+                self._body = body
+                self._etag = f'{self.name}-{version}-{digest}'
+                self._version = version
+
+            return self._body, self._etag
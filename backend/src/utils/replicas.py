@@ -0,0 +1,158 @@
+import random
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+from src.utils.db_pool import engine_options
+from src.utils.metrics import registry
+
+# Cada URL de DATABASE_REPLICA_URLS vira um bind replica_1, replica_2... do Flask-SQLAlchemy
+REPLICA_BIND_PREFIX = 'replica_'
+
+# Cookie com o instante (epoch) até quando as leituras do cliente ficam no primário;
+# vale entre workers e instâncias, o mapa abaixo cobre clientes sem cookie no mesmo processo
+STICKY_COOKIE = 'db_primary_until'
+
+_recent_writers = {}
+_recent_writers_lock = threading.Lock()
+MAX_RECENT_WRITERS = 10000
+
+
+def replica_binds(config, statement_timeout=True):
+    """
+    Entradas de SQLALCHEMY_BINDS para as réplicas, com as mesmas opções de pool do primário
+    """
+    binds = {}
+    for index, url in enumerate(config.get('DATABASE_REPLICA_URLS') or [], start=1):
+        name = f'{REPLICA_BIND_PREFIX}{index}'
+        binds[name] = {'url': url, **engine_options(url, config, statement_timeout, name=name)}
+    return binds
+
+
+def replica_names(engines):
+    return [key for key in engines if key and key.startswith(REPLICA_BIND_PREFIX)]
+
+
+class RoutingSession(Session):
+    """
+    Sessão do Flask-SQLAlchemy que envia os SELECTs das rotas marcadas com
+    @replica_reads para uma réplica. Escritas, SELECT ... FOR UPDATE e toda
+    leitura feita depois de uma escrita na mesma sessão ficam no primário.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info['wrote'] = True
+            elif (isinstance(clause, Select) and clause._for_update_arg is None
+                    and not self.info.get('wrote')):
+                replica = _request_replica(self._db.engines)
+                if replica is not None:
+                    return replica
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_reads(view):
+    """
+    Marca uma rota somente leitura: seus SELECTs podem ser atendidos por uma réplica,
+    exceto logo depois de uma escrita do mesmo cliente (DB_REPLICA_STICKY_SECONDS)
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_replica_reads = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _request_replica(engines):
+    if not has_request_context() or not g.get('db_replica_reads'):
+        return None
+
+    # Uma réplica por requisição, escolhida na primeira leitura
+    if 'db_replica' not in g:
+        names = replica_names(engines)
+        if not names:
+            g.db_replica = None
+        elif _reads_from_primary():
+            registry.inc('db_read_routing_total', {'target': 'primary'})
+            g.db_replica = None
+        else:
+            registry.inc('db_read_routing_total', {'target': 'replica'})
+            g.db_replica = engines[random.choice(names)]
+
+    return g.db_replica
+
+
+def _identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # Rota pública: o token não foi verificado
+        return None
+
+
+def _reads_from_primary():
+    """
+    O cliente escreveu há pouco: a réplica pode ainda não ter a escrita
+    """
+    now = time.time()
+    try:
+        if float(request.cookies.get(STICKY_COOKIE, 0)) > now:
+            return True
+    except ValueError:
+        pass
+
+    identity = _identity()
+    return identity is not None and _recent_writers.get(identity, 0) > now
+
+
+def _remember_write(session):
+    if not session.info.get('wrote') or not has_request_context():
+        return
+    if not replica_names(session._db.engines):
+        return
+
+    until = time.time() + current_app.config.get('DB_REPLICA_STICKY_SECONDS', 10)
+    g.db_primary_until = until
+
+    identity = _identity()
+    if identity is None:
+        return
+
+    with _recent_writers_lock:
+        if len(_recent_writers) >= MAX_RECENT_WRITERS:
+            now = time.time()
+            for key in [key for key, expires in _recent_writers.items() if expires <= now]:
+                del _recent_writers[key]
+            if len(_recent_writers) >= MAX_RECENT_WRITERS:
+                _recent_writers.clear()
+        _recent_writers[identity] = until
+
+
+def setup_replica_routing(app):
+    """
+    Grava quem acabou de escrever (após o commit) e devolve o cookie de
+    permanência no primário. Só é ativada quando há réplicas configuradas.
+    """
+    if not app.config.get('DATABASE_REPLICA_URLS'):
+        return
+
+    if not event.contains(RoutingSession, 'after_commit', _remember_write):
+        event.listen(RoutingSession, 'after_commit', _remember_write)
+
+    @app.after_request
+    def set_sticky_cookie(response):
+        until = g.get('db_primary_until')
+        if until:
+            response.set_cookie(
+                STICKY_COOKIE, str(int(until) + 1),
+                max_age=app.config.get('DB_REPLICA_STICKY_SECONDS', 10) + 1,
+                httponly=True, samesite='Lax', secure=request.is_secure
+            )
+        return response
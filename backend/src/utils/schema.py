@@ -0,0 +1,124 @@
+import ast
+import glob
+import os
+import re
+import click
+from sqlalchemy import inspect, text
+from src.models.user import db
+
+# Diretório das revisões do Alembic (backend/migrations)
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'migrations'
+)
+VERSION_TABLE = 'alembic_version'
+
+# Modos de SCHEMA_CHECK
+SCHEMA_CHECK_MODES = ('check', 'upgrade', 'off')
+
+_REVISION_PATTERN = re.compile(r'^(revision|down_revision)\s*=\s*(.+)$', re.MULTILINE)
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def init_migrations(app):
+    """
+    Registra o Flask-Migrate (comando flask db e configuração usada por
+    migrations/env.py). O Alembic só é importado aqui, fora do caminho de
+    inicialização dos workers.
+    """
+    if 'migrate' in app.extensions:
+        return
+    from flask_migrate import Migrate
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+
+
+def alembic_config():
+    """
+    Configuração do Alembic para uso programático, sem reconfigurar o logging da aplicação
+    """
+    from alembic.config import Config as AlembicConfig
+
+    config = AlembicConfig(os.path.join(MIGRATIONS_DIR, 'alembic.ini'))
+    config.set_main_option('script_location', MIGRATIONS_DIR)
+    config.attributes['configure_logger'] = False
+    return config
+
+
+def head_revisions():
+    """
+    Revisões finais, lidas dos cabeçalhos dos arquivos de migração sem
+    importar o Alembic nem os scripts
+    """
+    revisions = set()
+    parents = set()
+
+    for path in glob.glob(os.path.join(MIGRATIONS_DIR, 'versions', '*.py')):
+        with open(path, encoding='utf-8') as f:
+            values = dict(_REVISION_PATTERN.findall(f.read()))
+        if 'revision' not in values:
+            continue
+
+        revisions.add(ast.literal_eval(values['revision']))
+        down_revision = ast.literal_eval(values.get('down_revision', 'None'))
+        if isinstance(down_revision, (tuple, list)):
+            parents.update(down_revision)
+        elif down_revision:
+            parents.add(down_revision)
+
+    return revisions - parents
+
+
+def current_revisions():
+    with db.engine.connect() as connection:
+        if not inspect(connection).has_table(VERSION_TABLE):
+            return set()
+        return {row[0] for row in connection.execute(text(f'SELECT version_num FROM {VERSION_TABLE}'))}
+
+
+def upgrade_schema(app, revision='head'):
+    from alembic import command
+
+    init_migrations(app)
+    command.upgrade(alembic_config(), revision)
+
+
+def verify_schema(app):
+    """
+    Confere se o banco está na revisão mais recente das migrações. Não
+    inspeciona tabelas: lê apenas a tabela alembic_version.
+
+    SCHEMA_CHECK=upgrade aplica as migrações pendentes (desenvolvimento e
+    testes); check recusa subir com o banco desatualizado; off não verifica.
+    """
+    mode = app.config.get('SCHEMA_CHECK', 'check')
+    if mode not in SCHEMA_CHECK_MODES:
+        raise ValueError(f'SCHEMA_CHECK inválido: {mode}')
+    if mode == 'off':
+        return
+
+    heads = head_revisions()
+    current = current_revisions()
+    if current == heads:
+        return
+
+    if mode == 'upgrade':
+        app.logger.info('Aplicando migrações: %s -> %s', sorted(current) or 'banco vazio', sorted(heads))
+        upgrade_schema(app)
+        return
+
+    message = (
+        f'Banco na revisão {sorted(current) or "nenhuma"}, esperado {sorted(heads)}. '
+        'Rode "flask --app src.main db upgrade".'
+    )
+    # Comandos do CLI (inclusive o próprio db upgrade) carregam a aplicação e precisam subir
+    if running_cli():
+        app.logger.warning(message)
+        return
+    raise SchemaOutOfDate(message)
+
+
+def running_cli():
+    return click.get_current_context(silent=True) is not None
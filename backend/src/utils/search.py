@@ -0,0 +1,143 @@
+import re
+from sqlalchemy import text
+from src.models.user import db, User
+from src.models.service import ServiceCategory, ProviderService
+
+# Índice de texto completo dos prestadores: nome, bio e serviços oferecidos
+# (descrição + nome da categoria). FTS5 no SQLite, tsvector + GIN no PostgreSQL.
+# A estrutura é criada pela migração 0002 (backend/migrations/versions).
+SEARCH_TABLE = 'provider_search'
+PG_TEXT_CONFIG = 'portuguese'
+
+# Pesos das colunas no BM25 do SQLite (name, bio, services)
+SQLITE_BM25_WEIGHTS = (10.0, 2.0, 5.0)
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def _dialect(bind=None):
+    bind = bind or db.session.get_bind()
+    return bind.dialect.name
+
+
+def is_search_supported(bind=None):
+    return _dialect(bind) in ('sqlite', 'postgresql')
+
+
+def _services_text(provider_id):
+    rows = db.session.query(ServiceCategory.name, ProviderService.description).join(
+        ProviderService, ProviderService.category_id == ServiceCategory.id
+    ).filter(
+        ProviderService.provider_id == provider_id,
+        ProviderService.is_active == True
+    ).all()
+
+    return ' '.join(part for row in rows for part in row if part)
+
+
+def sync_provider_search(provider_id):
+    """
+    Atualiza a entrada do prestador no índice dentro da transação corrente.
+    Deve ser chamada antes do commit sempre que nome, bio ou serviços mudarem.
+    """
+    if not is_search_supported():
+        return
+
+    db.session.flush()
+    dialect = _dialect()
+
+    if dialect == 'sqlite':
+        db.session.execute(text(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = :id'), {'id': provider_id})
+    else:
+        db.session.execute(text(f'DELETE FROM {SEARCH_TABLE} WHERE provider_id = :id'), {'id': provider_id})
+
+    user = db.session.get(User, provider_id)
+    if not user or user.user_type != 'provider':
+        return
+
+    params = {
+        'id': provider_id,
+        'name': user.name or '',
+        'bio': user.bio or '',
+        'services': _services_text(provider_id)
+    }
+
+    if dialect == 'sqlite':
+        db.session.execute(text(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, bio, services) VALUES (:id, :name, :bio, :services)'
+        ), params)
+    else:
+        db.session.execute(text(
+            f'INSERT INTO {SEARCH_TABLE} (provider_id, document) VALUES (:id, '
+            f"setweight(to_tsvector('{PG_TEXT_CONFIG}', :name), 'A') || "
+            f"setweight(to_tsvector('{PG_TEXT_CONFIG}', :services), 'B') || "
+            f"setweight(to_tsvector('{PG_TEXT_CONFIG}', :bio), 'C'))"
+        ), params)
+
+
+def reindex_all_providers():
+    """
+    Reconstrói o índice inteiro a partir das tabelas de usuários e serviços,
+    com um único INSERT ... SELECT (o mesmo backfill da migração 0002) em vez
+    de uma sincronização por prestador
+    """
+    if not is_search_supported():
+        return 0
+
+    if _dialect() == 'sqlite':
+        services = "group_concat(sc.name || ' ' || COALESCE(ps.description, ''), ' ')"
+        document = "u.id, COALESCE(u.name, ''), COALESCE(u.bio, ''), COALESCE(({services}), '')"
+        columns = 'rowid, name, bio, services'
+    else:
+        services = "string_agg(concat_ws(' ', sc.name, ps.description), ' ')"
+        document = (
+            f"u.id, setweight(to_tsvector('{PG_TEXT_CONFIG}', COALESCE(u.name, '')), 'A') || "
+            f"setweight(to_tsvector('{PG_TEXT_CONFIG}', COALESCE(({{services}}), '')), 'B') || "
+            f"setweight(to_tsvector('{PG_TEXT_CONFIG}', COALESCE(u.bio, '')), 'C')"
+        )
+        columns = 'provider_id, document'
+
+    subquery = (
+        f'SELECT {services} FROM provider_service ps '
+        'JOIN service_category sc ON sc.id = ps.category_id '
+        'WHERE ps.provider_id = u.id AND ps.is_active = :active'
+    )
+    db.session.execute(text(f'DELETE FROM {SEARCH_TABLE}'))
+    result = db.session.execute(text(
+        f'INSERT INTO {SEARCH_TABLE} ({columns}) '
+        f'SELECT {document.format(services=subquery)} FROM "user" u WHERE u.user_type = :provider'
+    ), {'active': True, 'provider': 'provider'})
+
+    db.session.commit()
+    return result.rowcount
+
+
+def provider_matches(keyword):
+    """
+    Retorna uma subquery (provider_id, rank) com os prestadores que casam com a
+    palavra-chave, onde um rank menor é mais relevante. Retorna None quando o
+    banco não tem suporte ou a palavra-chave não tem termos pesquisáveis.
+    """
+    tokens = _TOKEN_PATTERN.findall(keyword or '')
+    if not tokens or not is_search_supported():
+        return None
+
+    if _dialect() == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        weights = ', '.join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        statement = text(
+            f'SELECT rowid AS provider_id, bm25({SEARCH_TABLE}, {weights}) AS rank '
+            f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query'
+        )
+    else:
+        match = ' & '.join(f'{token}:*' for token in tokens)
+        statement = text(
+            f'SELECT provider_id, -ts_rank(document, query) AS rank '
+            f"FROM {SEARCH_TABLE}, to_tsquery('{PG_TEXT_CONFIG}', :query) AS query "
+            'WHERE document @@ query'
+        )
+
+    return statement.bindparams(query=match).columns(
+        provider_id=db.Integer,
+        rank=db.Float
+    ).subquery('provider_matches')
@@ -0,0 +1,124 @@
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Date, DateTime, inspect
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Modelo -> to_dict compilado por @serializable
+_serializers = {}
+
+
+def serializable(*fields):
+    """
+    Decorador de modelo: compila to_dict() uma única vez a partir da lista de campos.
+    Cada campo é o nome de uma coluna ou um par (chave, origem), em que a origem é
+    outra coluna ou uma função que recebe a instância. Datas viram ISO 8601.
+    """
+    def decorator(model):
+        model.to_dict = _serializers[model] = _compile_to_dict(model, fields)
+        return model
+    return decorator
+
+
+def compile_extractor(model, fields, from_dict=True):
+    """
+    Gera uma função que monta o dicionário do modelo em um único literal.
+    Com from_dict=True lê os valores direto de obj.__dict__ (sem passar pelos
+    descritores do SQLAlchemy) e levanta KeyError se algum não estiver carregado.
+    """
+    columns = inspect(model).columns
+    namespace = {}
+    items = []
+
+    for index, field in enumerate(fields):
+        key, source = (field, field) if isinstance(field, str) else field
+        if callable(source):
+            namespace[f'_compute{index}'] = source
+            expression = f'_compute{index}(obj)'
+        else:
+            expression = f'd[{source!r}]' if from_dict else f'obj.{source}'
+            if isinstance(columns[source].type, (DateTime, Date)):
+                expression = f'(v.isoformat() if (v := {expression}) is not None else None)'
+        items.append(f'{key!r}: {expression}')
+
+    name = f'{model.__name__.lower()}_to_dict'
+    lines = [f'def {name}(obj):']
+    if from_dict:
+        lines.append('    d = obj.__dict__')
+    lines.append('    return {' + ', '.join(items) + '}')
+
+    exec(compile('\n'.join(lines), f'<serializer {model.__name__}>', 'exec'), namespace)
+    return namespace[name]
+
+
+def _compile_to_dict(model, fields):
+    from_dict = compile_extractor(model, fields, from_dict=True)
+    from_attributes = compile_extractor(model, fields, from_dict=False)
+
+    def to_dict(obj):
+        try:
+            return from_dict(obj)
+        except KeyError:
+            # Atributo não carregado (expirado após commit, load_only, instância nova)
+            return from_attributes(obj)
+
+    to_dict.__name__ = f'{model.__name__.lower()}_to_dict'
+    return to_dict
+
+
+def _default(o):
+    serializer = _serializers.get(type(o))
+    if serializer is not None:
+        return serializer(o)
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON da aplicação com orjson quando instalado e o json da biblioteca padrão
+    caso contrário. A saída é equivalente (chaves ordenadas, datas no formato
+    HTTP como no Flask), mas o orjson grava UTF-8 em vez de escapes \\uXXXX.
+    Modelos registrados com @serializable podem ir direto para o jsonify.
+    """
+
+    default = staticmethod(_default)
+
+    def _orjson_options(self, indent=None):
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _orjson_dumps(self, obj, indent=None, options=0):
+        if orjson is None or indent not in (None, 2):
+            return None
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options(indent) | options)
+        except TypeError:
+            # Tipos que o orjson não aceita (ex.: inteiros acima de 64 bits) vão pelo json
+            return None
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.keys() <= {'indent', 'separators'}:
+            body = self._orjson_dumps(obj, kwargs.get('indent'))
+            if body is not None:
+                return body.decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+
+        body = self._orjson_dumps(obj, indent, orjson.OPT_APPEND_NEWLINE if orjson else 0)
+        if body is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,212 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone
+from flask import current_app, jsonify, request, send_file
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Variantes pré-comprimidas procuradas ao lado de cada arquivo, em ordem de preferência
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+COMPRESSIBLE_TYPES = (
+    'application/javascript', 'application/json', 'application/manifest+json',
+    'application/wasm', 'application/xml', 'image/svg+xml', 'image/vnd.microsoft.icon',
+    'image/x-icon'
+)
+MIN_COMPRESS_SIZE = 1024
+
+# Arquivos do build do Vite com hash no nome (assets/index-3f9a1c2b.js) nunca mudam de conteúdo
+HASHED_ASSET = re.compile(r'(^|/)assets/.+-[A-Za-z0-9_-]{8,}\.\w+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+INDEX = 'index.html'
+
+
+class StaticVariant:
+    """Uma codificação do arquivo: bytes em memória ou caminho no disco"""
+
+    def __init__(self, data=None, path=None):
+        self.data = data
+        self.path = path
+
+
+class StaticAsset:
+    def __init__(self, name, mimetype, digest, last_modified, cache_control):
+        self.name = name
+        self.mimetype = mimetype
+        self.digest = digest
+        self.last_modified = last_modified
+        self.cache_control = cache_control
+        self.variants = {}
+
+
+def is_compressible(mimetype):
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+
+
+def _mimetype(name):
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+class StaticAssets:
+    """
+    Índice em memória da pasta estática, montado uma vez na inicialização:
+    nenhuma requisição consulta o disco para decidir o que servir. O index.html
+    e as variantes gzip que faltarem ficam em memória (compartilhadas entre os
+    workers com --preload); os demais arquivos são enviados do disco.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.assets = {}
+        if folder and os.path.isdir(folder):
+            self.scan()
+
+    def scan(self):
+        assets = {}
+        for root, _, files in os.walk(self.folder):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.folder).replace(os.sep, '/')
+                # Variantes comprimidas são anexadas ao arquivo original
+                if any(name.endswith(suffix) for _, suffix in ENCODINGS):
+                    if os.path.exists(path.rsplit('.', 1)[0]):
+                        continue
+                assets[name] = self._load(name, path)
+        self.assets = assets
+
+    def _load(self, name, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        mimetype = _mimetype(name)
+        cache_control = IMMUTABLE if HASHED_ASSET.search(name) else REVALIDATE
+        last_modified = datetime.fromtimestamp(int(os.path.getmtime(path)), timezone.utc)
+        asset = StaticAsset(name, mimetype, hashlib.sha1(data).hexdigest()[:16], last_modified, cache_control)
+
+        asset.variants['identity'] = StaticVariant(data=data) if name == INDEX else StaticVariant(path=path)
+
+        for encoding, suffix in ENCODINGS:
+            # Variantes mais antigas que o original são de um build anterior
+            if os.path.exists(path + suffix) and os.path.getmtime(path + suffix) >= os.path.getmtime(path):
+                asset.variants[encoding] = StaticVariant(path=path + suffix)
+
+        if 'gzip' not in asset.variants and is_compressible(mimetype) and len(data) >= MIN_COMPRESS_SIZE:
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(compressed) < len(data) * 0.9:
+                asset.variants['gzip'] = StaticVariant(data=compressed)
+
+        return asset
+
+    def get(self, name):
+        return self.assets.get(name)
+
+    @property
+    def index(self):
+        return self.assets.get(INDEX)
+
+    def total_bytes(self):
+        return sum(
+            len(variant.data) for asset in self.assets.values()
+            for variant in asset.variants.values() if variant.data is not None
+        )
+
+
+def _negotiate(asset):
+    for encoding, _ in ENCODINGS:
+        if encoding in asset.variants and request.accept_encodings[encoding]:
+            return encoding
+    return 'identity'
+
+
+def send_asset(asset):
+    """
+    Resposta com a melhor codificação aceita pelo cliente, ETag forte por
+    variante e Cache-Control imutável para os arquivos com hash
+    """
+    encoding = _negotiate(asset)
+    variant = asset.variants[encoding]
+
+    if variant.data is not None:
+        response = current_app.response_class(variant.data, mimetype=asset.mimetype)
+    else:
+        response = send_file(variant.path, mimetype=asset.mimetype, conditional=False, etag=False)
+
+    if encoding != 'identity':
+        response.content_encoding = encoding
+    if len(asset.variants) > 1:
+        response.vary.add('Accept-Encoding')
+
+    response.set_etag(f'{asset.digest}-{encoding}')
+    response.last_modified = asset.last_modified
+    response.headers['Cache-Control'] = asset.cache_control
+    return response.make_conditional(request)
+
+
+def setup_static_assets(app):
+    """
+    Serve o build do frontend (SPA) a partir do índice em memória: arquivos
+    conhecidos com a variante comprimida adequada e o index.html para as
+    rotas do frontend. Arquivos adicionados depois da inicialização exigem
+    reiniciar a aplicação.
+    """
+    assets = StaticAssets(app.static_folder)
+    app.extensions['static_assets'] = assets
+    app.logger.info(
+        'Arquivos estáticos indexados: %s (%s KiB em memória)',
+        len(assets.assets), assets.total_bytes() // 1024
+    )
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        asset = assets.get(path) if path else None
+        if asset is not None:
+            return send_asset(asset)
+
+        # Endpoints da API inexistentes e arquivos ausentes (ex.: bundle de um
+        # deploy anterior) não devem receber o HTML da SPA
+        if path.startswith('api/'):
+            return jsonify({'error': 'Endpoint não encontrado'}), 404
+        if '.' in path.rsplit('/', 1)[-1]:
+            return "File not found", 404
+
+        if assets.index is None:
+            return "index.html not found", 404
+        return send_asset(assets.index)
+
+
+def compress_static(folder, min_size=MIN_COMPRESS_SIZE):
+    """
+    Grava as variantes .gz (e .br, com o pacote brotli instalado) ao lado dos
+    arquivos compressíveis, para rodar no build em vez de na inicialização
+    """
+    written = 0
+    for root, _, files in os.walk(folder):
+        for filename in files:
+            if any(filename.endswith(suffix) for _, suffix in ENCODINGS):
+                continue
+            path = os.path.join(root, filename)
+            if not is_compressible(_mimetype(filename)) or os.path.getsize(path) < min_size:
+                continue
+
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.append(('.br', brotli.compress(data, quality=11)))
+
+            for suffix, compressed in variants:
+                if len(compressed) < len(data) * 0.9:
+                    with open(path + suffix, 'wb') as f:
+                        f.write(compressed)
+                    written += 1
+    return written
@@ -0,0 +1,427 @@
+"""
+Massa sintética do marketplace: prestadores e clientes em capitais
+brasileiras, serviços oferecidos, pedidos, propostas, avaliações e mensagens,
+com chaves estrangeiras consistentes:
+
+- prestadores dão propostas em pedidos da própria cidade, nas categorias
+  em que atendem
+- a proposta aceita é de um pedido em andamento/concluído; pedidos abertos só
+  têm propostas pendentes e cancelados, propostas canceladas
+- avaliações só em pedidos concluídos, entre o cliente e o prestador aceito
+- mensagens entre o cliente e os prestadores com proposta no pedido
+
+A mesma semente gera sempre os mesmos dados (as datas são relativas ao
+momento da geração). Os ids são atribuídos aqui, a partir do maior id de cada
+tabela, então as linhas vão em lotes de insert() sem consultar o banco e um
+bloco de pedidos (com propostas, avaliações e mensagens) é gravado por
+transação. Agregados de avaliação e o índice de busca são recalculados no fim.
+
+Usado por generate_data.py e benchmarks/suite.py.
+"""
+import bisect
+import itertools
+import random
+import unicodedata
+from array import array
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, text
+from src.models.user import db, User
+from src.models.service import ServiceCategory, ProviderService
+from src.models.request import ServiceRequest, URGENCY_RANKS
+from src.models.proposal import Proposal
+from src.models.evaluation import Evaluation
+from src.models.message import Message
+from src.utils.geo import geo_cell
+from src.utils.passwords import hash_password
+from src.utils.ratings import CRITERIA, recompute_rating_aggregates
+from src.utils.search import reindex_all_providers
+
+# Senha de todos os usuários gerados
+PASSWORD = 'senha123'
+
+# Hash de PASSWORD com uma iteração do PBKDF2, pré-calculado: em testes o login
+# dos usuários gerados fica barato e nenhum hash é calculado na geração
+TEST_PASSWORD_HASH = (
+    'pbkdf2:sha256:1$WnavqlfTicRrojpn$'
+    '92c979243fa01ea9ae45dd5508fd6e1aee0c67d7c387c9ac6a609d0e5c93eeca'
+)
+
+CHUNK_SIZE = 5000
+
+# Mesmas categorias de populate_db.py: as que já existirem são reaproveitadas
+CATEGORIES = [
+    ('Limpeza', 'Serviços de limpeza doméstica e comercial', 'Diarista', [
+        'Faxina completa em apartamento', 'Limpeza pós-obra', 'Limpeza de sofá e colchão',
+        'Faxina semanal', 'Limpeza de vidros e janelas'
+    ]),
+    ('Elétrica', 'Instalações e reparos elétricos', 'Eletricista', [
+        'Instalar chuveiro elétrico', 'Trocar disjuntores do quadro', 'Instalar tomadas e interruptores',
+        'Revisão da fiação', 'Instalar luminárias'
+    ]),
+    ('Hidráulica', 'Instalações e reparos hidráulicos', 'Encanador', [
+        'Consertar vazamento na pia', 'Desentupir ralo do banheiro', 'Trocar registro do chuveiro',
+        'Instalar caixa d\'água', 'Consertar descarga'
+    ]),
+    ('Pintura', 'Pintura residencial e comercial', 'Pintor', [
+        'Pintar sala e quartos', 'Pintura de fachada', 'Textura em parede', 'Pintar portão',
+        'Retocar pintura com infiltração'
+    ]),
+    ('Jardinagem', 'Cuidados com jardins e plantas', 'Jardineiro', [
+        'Cortar grama do quintal', 'Poda de árvores', 'Montar jardim vertical', 'Manutenção mensal do jardim',
+        'Plantio de mudas'
+    ]),
+    ('Marcenaria', 'Móveis sob medida e reparos', 'Marceneiro', [
+        'Armário planejado para cozinha', 'Consertar porta de guarda-roupa', 'Montar estante sob medida',
+        'Trocar dobradiças', 'Restaurar mesa de madeira'
+    ]),
+    ('Pedreiro', 'Construção e reformas', 'Pedreiro', [
+        'Reforma do banheiro', 'Assentar piso cerâmico', 'Construir muro', 'Reboco de parede',
+        'Trocar revestimento da cozinha'
+    ]),
+    ('Ar Condicionado', 'Instalação e manutenção de ar condicionado', 'Técnico de refrigeração', [
+        'Instalar ar-condicionado split', 'Limpeza do ar-condicionado', 'Recarga de gás',
+        'Ar-condicionado pingando', 'Desinstalar aparelho'
+    ]),
+    ('Informática', 'Suporte técnico e reparos em computadores', 'Técnico de informática', [
+        'Formatar notebook', 'Configurar rede Wi-Fi', 'Trocar tela do notebook', 'Remover vírus',
+        'Montar computador'
+    ]),
+    ('Mudanças', 'Serviços de mudança e transporte', 'Carreteiro', [
+        'Mudança de apartamento', 'Frete de geladeira', 'Desmontar e montar móveis na mudança',
+        'Carreto de pequenos volumes', 'Mudança comercial'
+    ]),
+]
+
+# (cidade, UF, latitude, longitude, DDD, prefixo do CEP, peso pela população)
+CITIES = [
+    ('São Paulo', 'SP', -23.5505, -46.6333, 11, '01', 24),
+    ('Rio de Janeiro', 'RJ', -22.9068, -43.1729, 21, '20', 13),
+    ('Brasília', 'DF', -15.7939, -47.8828, 61, '70', 6),
+    ('Salvador', 'BA', -12.9714, -38.5014, 71, '40', 5),
+    ('Fortaleza', 'CE', -3.7319, -38.5267, 85, '60', 5),
+    ('Belo Horizonte', 'MG', -19.9167, -43.9345, 31, '30', 5),
+    ('Manaus', 'AM', -3.1190, -60.0217, 92, '69', 4),
+    ('Curitiba', 'PR', -25.4284, -49.2733, 41, '80', 4),
+    ('Recife', 'PE', -8.0476, -34.8770, 81, '50', 3),
+    ('Goiânia', 'GO', -16.6869, -49.2648, 62, '74', 3),
+    ('Porto Alegre', 'RS', -30.0346, -51.2177, 51, '90', 3),
+    ('Belém', 'PA', -1.4558, -48.4902, 91, '66', 3),
+    ('Campinas', 'SP', -22.9099, -47.0626, 19, '13', 2),
+    ('Florianópolis', 'SC', -27.5954, -48.5480, 48, '88', 1),
+]
+_CITY_WEIGHTS = list(itertools.accumulate(city[6] for city in CITIES))
+
+# Dispersão (em graus) dos endereços em volta do centro da cidade
+CITY_SPREAD = 0.08
+
+FIRST_NAMES = [
+    'Ana', 'Maria', 'Juliana', 'Fernanda', 'Patrícia', 'Camila', 'Aline', 'Beatriz', 'Larissa', 'Letícia',
+    'Gabriela', 'Mariana', 'Bruna', 'Amanda', 'Vanessa', 'Luciana', 'Renata', 'Adriana', 'Carla', 'Débora',
+    'José', 'João', 'Antônio', 'Francisco', 'Carlos', 'Paulo', 'Pedro', 'Lucas', 'Luiz', 'Marcos',
+    'Gabriel', 'Rafael', 'Daniel', 'Marcelo', 'Bruno', 'Eduardo', 'Felipe', 'Rodrigo', 'Thiago', 'Mateus',
+]
+LAST_NAMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa',
+    'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas',
+]
+EMAIL_DOMAINS = ['gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.br', 'uol.com.br', 'bol.com.br']
+STREETS = [
+    'Rua das Flores', 'Avenida Brasil', 'Rua XV de Novembro', 'Rua Sete de Setembro', 'Avenida Paulista',
+    'Rua Tiradentes', 'Rua Santos Dumont', 'Avenida Getúlio Vargas', 'Rua Dom Pedro II', 'Rua São José',
+    'Rua Duque de Caxias', 'Avenida Rio Branco', 'Rua Marechal Deodoro', 'Rua Barão do Rio Branco',
+    'Rua José Bonifácio', 'Avenida Independência', 'Rua Castro Alves', 'Rua Rui Barbosa',
+]
+
+# Distribuição dos status dos pedidos
+STATUSES = ['open'] * 10 + ['in_progress'] * 3 + ['completed'] * 6 + ['cancelled']
+URGENCIES = ['low'] * 2 + ['normal'] * 5 + ['high'] * 2 + ['urgent']
+
+REQUEST_DETAILS = [
+    'Preciso de orçamento com urgência, moro em apartamento no terceiro andar.',
+    'Serviço em casa térrea, tenho disponibilidade pela manhã.',
+    'Gostaria de agendar para o fim de semana, se possível.',
+    'Já tenho parte do material, preciso só da mão de obra.',
+    'Condomínio exige agendamento prévio com a portaria.',
+]
+DURATIONS = ['2 horas', '4 horas', '1 dia', '2 dias', '1 semana']
+AVAILABILITY = ['Segunda a sexta, 8h às 18h', 'Sábados pela manhã', 'Qualquer dia, com agendamento']
+PROPOSAL_DETAILS = [
+    'Inclui mão de obra e garantia de 90 dias.',
+    'Material por conta do cliente; visita técnica gratuita.',
+    'Valor fechado, com limpeza do local ao final.',
+    'Posso começar ainda esta semana.',
+]
+CLIENT_MESSAGES = [
+    'Olá, você consegue vir amanhã?', 'Qual seria o prazo para terminar?', 'O valor inclui o material?',
+    'Pode ser no período da tarde?', 'Combinado, aguardo você.', 'Obrigado pelo atendimento!',
+]
+PROVIDER_MESSAGES = [
+    'Bom dia! Consigo sim, por volta das 9h.', 'Termino em um dia de trabalho.',
+    'O material está incluso, exceto acabamentos.', 'Pode ser, chego às 14h.',
+    'Estou a caminho.', 'Serviço concluído, qualquer coisa é só chamar.',
+]
+COMMENTS = {
+    3: ['Serviço ok, mas atrasou um pouco.', 'Resolveu o problema, poderia ter limpado melhor.'],
+    4: ['Bom serviço, recomendo.', 'Profissional educado e caprichoso.'],
+    5: ['Excelente! Pontual e muito caprichoso.', 'Ótimo profissional, preço justo.', 'Recomendo muito!'],
+}
+
+
+def _insert(model, rows, chunk_size=CHUNK_SIZE):
+    # insert() da tabela (Core): um executemany por lote, sem o mapeamento do ORM
+    for start in range(0, len(rows), chunk_size):
+        db.session.execute(insert(model.__table__), rows[start:start + chunk_size])
+
+
+def _next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def reset_sequences(*models):
+    """No PostgreSQL, ids inseridos explicitamente não avançam as sequências"""
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return
+    for model in models:
+        table = model.__table__.name
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+            f'FROM "{table}"'
+        ))
+
+
+def _slug(value):
+    ascii_value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode()
+    return ascii_value.lower().replace(' ', '')
+
+
+def _address(rng, city):
+    name, state, lat, lng, ddd, cep_prefix, _ = city
+    lat += rng.gauss(0, CITY_SPREAD)
+    lng += rng.gauss(0, CITY_SPREAD)
+    return {
+        'address': f'{rng.choice(STREETS)}, {rng.randint(1, 3000)}',
+        'city': name, 'state': state,
+        'zip_code': f'{cep_prefix}{rng.randint(0, 999):03d}-{rng.randint(0, 999):03d}',
+        'latitude': round(lat, 6), 'longitude': round(lng, 6), 'geo_cell': geo_cell(lat, lng),
+    }
+
+
+def _phone(rng, city):
+    return f'({city[4]}) 9{rng.randint(1000, 9999)}-{rng.randint(0, 9999):04d}'
+
+
+class Marketplace:
+    """Resumo da massa gerada: faixas de ids e contagem de linhas por tabela"""
+
+    def __init__(self, provider_ids, client_ids, request_ids):
+        self.provider_ids = provider_ids
+        self.client_ids = client_ids
+        self.request_ids = request_ids
+        self.category_ids = []
+        # Alguns pedidos de cada status, para montar requisições de teste
+        self.requests_by_status = {}
+        self.rows = {}
+
+    def _sample_request(self, status, request_id, limit=100):
+        sample = self.requests_by_status.setdefault(status, [])
+        if len(sample) < limit:
+            sample.append(request_id)
+
+
+def _ensure_categories(now):
+    existing = dict(db.session.query(ServiceCategory.name, ServiceCategory.id))
+    missing = [category for category in CATEGORIES if category[0] not in existing]
+    if missing:
+        next_id = _next_id(ServiceCategory)
+        rows = [
+            {'id': next_id + index, 'name': name, 'description': description, 'is_active': True, 'created_at': now}
+            for index, (name, description, _, _) in enumerate(missing)
+        ]
+        _insert(ServiceCategory, rows)
+        existing.update((row['name'], row['id']) for row in rows)
+    return [existing[category[0]] for category in CATEGORIES]
+
+
+def seed_marketplace(providers=1000, clients=1000, requests=5000, proposals_per_request=3,
+                     messages_per_request=4, seed=42, password_hash=None, chunk_size=CHUNK_SIZE,
+                     progress=None):
+    """
+    Grava a massa no banco (esquema já criado) e retorna um Marketplace.
+    Deve rodar dentro de um app context. Sem password_hash, o hash de
+    PASSWORD (com PASSWORD_HASH_METHOD) é calculado uma vez e compartilhado
+    por todos os usuários.
+    progress(tabela, linhas gravadas, total) é chamada a cada bloco.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    password_hash = password_hash or hash_password(PASSWORD)
+    report = progress or (lambda table, done, total: None)
+
+    category_ids = _ensure_categories(now)
+    db.session.commit()
+
+    first_user = _next_id(User)
+    provider_ids = range(first_user, first_user + providers)
+    client_ids = range(first_user + providers, first_user + providers + clients)
+    first_request = _next_id(ServiceRequest)
+    marketplace = Marketplace(provider_ids, client_ids, range(first_request, first_request + requests))
+    marketplace.category_ids = category_ids
+
+    # Cidade de cada usuário (índice em CITIES) e prestadores por cidade e categoria
+    user_city = array('B')
+    providers_by_city = [[] for _ in CITIES]
+    providers_by_market = {}
+
+    total_users = providers + clients
+    services = 0
+    for start in range(0, total_users, chunk_size):
+        users, provider_services = [], []
+        for offset in range(start, min(start + chunk_size, total_users)):
+            user_id = first_user + offset
+            is_provider = offset < providers
+            city_index = bisect.bisect(_CITY_WEIGHTS, rng.random() * _CITY_WEIGHTS[-1])
+            city = CITIES[city_index]
+            user_city.append(city_index)
+
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            created_at = now - timedelta(days=rng.randint(30, 900), seconds=rng.randint(0, 86399))
+            user = {
+                'id': user_id, 'name': f'{first_name} {rng.choice(LAST_NAMES)} {last_name}',
+                'email': f'{_slug(first_name)}.{_slug(last_name)}{user_id}@{rng.choice(EMAIL_DOMAINS)}',
+                'password_hash': password_hash, 'user_type': 'provider' if is_provider else 'client',
+                'phone': _phone(rng, city), 'is_active': True, 'is_available': True,
+                'is_verified': is_provider and rng.random() < 0.7,
+                'bio': None, 'experience_years': None, 'service_radius': None,
+                'created_at': created_at, 'updated_at': created_at,
+                **_address(rng, city)
+            }
+
+            if is_provider:
+                offered = rng.sample(range(len(CATEGORIES)), rng.choice([1, 1, 2, 2, 3]))
+                experience = rng.randint(1, 30)
+                trades = ' e '.join(CATEGORIES[index][2].lower() for index in offered)
+                user.update({
+                    'bio': f'{trades.capitalize()} com {experience} anos de experiência. '
+                           'Atendo residências e comércios, com garantia no serviço.',
+                    'experience_years': experience,
+                    'service_radius': rng.choice([5, 10, 15, 20, 30]),
+                    'is_available': rng.random() < 0.9,
+                })
+                providers_by_city[city_index].append(user_id)
+                for index in offered:
+                    providers_by_market.setdefault((city_index, index), []).append(user_id)
+                    provider_services.append({
+                        'provider_id': user_id, 'category_id': category_ids[index],
+                        'description': f'{CATEGORIES[index][2]}: {", ".join(rng.sample(CATEGORIES[index][3], 2)).lower()}',
+                        'base_price': float(rng.randrange(60, 400, 10)), 'is_active': True,
+                        'created_at': created_at
+                    })
+            users.append(user)
+
+        _insert(User, users, chunk_size)
+        _insert(ProviderService, provider_services, chunk_size)
+        db.session.commit()
+        services += len(provider_services)
+        report('users', start + len(users), total_users)
+
+    # Sem prestadores da categoria na cidade do cliente, as propostas vêm de outros
+    # prestadores da cidade ou, em último caso, de qualquer cidade
+    all_providers = list(provider_ids)
+    counts = {'requests': 0, 'proposals': 0, 'evaluations': 0, 'messages': 0}
+    next_proposal = _next_id(Proposal)
+    for start in range(0, requests, chunk_size):
+        request_rows, proposal_rows, evaluation_rows, message_rows = [], [], [], []
+        for offset in range(start, min(start + chunk_size, requests)):
+            request_id = first_request + offset
+            status = rng.choice(STATUSES)
+            client_id = rng.choice(client_ids) if clients else rng.choice(provider_ids)
+            city_index = user_city[client_id - first_user]
+            city = CITIES[city_index]
+            category_index = rng.randrange(len(CATEGORIES))
+            urgency = rng.choice(URGENCIES)
+            created_at = now - timedelta(days=rng.randint(0, 365), seconds=rng.randint(0, 86399))
+            budget_min = float(rng.randrange(50, 500, 50))
+            request_rows.append({
+                'id': request_id, 'client_id': client_id, 'category_id': category_ids[category_index],
+                'title': rng.choice(CATEGORIES[category_index][3]), 'description': rng.choice(REQUEST_DETAILS),
+                'urgency': urgency, 'urgency_rank': URGENCY_RANKS[urgency], 'status': status,
+                'budget_min': budget_min, 'budget_max': budget_min * rng.choice([1.5, 2, 3]),
+                'preferred_date': created_at + timedelta(days=rng.randint(1, 15)), 'images': '[]',
+                'created_at': created_at, 'updated_at': created_at,
+                **_address(rng, city)
+            })
+            marketplace._sample_request(status, request_id)
+
+            candidates = (providers_by_market.get((city_index, category_index))
+                          or providers_by_city[city_index] or all_providers)
+            bidders = rng.sample(candidates, min(proposals_per_request, len(candidates)))
+            accepted = bidders[0] if bidders and status in ('in_progress', 'completed') else None
+            for provider_id in bidders:
+                if status == 'open':
+                    proposal_status = 'pending'
+                elif status == 'cancelled':
+                    proposal_status = 'cancelled'
+                else:
+                    proposal_status = 'accepted' if provider_id == accepted else 'rejected'
+                proposed_at = created_at + timedelta(hours=rng.randint(1, 48))
+                proposal_rows.append({
+                    'id': next_proposal, 'service_request_id': request_id, 'provider_id': provider_id,
+                    'price': float(rng.randrange(int(budget_min), int(budget_min) * 3 + 10, 10)),
+                    'estimated_duration': rng.choice(DURATIONS), 'description': rng.choice(PROPOSAL_DETAILS),
+                    'materials_included': rng.random() < 0.4, 'availability': rng.choice(AVAILABILITY),
+                    'status': proposal_status, 'created_at': proposed_at, 'updated_at': proposed_at
+                })
+                next_proposal += 1
+
+            if status == 'completed' and accepted:
+                rating = rng.choice([3, 4, 4, 5, 5, 5])
+                evaluation_rows.append({
+                    'service_request_id': request_id, 'evaluator_id': client_id, 'evaluated_id': accepted,
+                    'rating': rating, 'comment': rng.choice(COMMENTS[rating]),
+                    'created_at': created_at + timedelta(days=rng.randint(2, 20)),
+                    **{criterion: max(1, min(5, rating + rng.choice([-1, 0, 0, 1]))) for criterion in CRITERIA}
+                })
+                if rng.random() < 0.7:
+                    evaluation_rows.append({
+                        'service_request_id': request_id, 'evaluator_id': accepted, 'evaluated_id': client_id,
+                        'rating': rng.choice([4, 5]), 'comment': None,
+                        'created_at': created_at + timedelta(days=rng.randint(2, 20)),
+                        **{criterion: None for criterion in CRITERIA}
+                    })
+
+            for index in range(messages_per_request if bidders else 0):
+                provider_id = accepted or bidders[index % len(bidders)]
+                from_client = index % 2 == 0
+                message_rows.append({
+                    'service_request_id': request_id,
+                    'sender_id': client_id if from_client else provider_id,
+                    'receiver_id': provider_id if from_client else client_id,
+                    'content': rng.choice(CLIENT_MESSAGES if from_client else PROVIDER_MESSAGES),
+                    'message_type': 'text', 'is_read': index < messages_per_request - 1,
+                    'created_at': created_at + timedelta(hours=index + 1)
+                })
+
+        _insert(ServiceRequest, request_rows, chunk_size)
+        _insert(Proposal, proposal_rows, chunk_size)
+        _insert(Evaluation, evaluation_rows, chunk_size)
+        _insert(Message, message_rows, chunk_size)
+        db.session.commit()
+        counts['requests'] += len(request_rows)
+        counts['proposals'] += len(proposal_rows)
+        counts['evaluations'] += len(evaluation_rows)
+        counts['messages'] += len(message_rows)
+        report('requests', start + len(request_rows), requests)
+
+    reset_sequences(ServiceCategory, User, ServiceRequest, Proposal)
+    db.session.commit()
+
+    recompute_rating_aggregates()
+    report('ratings', 1, 1)
+    reindex_all_providers()
+    report('search', 1, 1)
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+    marketplace.rows = {'users': total_users, 'services': services, **counts}
+    return marketplace
@@ -4,9 +4,12 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.models.user import db, User
-from src.main import app
+from src.factory import create_app
 from werkzeug.security import check_password_hash
 
+# Aplicação sem rotas nem Socket.IO: o script só usa o banco
+app = create_app(web=False)
+
 def test_cloud_login():
     """Testa o login diretamente no banco da nuvem"""
     
@@ -3,10 +3,13 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
-from src.main import app
+from src.factory import create_app
 from src.models.user import User, db
 from werkzeug.security import check_password_hash
 
+# Aplicação sem rotas nem Socket.IO: o script só usa o banco
+app = create_app(web=False)
+
 def test_login_direct():
     """Testa o login diretamente usando o contexto da aplicação"""
     
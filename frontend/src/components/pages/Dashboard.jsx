@@ -26,7 +26,11 @@ const Dashboard = () => {
   const { user, logout } = useAuth();
   const [requests, setRequests] = useState([]);
   const [proposals, setProposals] = useState([]);
+  // Cursores da próxima página (null quando não há mais itens)
+  const [requestsCursor, setRequestsCursor] = useState(null);
+  const [proposalsCursor, setProposalsCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadData();
@@ -39,12 +43,15 @@ const Dashboard = () => {
       if (user.user_type === 'client') {
         const requestsResponse = await requestAPI.getRequests();
         setRequests(requestsResponse.data.requests || []);
+        setRequestsCursor(requestsResponse.data.next_cursor || null);
       } else {
         const proposalsResponse = await proposalAPI.getMyProposals();
         setProposals(proposalsResponse.data.proposals || []);
+        setProposalsCursor(proposalsResponse.data.next_cursor || null);
         
         const requestsResponse = await requestAPI.getRequests();
         setRequests(requestsResponse.data.requests || []);
+        setRequestsCursor(requestsResponse.data.next_cursor || null);
       }
     } catch (error) {
       console.error('Erro ao carregar dados:', error);
@@ -53,6 +60,40 @@ const Dashboard = () => {
     }
   };
 
+  const loadMoreRequests = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await requestAPI.getRequests({ cursor: requestsCursor });
+      setRequests(prev => [...prev, ...(response.data.requests || [])]);
+      setRequestsCursor(response.data.next_cursor || null);
+    } catch (error) {
+      console.error('Erro ao carregar mais pedidos:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const loadMoreProposals = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await proposalAPI.getMyProposals({ cursor: proposalsCursor });
+      setProposals(prev => [...prev, ...(response.data.proposals || [])]);
+      setProposalsCursor(response.data.next_cursor || null);
+    } catch (error) {
+      console.error('Erro ao carregar mais propostas:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const renderLoadMore = (cursor, onLoadMore) => cursor && (
+    <div className="flex justify-center">
+      <Button variant="outline" onClick={onLoadMore} disabled={loadingMore}>
+        {loadingMore ? 'Carregando...' : 'Carregar mais'}
+      </Button>
+    </div>
+  );
+
   const getStatusBadge = (status) => {
     const statusMap = {
       open: { label: 'Aberto', variant: 'default' },
@@ -263,6 +304,7 @@ const Dashboard = () => {
                   </Card>
                 ))
               )}
+              {renderLoadMore(requestsCursor, loadMoreRequests)}
             </TabsContent>
           )}
 
@@ -276,7 +318,7 @@ const Dashboard = () => {
                   </CardContent>
                 </Card>
               ) : (
-                requests.slice(0, 10).map((request) => (
+                requests.map((request) => (
                   <Card key={request.id}>
                     <CardHeader>
                       <div className="flex justify-between items-start">
@@ -307,6 +349,7 @@ const Dashboard = () => {
                   </Card>
                 ))
               )}
+              {renderLoadMore(requestsCursor, loadMoreRequests)}
             </TabsContent>
           )}
 
@@ -361,6 +404,7 @@ const Dashboard = () => {
                   </Card>
                 ))
               )}
+              {renderLoadMore(proposalsCursor, loadMoreProposals)}
             </TabsContent>
           )}
         </Tabs>
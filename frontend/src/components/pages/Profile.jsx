@@ -51,13 +51,16 @@ const Profile = () => {
 
   const loadEvaluations = async () => {
     try {
-      const response = await evaluationAPI.getUserEvaluations(user.id);
+      // Só as mais recentes são exibidas; o total vem do perfil
+      const response = await evaluationAPI.getUserEvaluations(user.id, { limit: 3 });
       setEvaluations(response.data.evaluations || []);
     } catch (error) {
       console.error('Erro ao carregar avaliações:', error);
     }
   };
 
+  const totalEvaluations = user?.total_evaluations ?? evaluations.length;
+
   const handleChange = (field, value) => {
     setFormData(prev => ({
       ...prev,
@@ -402,7 +405,7 @@ const Profile = () => {
               <CardHeader>
                 <CardTitle>Avaliações Recentes</CardTitle>
                 <CardDescription>
-                  {evaluations.length} avaliação{evaluations.length !== 1 ? 'ões' : ''}
+                  {totalEvaluations} avaliação{totalEvaluations !== 1 ? 'ões' : ''}
                 </CardDescription>
               </CardHeader>
               <CardContent>
@@ -60,7 +60,7 @@ export const serviceAPI = {
 // Funções de pedidos
 export const requestAPI = {
   createRequest: (requestData) => api.post('/orders', requestData),
-  getRequests: () => api.get('/orders'),
+  getRequests: (params) => api.get('/orders', { params }),
   getRequestDetail: (requestId) => api.get(`/orders/${requestId}`),
   updateRequest: (requestId, requestData) => api.put(`/orders/${requestId}`, requestData),
   deleteRequest: (requestId) => api.delete(`/orders/${requestId}`),
@@ -72,15 +72,15 @@ export const proposalAPI = {
   getProposalsByRequest: (requestId) => api.get(`/proposals/request/${requestId}`),
   acceptProposal: (proposalId) => api.post(`/proposals/${proposalId}/accept`),
   rejectProposal: (proposalId) => api.post(`/proposals/${proposalId}/reject`),
-  getMyProposals: () => api.get('/proposals/my-proposals'),
+  getMyProposals: (params) => api.get('/proposals/my-proposals', { params }),
 };
 
 // Funções de avaliações
 export const evaluationAPI = {
   createEvaluation: (evaluationData) => api.post('/evaluations', evaluationData),
-  getUserEvaluations: (userId) => api.get(`/evaluations/user/${userId}`),
+  getUserEvaluations: (userId, params) => api.get(`/evaluations/user/${userId}`, { params }),
   getRequestEvaluations: (requestId) => api.get(`/evaluations/request/${requestId}`),
-  getMyEvaluations: () => api.get('/evaluations/my-evaluations'),
+  getMyEvaluations: (params) => api.get('/evaluations/my-evaluations', { params }),
 };
 
 export default api;